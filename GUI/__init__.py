@@ -1,2 +1,2 @@
-from GUI import *
-
+from GUI import *
+
@@ -1,153 +1,265 @@
-import random
-import math
-from dcstats.statistics_EJ import simple_stats as mean_SD
-from dcstats.statistics_EJ import InverseStudentT
-
-class Hedges_d:
-    ### calculation of Hedges' d (Hedges' unbiased g)
-    ### see Nakagawa and Cuthill (2007) Biol. Rev.
-    ### simple 95% confidence intervals 
-    ### bootstrap to get better (non-parametric) confidence intervals
-    
-    def __init__(self, sample1, sample2):
-        ## sample1 and sample2 are the arrays to compare
-        self.s1 = sample1
-        self.s2 = sample2
-        self.d = 0
-        self.correction = 1
-        self.SE_d = 0
-
-
-    def approx_CI (self, paired=False):
-        # 95% CI = ES - 1.96 * SE_d to ES + 1.96 * SE_d
-        # ES is effect size: Hedge's d (the unbiased form)
-        # se is asymptotic standard error for the ffect size
-        # small samples (< 20) should use t distribution with appropriate df rather than 1.96
-        # Nakagawa and Cuthill (2007) Biol. Rev.
-        
-        n1 = len (self.s1)
-        n2 = len (self.s2)
-        
-        if self.SE_d == 0:
-            self.asymptotic_SE_d_unpaired()
-        
-        #default for large samples
-        t = 1.96
-
-        if paired:
-            df = n1 -1
-        else:
-            df = n1 + n2 - 2            #unpaired.
-        
-        if df < 120:
-            print ("Small sample size (degrees of freedom < 120)")
-            
-            #for very large df, t at P > 0.975 approaches 1.96
-            #see Stats_test.py
-            #df = 10, t  = 2.23
-            #df = 120, t = 1.98
-            #df = 1000, t  = 1.962
-            t = InverseStudentT (df, 0.975)
-
-            print ("Degrees of Freedom: {:d} , t @ P_t-CDF = 0.975 : {:.2f} ".format(df, t))
-                                     
-        self.lower95CI = self.d - t * self.SE_d
-        self.upper95CI = self.d + t * self.SE_d
-        return (self.lower95CI, self.upper95CI)     #should refactor to avoid return
-    
-    def asymptotic_SE_d_unpaired (self):
-        # Hedges 1981, via Nakagawa and Cuthill (2007) Biol. Rev., Table 3
-        # SE_d = [ (n1 + n2) / (n1 * n2) + d^2 / (2 * (n1 + n2 -2)) ] ^ 0.5
-        
-        n1 = len (self.s1)
-        n2 = len (self.s2)
-        
-        if self.d == 0:
-            self.hedges_d_unbiased()
-        
-        first_term = (n1 + n2) / (n1 * n2)
-        second_term = self.d ** 2 / (2 * (n1 + n2 - 2))
-    
-        self.SE_d = math.sqrt(first_term + second_term)
-    
-
-    def hedges_d_unbiased (self):
-        #d_unbiased = d_biased [ 1 - 3/ (4 * ( n1 + n2 - 2)-1)]
-        #from Nakagawa and Cuthill (2007) Biol. Rev.
-        
-        #count each time to make formulas easier to read
-        n1 = len (self.s1)
-        n2 = len (self.s2)
-        #means and standard deviations
-        m1, s1 = mean_SD(self.s1)
-        m2, s2 = mean_SD(self.s2)
-        
-        #pooled variance
-        s_pooled = math.sqrt(((n2 - 1) * s2 ** 2 + (n1 - 1) * s1 ** 2) / (n1 + n2 - 2))
-
-        #Hedges' g
-        biased_d = (m2 - m1) / s_pooled
-
-        self.correction = 1.0 - 3.0 / (4 * (n1 + n2 - 2) - 1)
-        
-        #store answer
-        self.d = biased_d * self.correction
-
-
-    def bootstrap_CI (self, repeats, bCA=False):
-        
-        # repeats is the number of times that it is repeated.
-        # bCA: bias-corrected and accelerated - recommended to improve pctile coverage
-        # bCA not implemented yet
-        
-        hedges_d_bs = []     #unbiased, values from bootstrap
-        
-        n1m = len (self.s1) - 1     #we only use these below - simplifies
-        n2m = len (self.s2) - 1
-        correction = 1.0 - 3.0 / (4 * (n1m + n2m) - 1)
-        
-        for n in range (repeats):
-            
-            br1 = bootstrap(self.s1)
-            br2 = bootstrap(self.s2)
-        
-            #means and SDs of bootstrap sampled distributions
-            mbr1, sbr1 = mean_SD(br1)
-            mbr2, sbr2 = mean_SD(br2)
-        
-            #need to call a function for Hedges_d that returns a value, not storing it
-            #current alternative, just include here, it is so simple.
-            s_pooled = math.sqrt((n2m * sbr2 ** 2 + n1m * sbr1 ** 2) / (n1m + n2m))
-        
-            #Hedges' g
-            biased_d = (mbr2 - mbr1) / s_pooled
-        
-            # correction has no influence on the bootstrap distribution
-            # so apply it later to save multiplications
-            hedges_d_bs.append(biased_d)
-        
-        hedges_d_bs.sort()  # put the values into rank order
-        
-        self.lower95CI = hedges_d_bs[int(0.025 * repeats)] * correction
-        self.upper95CI = hedges_d_bs[int(0.975 * repeats)] * correction
-        return (self.lower95CI, self.upper95CI)
-        
-    def __repr__(self):
-        repr_string = ('\n\nEffect size' +
-        '\n  Hedges unbiased d = \t {0:.6f}'.format(self.d) +
-        '\n  approximate 95% confidence intervals ' +
-        '\n  upper 95% CI =\t {0:.6f}'.format(self.upper95CI) +
-        '\n  lower 95% CI =\t {0:.6f}'.format(self.lower95CI))
-    
-        return repr_string
-
-    def bias_corrected_bs_CI(self):
-        pass
-
-def bootstrap (sample):
-    #if sample is [], then the same is returned
-    l = len(sample)
-    sup_s = sample * l             #concatenate l identical copies
-    return random.sample(sup_s, l)
-
-
+import random
+import math
+from dcstats.statistics_EJ import simple_stats as mean_SD
+from dcstats.statistics_EJ import quantile_cache, NormalCDF, InverseNormal
+from dcstats.basic_stats import summarise, order_statistics, QuantileSketch
+from dcstats.random_streams import block_sizes, serial_rng
+
+try:
+    import numpy as np
+except ImportError:
+    # NumPy is optional: the bootstrap then resamples one replicate at a time.
+    np = None
+
+class Hedges_d:
+    ### calculation of Hedges' d (Hedges' unbiased g)
+    ### see Nakagawa and Cuthill (2007) Biol. Rev.
+    ### simple 95% confidence intervals 
+    ### bootstrap to get better (non-parametric) confidence intervals
+    
+    def __init__(self, sample1, sample2):
+        ## sample1 and sample2 are the arrays to compare
+        ## (or their SampleSummary, so that moments are not recomputed)
+        self.s1 = sample1
+        self.s2 = sample2
+        self.summary1 = summarise(sample1)
+        self.summary2 = summarise(sample2)
+        self.d = 0
+        self.correction = 1
+        self.SE_d = 0
+        self.hedges_d_bs = None
+        self.sketch = None
+
+
+    def approx_CI (self, paired=False):
+        # 95% CI = ES - 1.96 * SE_d to ES + 1.96 * SE_d
+        # ES is effect size: Hedge's d (the unbiased form)
+        # se is asymptotic standard error for the ffect size
+        # small samples (< 20) should use t distribution with appropriate df rather than 1.96
+        # Nakagawa and Cuthill (2007) Biol. Rev.
+        
+        n1 = len (self.s1)
+        n2 = len (self.s2)
+        
+        if self.SE_d == 0:
+            self.asymptotic_SE_d_unpaired()
+        
+        #default for large samples
+        t = 1.96
+
+        if paired:
+            df = n1 -1
+        else:
+            df = n1 + n2 - 2            #unpaired.
+        
+        if df < 120:
+            print ("Small sample size (degrees of freedom < 120)")
+            
+            #for very large df, t at P > 0.975 approaches 1.96
+            #see Stats_test.py
+            #df = 10, t  = 2.23
+            #df = 120, t = 1.98
+            #df = 1000, t  = 1.962
+            t = quantile_cache.get('t', df, 0.975)
+
+            print ("Degrees of Freedom: {:d} , t @ P_t-CDF = 0.975 : {:.2f} ".format(df, t))
+                                     
+        self.lower95CI = self.d - t * self.SE_d
+        self.upper95CI = self.d + t * self.SE_d
+        return (self.lower95CI, self.upper95CI)     #should refactor to avoid return
+    
+    def asymptotic_SE_d_unpaired (self):
+        # Hedges 1981, via Nakagawa and Cuthill (2007) Biol. Rev., Table 3
+        # SE_d = [ (n1 + n2) / (n1 * n2) + d^2 / (2 * (n1 + n2 -2)) ] ^ 0.5
+        
+        n1 = len (self.s1)
+        n2 = len (self.s2)
+        
+        if self.d == 0:
+            self.hedges_d_unbiased()
+        
+        first_term = (n1 + n2) / (n1 * n2)
+        second_term = self.d ** 2 / (2 * (n1 + n2 - 2))
+    
+        self.SE_d = math.sqrt(first_term + second_term)
+    
+
+    def hedges_d_unbiased (self):
+        #d_unbiased = d_biased [ 1 - 3/ (4 * ( n1 + n2 - 2)-1)]
+        #from Nakagawa and Cuthill (2007) Biol. Rev.
+        
+        #count each time to make formulas easier to read
+        n1 = len (self.s1)
+        n2 = len (self.s2)
+        #means and standard deviations
+        m1, s1 = self.summary1.mean, self.summary1.sd
+        m2, s2 = self.summary2.mean, self.summary2.sd
+        
+        #pooled variance
+        s_pooled = math.sqrt(((n2 - 1) * s2 ** 2 + (n1 - 1) * s1 ** 2) / (n1 + n2 - 2))
+
+        #Hedges' g
+        biased_d = (m2 - m1) / s_pooled
+
+        self.correction = 1.0 - 3.0 / (4 * (n1 + n2 - 2) - 1)
+        
+        #store answer
+        self.d = biased_d * self.correction
+
+
+    def bootstrap_CI (self, repeats, bCA=False, seed=None, sketch=False):
+        
+        # repeats is the number of times that it is repeated.
+        # bCA: bias-corrected and accelerated - recommended to improve pctile coverage
+        # seed makes the resampling reproducible
+        # sketch: for very long runs, keep only a QuantileSketch of the replicates
+        # in self.sketch; the limits are then within self.sketch.error_bound()
+        # (times the small-sample correction) of the exact percentiles
+        
+        # correction has no influence on the bootstrap distribution
+        # so apply it later to save multiplications
+        if sketch:
+            if bCA:
+                raise ValueError('BCa intervals need every bootstrap replicate')
+            self.hedges_d_bs = None
+            self.sketch = QuantileSketch()
+            for block in self.__bootstrap_blocks(repeats, seed):
+                self.sketch.extend(block)
+            return self.__percentile_CI(0.025, 0.975)
+        
+        self.hedges_d_bs = self.__bootstrap_replicates(repeats, seed)
+        if bCA:
+            return self.bias_corrected_bs_CI()
+        return self.__percentile_CI(0.025, 0.975)
+    
+    def __percentile_CI(self, lower, upper):
+        # read the interval at the lower and upper fractions of the ranked
+        # bootstrap replicates, selected rather than sorted
+        
+        n1m = len (self.s1) - 1     #we only use these below - simplifies
+        n2m = len (self.s2) - 1
+        correction = 1.0 - 3.0 / (4 * (n1m + n2m) - 1)
+        
+        if self.hedges_d_bs is None:
+            lower, upper = self.sketch.quantile(lower), self.sketch.quantile(upper)
+        else:
+            lower, upper = order_statistics(self.hedges_d_bs, (lower, upper))
+        
+        self.lower95CI = lower * correction
+        self.upper95CI = upper * correction
+        return (self.lower95CI, self.upper95CI)
+        
+    def __repr__(self):
+        repr_string = ('\n\nEffect size' +
+        '\n  Hedges unbiased d = \t {0:.6f}'.format(self.d) +
+        '\n  approximate 95% confidence intervals ' +
+        '\n  upper 95% CI =\t {0:.6f}'.format(self.upper95CI) +
+        '\n  lower 95% CI =\t {0:.6f}'.format(self.lower95CI))
+    
+        return repr_string
+
+    def __bootstrap_replicates(self, repeats, seed):
+        # biased Hedges' g for each of repeats bootstrap resamples
+        
+        blocks = list(self.__bootstrap_blocks(repeats, seed))
+        if np is None:
+            return [d for block in blocks for d in block]
+        return np.concatenate(blocks) if blocks else np.empty(0)
+
+    def __bootstrap_blocks(self, repeats, seed):
+        # the same, a block of replicates at a time, so that memory stays
+        # within random_streams.BLOCK_ELEMENTS whatever the sample size
+        
+        n1m = len (self.s1) - 1
+        n2m = len (self.s2) - 1
+        rng = serial_rng(seed)
+        x1, x2 = self.summary1.data, self.summary2.data
+        if np is not None:
+            x1, x2 = np.asarray(x1), np.asarray(x2)
+        
+        for size in block_sizes(repeats, len(x1) + len(x2)):
+            if np is None:
+                hedges_d_bs = []
+                for n in range (size):
+                    br1 = bootstrap(x1, rng)
+                    br2 = bootstrap(x2, rng)
+                
+                    #means and SDs of bootstrap sampled distributions
+                    mbr1, sbr1 = mean_SD(br1)
+                    mbr2, sbr2 = mean_SD(br2)
+                    s_pooled = math.sqrt((n2m * sbr2 ** 2 + n1m * sbr1 ** 2) / (n1m + n2m))
+                    hedges_d_bs.append((mbr2 - mbr1) / s_pooled)
+                yield hedges_d_bs
+            else:
+                # resample the whole block as index arrays
+                mbr1, ssbr1 = resampled_moments(x1, size, rng)
+                mbr2, ssbr2 = resampled_moments(x2, size, rng)
+                s_pooled = np.sqrt((ssbr1 + ssbr2) / (n1m + n2m))
+                yield (mbr2 - mbr1) / s_pooled
+
+    def bias_corrected_bs_CI(self, repeats=5000, seed=None):
+        # bias-corrected and accelerated (BCa) 95% interval
+        # Efron and Tibshirani (1993) An Introduction to the Bootstrap, ch. 14
+        # uses the replicates of the last bootstrap_CI run, if there was one,
+        # so costs only a count over them and an O(n) jackknife
+        
+        if self.hedges_d_bs is None:
+            self.hedges_d_bs = self.__bootstrap_replicates(repeats, seed)
+        if self.d == 0:
+            self.hedges_d_unbiased()
+        repeats = len(self.hedges_d_bs)
+        
+        # bias correction: normal quantile of the fraction of replicates
+        # below the (biased) estimate, kept off 0 and 1
+        biased_d = self.d / self.correction
+        if np is None:
+            below = sum(1 for d in self.hedges_d_bs if d < biased_d)
+        else:
+            below = np.count_nonzero(np.asarray(self.hedges_d_bs) < biased_d)
+        below = min(max(below, 0.5), repeats - 0.5)
+        z0 = InverseNormal(float(below) / repeats)
+        
+        a = self.__acceleration()
+        levels = []
+        for z in (InverseNormal(0.025), InverseNormal(0.975)):
+            zbca = z0 + (z0 + z) / (1 - a * (z0 + z))
+            levels.append(NormalCDF(zbca))
+        return self.__percentile_CI(*levels)
+    
+    def __acceleration(self):
+        # jackknife estimate of the acceleration, leaving out each observation
+        # of either sample in turn; the leave-one-out moments are updates of
+        # the full ones, mean_(i) = mean - (x_i - mean) / (n - 1) and
+        # SS_(i) = SS - n (x_i - mean)^2 / (n - 1), so this is O(n)
+        
+        summaries = (self.summary1, self.summary2)
+        ss = sum((s.n - 1) * s.variance for s in summaries)
+        df = self.summary1.n + self.summary2.n - 3
+        jackknife = []
+        for k, summary in enumerate(summaries):
+            n = summary.n
+            for x in summary.data:
+                dev = x - summary.mean
+                means = [self.summary1.mean, self.summary2.mean]
+                means[k] -= dev / (n - 1)
+                s_pooled = math.sqrt((ss - n * dev ** 2 / (n - 1)) / df)
+                jackknife.append((means[1] - means[0]) / s_pooled)
+        
+        jackknife_mean = math.fsum(jackknife) / len(jackknife)
+        cubes = math.fsum((jackknife_mean - d) ** 3 for d in jackknife)
+        squares = math.fsum((jackknife_mean - d) ** 2 for d in jackknife)
+        return cubes / (6 * squares ** 1.5) if squares > 0 else 0.0
+
+def bootstrap (sample, rng=random):
+    #if sample is [], then the same is returned
+    #draws by index, so memory is O(n) rather than the O(n^2) of l copies
+    return [rng.choice(sample) for i in range(len(sample))]
+
+def resampled_moments (sample, size, rng):
+    # means and sums of squared deviations of size bootstrap resamples of
+    # the NumPy array sample, one resample per row
+    resamples = sample[rng.integers(0, len(sample), (size, len(sample)))]
+    means = resamples.mean(axis=1)
+    return means, ((resamples - means[:, None]) ** 2).sum(axis=1)
+
+
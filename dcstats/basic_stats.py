@@ -1,165 +1,563 @@
-#!/usr/bin python
-""" Some basic statistics functions. To be merged to statistics_EJ.py. """
-
-from math import sqrt, fabs
-
-from dcstats.statistics_EJ import incompleteBeta
-
-def mean(X):
-    """ Calculate mean of a list of values.
-        Parameters
-        ----------
-        X : a list of values
-        """
-    return sum(X) / float(len(X))
-
-def variance(X):
-    """ Calculate variance.
-        Parameters
-        ----------
-        X : a list of values
-    """
-    return sum([(i - mean(X)) ** 2 for i in X]) / (len(X) - 1)
-
-def sd(X):
-    """ Calculate standard deviation.
-        Parameters
-        ----------
-        X : a list of values
-    """   
-    return sqrt(variance(X))   
-
-def sdm(X):
-    """ Calculate standard deviation of the mean.
-        Parameters
-        ----------
-        X : a list of values
-    """   
-    return sd(X) / sqrt(len(X))
-
-def ttest_independent(X, Y):
-    """Calculate t-value and probability for un-paired t-test."""
-    df = len(X) + len(Y) - 2
-    xbar, sdx = mean(X), sd(X)
-    ybar, sdy = mean(Y), sd(Y)
-    tval = (xbar - ybar) / sqrt(sdx**2 / len(X) + sdy**2 / len(Y))
-    P = ttestPDF(fabs(tval), df)
-    return tval, P, df
-
-def ttest_paired(X, Y):
-    """Calculate t-value and probability for paired t-test."""
-    D = []
-    if len(X) == len(Y):
-        for i in range(len(X)):
-            D.append(X[i] - Y[i])    # differences for paired test
-    df = len(D) - 1
-    tval = mean(D) / sdm(D)
-    P = ttestPDF(tval, df)
-    return tval, P, df
-
-def ttestPDF(tval, df):
-    """
-    Calculate two-tailed t-test P-value.
-    """
-    x = df / (df + tval **2)
-    return incompleteBeta(x, 0.5 * df, 0.5)
-
-    
-class TTestBinomial():
-    def __init__(self, ir1, if1, ir2, if2):
-        """ 
-        Parameters
-        ----------
-        ir1 : number of successes in first trial, int
-        if1 : number of failures in first trial, int
-        ir2 : number of successes in second trial, int
-        if2 : number of failures in second trial, int       
-        """
-        self.ir1 = ir1
-        self.if1 = if1
-        self.ir2 = ir2
-        self.if2 = if2
-        self.n1 = ir1 + if1 # tot number of tests in first trial 
-        self.n2 = ir2 + if2 # tot number of tests in second trial
-        self.p1 = float(self.ir1) / float(self.n1) # prob of success in first trial
-        self.p2 = float(self.ir2) / float(self.n2) # prob of success in second trial
-        self.__t_test()
-
-    def __t_test(self):
-        """" Use Gaussian approx to do 2 sample t test. """
-        ppool = float(self.ir1 + self.ir2) / float(self.n1 + self.n2)
-        self.sd1 = sqrt(self.p1 * (1.0 - self.p1) / float(self.n1))
-        self.sd2 = sqrt(self.p2 * (1.0 - self.p2) / float(self.n2))
-        sd1p = sqrt(ppool * (1.0 - ppool) / float(self.n1))
-        sd2p = sqrt(ppool * (1.0 - ppool) / float(self.n2))
-        sdiff = sqrt(sd1p * sd1p + sd2p * sd2p)
-        self.tval = fabs(self.p1 - self.p2) / sdiff
-        df = 100000    # to get Gaussian
-        self.P = ttestPDF(self.tval, df)
-        
-    def __repr__(self):        
-        repr_string = ('\n Set 1: {0:d} successes out of {1:d};'.format(self.ir1, self.n1) +
-            '\n p1 = {0:.6f};   SD(p1) = {1:.6f}'.format(self.p1, self.sd1) +
-            '\n Set 2: {0:d} successes out of {1:d};'.format(self.ir2, self.n2) +
-            '\n p2 = {0:.6f};   SD(p2) = {1:.6f}'.format(self.p2, self.sd2) +
-            '\n Observed difference between sets, p1-p2 = {0:.6f}'.format(self.p1 - self.p2) +
-            '\n\n Observed 2x2 table:' +
-            '\n  Set 1:    {0:d}      {1:d}      {2:d}'.format(self.ir1, self.if1, self.n1) +
-            '\n  Set 2:    {0:d}      {1:d}      {2:d}'.format(self.ir2, self.if2, self.n2) +
-            '\n  Total:    {0:d}      {1:d}      {2:d}'.format(
-            self.ir1 + self.ir2, self.if1 + self.if2, self.n1 + self.n2) +
-            '\n\n Two-sample unpaired test using Gaussian approximation to binomial:' +
-            '\n standard normal deviate = {0:.6f}; two tail P = {1:.6f}.'.format(self.tval, self.P))
-        return repr_string
-
-
-class TTestContinuous(object):
-    def __init__(self, X, Y, are_paired):
-        """ 
-        Parameters
-        ----------
-        X : observations in first trial, list of floats
-        Y : observations in second trial, list of floats
-        are_paired : are observations paired, boolean
-        """
-        
-        self.X, self.Y = X, Y
-        self.are_paired = are_paired
-        self.D = []
-        if len(self.X) == len(self.Y):
-            for i in range(len(self.X)):
-                self.D.append(self.X[i] - self.Y[i])    # differences for paired test
-            self.dbar, self.sdd, self.sdmd = mean(self.D), sd(self.D), sdm(self.D)
-        else:
-            self.dbar = fabs(self.xbar - self.ybar)
-            self.are_paired = False
-        self.__t_test()
-        
-    def __t_test(self):
-        if self.are_paired:               # And do a 2-sample paired t-test
-            self.tval, self.P, self.df = ttest_paired(self.X, self.Y)
-        else:    # if not paired
-            self.tval, self.P, self.df = ttest_independent(self.X, self.Y)
-
-    def __repr__(self):
-        
-        repr_string = ('n \t\t {0:d}      \t  {1:d}'.format(len(self.X), len(self.Y)) +
-            '\nMean \t\t {0:.6f}    \t  {1:.6f}'.format(mean(self.X), mean(self.Y)) +
-            '\nSD \t\t {0:.6f}     \t  {1:.6f}'.format(sd(self.X), sd(self.Y)) +
-            '\nSDM \t\t {0:.6f}     \t  {1:.6f}'.format(sdm(self.X), sdm(self.Y)))
-            
-        if len(self.X) == len(self.Y):
-            repr_string += ('\n\n Mean difference (dbar) = \t {0:.6f}'.format(self.dbar) +
-                '\n  s(d) = \t {0:.6f} \t s(dbar) = \t {1:.6f}'.format(self.sdd, self.sdmd))
-
-        if self.are_paired:
-            repr_string += ('\n\n Paired Student''s t-test:' +
-                '\n  t({0:d})= \t dbar / s(dbar) \t = \t {1:.6f}'.format(self.df, self.tval) +
-                '\n  two tail P =\t {0:.6f}'.format(self.P))
-
-        else:
-            repr_string += ('\n\n Two-sample unpaired Student''s t-test:' +
-                '\n t = \t {0:.6f}'.format(float(self.tval)) +
-                '\n two tail P = \t {0:.6f}'.format(self.P))
-            
-        return repr_string
+#!/usr/bin python
+""" Some basic statistics functions. To be merged to statistics_EJ.py. """
+
+from math import sqrt, fabs
+from array import array
+
+from dcstats.statistics_EJ import incompleteBeta, incompleteBetaArray
+
+try:
+    import numpy as np
+except ImportError:
+    # NumPy is optional: TTestColumns then tests the columns one by one,
+    # and order statistics are found by sorting.
+    np = None
+
+def summarise(X):
+    """ Return X if it is already a SampleSummary, otherwise summarise it. """
+    if isinstance(X, SampleSummary):
+        return X
+    return SampleSummary(X)
+
+def mean(X):
+    """ Calculate mean of a list of values.
+        Parameters
+        ----------
+        X : a list of values or a SampleSummary
+        """
+    if isinstance(X, SampleSummary):
+        return X.mean
+    return sum(X) / float(len(X))
+
+def variance(X):
+    """ Calculate variance.
+        Parameters
+        ----------
+        X : a list of values or a SampleSummary
+    """
+    if isinstance(X, SampleSummary):
+        return X.variance
+    xbar = mean(X)
+    return sum([(i - xbar) ** 2 for i in X]) / (len(X) - 1)
+
+def sd(X):
+    """ Calculate standard deviation.
+        Parameters
+        ----------
+        X : a list of values or a SampleSummary
+    """   
+    return sqrt(variance(X))   
+
+def sdm(X):
+    """ Calculate standard deviation of the mean.
+        Parameters
+        ----------
+        X : a list of values or a SampleSummary
+    """   
+    return sd(X) / sqrt(len(X))
+
+class RunningStats(object):
+    __slots__ = ('n', 'mean', 'M2', 'min', 'max')
+
+    def __init__(self, X=()):
+        """ Single-pass summary (count, mean, sum of squared deviations M2,
+        minimum and maximum) that can be updated value by value or chunk by
+        chunk, and merged with summaries of other parts of the data, so that
+        large data can be summarised in pieces or in parallel. The
+        variance, sd and sdm are properties, as for SampleSummary.
+        Updates follow Welford (1962) for single values and Chan, Golub &
+        LeVeque (1979) for chunks and merges.
+        Parameters
+        ----------
+        X : values to start with, iterable of floats
+        """
+        self.n = 0
+        self.mean = 0.0
+        self.M2 = 0.0
+        self.min = float('inf')
+        self.max = float('-inf')
+        self.extend(X)
+
+    def add(self, x):
+        """ Add a single value. """
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / float(self.n)
+        self.M2 += delta * (x - self.mean)
+        self.min = min(self.min, x)
+        self.max = max(self.max, x)
+
+    def extend(self, X):
+        """ Add a chunk of values: the chunk is summarised in two passes and
+        merged. """
+        X = list(X)
+        if X:
+            chunk = RunningStats()
+            chunk.n = len(X)
+            chunk.mean = sum(X) / float(chunk.n)
+            chunk.M2 = float(sum([(x - chunk.mean) ** 2 for x in X]))
+            chunk.min, chunk.max = min(X), max(X)
+            RunningStats.merge(self, chunk)
+
+    def merge(self, other):
+        """ Merge the summary of another part of the data into this one. """
+        if other.n == 0:
+            return
+        if self.n == 0:
+            self.n, self.mean, self.M2 = other.n, other.mean, other.M2
+            self.min, self.max = other.min, other.max
+            return
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.M2 += other.M2 + delta * delta * self.n * other.n / float(n)
+        self.mean += delta * other.n / float(n)
+        self.n = n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def variance(self):
+        """ Sample variance (n - 1 divisor); nan for fewer than two values. """
+        if self.n > 1:
+            return self.M2 / (self.n - 1)
+        return float('nan')
+
+    @property
+    def sd(self):
+        """ Sample standard deviation. """
+        return sqrt(self.variance)
+
+    @property
+    def sdm(self):
+        """ Standard deviation of the mean. """
+        return sqrt(self.variance / self.n)
+
+    def __repr__(self):
+        return ('n = {0:d}; mean = {1:.6f}; SD = {2:.6f}; min = {3:.6f}; max = {4:.6f}'.
+            format(self.n, self.mean, self.sd, self.min, self.max))
+
+class SampleSummary(RunningStats):
+    """ Sample moments, computed once and passed on to every calculation that
+    needs them (TTestContinuous, RantestContinuous, Hedges_d). A RunningStats
+    that also keeps the values, in a compact array of doubles, with their sum
+    and sum of squares, so that the summary can be used wherever the list of
+    observations is expected.
+    """
+    __slots__ = ('data', 'sum', 'sumsq')
+
+    def __init__(self, X=()):
+        """
+        Parameters
+        ----------
+        X : observations, list of floats
+        """
+        self.data = array('d')
+        self.sum = 0.0
+        self.sumsq = 0.0
+        RunningStats.__init__(self, X)
+
+    def add(self, x):
+        """ Add a single observation. """
+        self.extend([x])
+
+    def extend(self, X):
+        """ Add a chunk of observations. """
+        X = array('d', X)
+        self.data.extend(X)
+        self.sum += sum(X)
+        self.sumsq += sum([x * x for x in X])
+        RunningStats.extend(self, X)
+
+    def merge(self, other):
+        """ Add the observations of another SampleSummary. """
+        self.extend(other.data)
+
+    def __len__(self):
+        return self.n
+
+    def __iter__(self):
+        return iter(self.data)
+
+    def __getitem__(self, index):
+        return self.data[index]
+
+def order_statistics(X, fractions):
+    """ Values of rank int(f * n), counting from 0 for the smallest, in X
+    for each fraction f (clipped to the largest value), the convention that
+    bootstrap percentile intervals use. With NumPy they are found by
+    selection (partition) in O(n) time; otherwise X is sorted. """
+    n = len(X)
+    ranks = [min(int(f * n), n - 1) for f in fractions]
+    if np is None:
+        ranked = sorted(X)
+        return [ranked[k] for k in ranks]
+    partitioned = np.partition(np.asarray(X, dtype=float), ranks)
+    return [float(partitioned[k]) for k in ranks]
+
+class QuantileSketch(object):
+    def __init__(self, X=(), nbins=4096):
+        """ Streaming quantiles in bounded memory, for runs too long to keep
+        every value, such as very large bootstrap runs.
+        The first nbins values are kept and their quantiles are exact. After
+        that values are only counted in nbins equal bins spanning all values
+        seen; a value outside them makes neighbouring bins merge in pairs,
+        doubling the span. A quantile is interpolated within the bin holding
+        the value of that rank, so it is never further from the exact order
+        statistic than one bin width, which error_bound() returns.
+        Parameters
+        ----------
+        X : values to start with, iterable of floats
+        nbins : number of bins (rounded up to even), memory is O(nbins)
+        """
+        self.nbins = nbins + nbins % 2
+        self.n = 0
+        self.min = float('inf')
+        self.max = float('-inf')
+        self.values = []
+        self.counts = None
+        self.low = self.width = None
+        self.extend(X)
+
+    def add(self, x):
+        """ Add a single value. """
+        self.extend([x])
+
+    def extend(self, X):
+        """ Add a chunk of values; NumPy arrays are binned in one pass. """
+        if np is None:
+            X = [float(x) for x in X]
+        else:
+            X = np.asarray(X, dtype=float).ravel()
+        if not len(X):
+            return
+        self.n += len(X)
+        low, high = (min(X), max(X)) if np is None else (float(X.min()), float(X.max()))
+        if not float('-inf') < low <= high < float('inf'):
+            raise ValueError('QuantileSketch only counts finite values')
+        self.min, self.max = min(self.min, low), max(self.max, high)
+        if self.counts is None:
+            take = self.nbins - len(self.values)
+            self.values.extend(X[:take])
+            X = X[take:]
+            if len(self.values) < self.nbins:
+                return
+            self.__start_bins()
+        if len(X):
+            self.__expand(low, high)
+            self.__count(X)
+
+    def __start_bins(self):
+        span = self.max - self.min
+        self.low = self.min
+        self.width = (span or abs(self.min) or 1.0) / self.nbins
+        self.counts = [0] * self.nbins if np is None else np.zeros(self.nbins, dtype=np.int64)
+        values, self.values = self.values, []
+        self.__count(values if np is None else np.asarray(values))
+
+    def __expand(self, low, high):
+        # merge bins in pairs, doubling the span to the side of the new values
+        half = self.nbins // 2
+        while low < self.low or high > self.low + self.nbins * self.width:
+            if np is None:
+                merged = [self.counts[2 * i] + self.counts[2 * i + 1] for i in range(half)]
+                zeros = [0] * half
+            else:
+                merged = self.counts.reshape(half, 2).sum(axis=1)
+                zeros = np.zeros(half, dtype=np.int64)
+            if low < self.low:
+                self.low -= self.nbins * self.width
+                self.counts = zeros + merged if np is None else np.concatenate((zeros, merged))
+            else:
+                self.counts = merged + zeros if np is None else np.concatenate((merged, zeros))
+            self.width *= 2
+
+    def __count(self, X):
+        if np is None:
+            for x in X:
+                i = int((x - self.low) / self.width)
+                self.counts[min(max(i, 0), self.nbins - 1)] += 1
+        else:
+            i = np.clip(((X - self.low) / self.width).astype(np.int64), 0, self.nbins - 1)
+            self.counts += np.bincount(i, minlength=self.nbins)
+
+    def quantile(self, fraction):
+        """ Value of rank int(fraction * n), as order_statistics(), to
+        within error_bound(). """
+        if self.counts is None:
+            return order_statistics(self.values, [fraction])[0]
+        rank = min(int(fraction * self.n), self.n - 1)
+        below = 0
+        for i, count in enumerate(self.counts):
+            if below + count > rank:
+                break
+            below += count
+        x = self.low + self.width * (i + (rank - below + 0.5) / float(count))
+        x = float(x)
+        return min(max(x, self.min), self.max)
+
+    def error_bound(self):
+        """ Largest possible difference between a quantile() and the exact
+        order statistic: zero while every value is kept, then a bin width. """
+        return 0.0 if self.counts is None else self.width
+
+    def __repr__(self):
+        return ('n = {0:d}; min = {1:.6f}; max = {2:.6f}; quantile error <= {3:.6g}'.
+            format(self.n, self.min, self.max, self.error_bound()))
+
+def ttest_independent(X, Y):
+    """Calculate t-value and probability for un-paired t-test."""
+    X, Y = summarise(X), summarise(Y)
+    df = X.n + Y.n - 2
+    tval = (X.mean - Y.mean) / sqrt(X.variance / X.n + Y.variance / Y.n)
+    P = ttestPDF(fabs(tval), df)
+    return tval, P, df
+
+def ttest_paired(X, Y):
+    """Calculate t-value and probability for paired t-test."""
+    D = []
+    if len(X) == len(Y):
+        for i in range(len(X)):
+            D.append(X[i] - Y[i])    # differences for paired test
+    D = summarise(D)
+    df = D.n - 1
+    tval = D.mean / D.sdm
+    P = ttestPDF(tval, df)
+    return tval, P, df
+
+def ttestPDF(tval, df):
+    """
+    Calculate two-tailed t-test P-value.
+    """
+    x = df / (df + tval **2)
+    return incompleteBeta(x, 0.5 * df, 0.5)
+
+def ttestPDFArray(tval, df):
+    """
+    Calculate two-tailed t-test P-values for arrays of t-values and degrees
+    of freedom.
+    """
+    if np is None:
+        return [ttestPDF(t, d) for t, d in zip(tval, df)]
+    tval, df = np.broadcast_arrays(np.asarray(tval, dtype=float),
+                                   np.asarray(df, dtype=float))
+    P = np.full(tval.shape, np.nan)
+    # too few observations leave nan t or df < 1; their P stays nan
+    ok = np.isfinite(tval) & (df >= 1)
+    x = df[ok] / (df[ok] + tval[ok] ** 2)
+    P[ok] = incompleteBetaArray(x, 0.5 * df[ok], 0.5)
+    return P
+
+    
+class TTestBinomial():
+    def __init__(self, ir1, if1, ir2, if2):
+        """ 
+        Parameters
+        ----------
+        ir1 : number of successes in first trial, int
+        if1 : number of failures in first trial, int
+        ir2 : number of successes in second trial, int
+        if2 : number of failures in second trial, int       
+        """
+        self.ir1 = ir1
+        self.if1 = if1
+        self.ir2 = ir2
+        self.if2 = if2
+        self.n1 = ir1 + if1 # tot number of tests in first trial 
+        self.n2 = ir2 + if2 # tot number of tests in second trial
+        self.p1 = float(self.ir1) / float(self.n1) # prob of success in first trial
+        self.p2 = float(self.ir2) / float(self.n2) # prob of success in second trial
+        self.__t_test()
+
+    def __t_test(self):
+        """" Use Gaussian approx to do 2 sample t test. """
+        ppool = float(self.ir1 + self.ir2) / float(self.n1 + self.n2)
+        self.sd1 = sqrt(self.p1 * (1.0 - self.p1) / float(self.n1))
+        self.sd2 = sqrt(self.p2 * (1.0 - self.p2) / float(self.n2))
+        sd1p = sqrt(ppool * (1.0 - ppool) / float(self.n1))
+        sd2p = sqrt(ppool * (1.0 - ppool) / float(self.n2))
+        sdiff = sqrt(sd1p * sd1p + sd2p * sd2p)
+        self.tval = fabs(self.p1 - self.p2) / sdiff
+        df = 100000    # to get Gaussian
+        self.P = ttestPDF(self.tval, df)
+        
+    def __repr__(self):        
+        repr_string = ('\n Set 1: {0:d} successes out of {1:d};'.format(self.ir1, self.n1) +
+            '\n p1 = {0:.6f};   SD(p1) = {1:.6f}'.format(self.p1, self.sd1) +
+            '\n Set 2: {0:d} successes out of {1:d};'.format(self.ir2, self.n2) +
+            '\n p2 = {0:.6f};   SD(p2) = {1:.6f}'.format(self.p2, self.sd2) +
+            '\n Observed difference between sets, p1-p2 = {0:.6f}'.format(self.p1 - self.p2) +
+            '\n\n Observed 2x2 table:' +
+            '\n  Set 1:    {0:d}      {1:d}      {2:d}'.format(self.ir1, self.if1, self.n1) +
+            '\n  Set 2:    {0:d}      {1:d}      {2:d}'.format(self.ir2, self.if2, self.n2) +
+            '\n  Total:    {0:d}      {1:d}      {2:d}'.format(
+            self.ir1 + self.ir2, self.if1 + self.if2, self.n1 + self.n2) +
+            '\n\n Two-sample unpaired test using Gaussian approximation to binomial:' +
+            '\n standard normal deviate = {0:.6f}; two tail P = {1:.6f}.'.format(self.tval, self.P))
+        return repr_string
+
+
+class TTestContinuous(object):
+    def __init__(self, X, Y, are_paired):
+        """ 
+        Parameters
+        ----------
+        X : observations in first trial, list of floats
+        Y : observations in second trial, list of floats
+        are_paired : are observations paired, boolean
+        """
+        
+        self.X, self.Y = X, Y
+        self.sx, self.sy = summarise(X), summarise(Y)
+        self.are_paired = are_paired
+        self.D = []
+        if len(self.X) == len(self.Y):
+            for i in range(len(self.X)):
+                self.D.append(self.X[i] - self.Y[i])    # differences for paired test
+            self.sdiff = SampleSummary(self.D)
+            self.dbar, self.sdd, self.sdmd = self.sdiff.mean, self.sdiff.sd, self.sdiff.sdm
+        else:
+            self.dbar = fabs(self.sx.mean - self.sy.mean)
+            self.are_paired = False
+        self.__t_test()
+        
+    def __t_test(self):
+        if self.are_paired:               # And do a 2-sample paired t-test
+            self.df = self.sdiff.n - 1
+            self.tval = self.sdiff.mean / self.sdiff.sdm
+            self.P = ttestPDF(self.tval, self.df)
+        else:    # if not paired
+            self.tval, self.P, self.df = ttest_independent(self.sx, self.sy)
+
+    def __repr__(self):
+        
+        repr_string = ('n \t\t {0:d}      \t  {1:d}'.format(self.sx.n, self.sy.n) +
+            '\nMean \t\t {0:.6f}    \t  {1:.6f}'.format(self.sx.mean, self.sy.mean) +
+            '\nSD \t\t {0:.6f}     \t  {1:.6f}'.format(self.sx.sd, self.sy.sd) +
+            '\nSDM \t\t {0:.6f}     \t  {1:.6f}'.format(self.sx.sdm, self.sy.sdm))
+            
+        if len(self.X) == len(self.Y):
+            repr_string += ('\n\n Mean difference (dbar) = \t {0:.6f}'.format(self.dbar) +
+                '\n  s(d) = \t {0:.6f} \t s(dbar) = \t {1:.6f}'.format(self.sdd, self.sdmd))
+
+        if self.are_paired:
+            repr_string += ('\n\n Paired Student''s t-test:' +
+                '\n  t({0:d})= \t dbar / s(dbar) \t = \t {1:.6f}'.format(self.df, self.tval) +
+                '\n  two tail P =\t {0:.6f}'.format(self.P))
+
+        else:
+            repr_string += ('\n\n Two-sample unpaired Student''s t-test:' +
+                '\n t = \t {0:.6f}'.format(float(self.tval)) +
+                '\n two tail P = \t {0:.6f}'.format(self.P))
+            
+        return repr_string
+
+
+class TTestColumns(object):
+    def __init__(self, data, pairs=None, are_paired=False, names=None):
+        """ Student's t-tests between many pairs of columns of a data
+        matrix at once, with all moments and P values computed in
+        vectorised form (with NumPy; column by column without it).
+
+        Parameters
+        ----------
+        data : observations, either a 2-D array with one column per sample
+            (NaN marks a missing value) or a list of columns such as
+            dataIO.lines_into_traces returns, which may differ in length
+        pairs : (i, j) column indices to compare, list of tuples; all pairs
+            i < j by default
+        are_paired : paired t-tests on rows where both columns have values,
+            boolean
+        names : column names for the results table, list of strings
+        """
+        self.are_paired = are_paired
+        if np is not None:
+            if isinstance(data, np.ndarray):
+                matrix = np.asarray(data, dtype=float).reshape(len(data), -1)
+            else:
+                # columns, padded with NaN to the longest
+                nrows = max([len(c) for c in data] or [0])
+                matrix = np.full((nrows, len(data)), np.nan)
+                for j, column in enumerate(data):
+                    matrix[:len(column), j] = column
+            self.columns = [matrix[:, j][~np.isnan(matrix[:, j])]
+                            for j in range(matrix.shape[1])]
+        else:
+            matrix = None
+            self.__rows = [list(column) for column in data]
+            self.columns = [[x for x in column if x == x] for column in self.__rows]
+        ncols = len(self.columns)
+        if pairs is None:
+            pairs = [(i, j) for i in range(ncols) for j in range(i + 1, ncols)]
+        self.pairs = list(pairs)
+        self.names = list(names) if names else ['{0:d}'.format(j + 1) for j in range(ncols)]
+        if matrix is None:
+            self.__t_tests_loop()
+        else:
+            self.__t_tests_numpy(matrix)
+
+    def __t_tests_numpy(self, matrix):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.__moments_numpy(matrix)
+        self.P = ttestPDFArray(np.fabs(self.tval), self.df)
+
+    def __moments_numpy(self, matrix):
+        I = np.array([i for i, j in self.pairs], dtype=int)
+        J = np.array([j for i, j in self.pairs], dtype=int)
+        if self.are_paired:
+            D = matrix[:, I] - matrix[:, J]
+            keep = ~np.isnan(D)
+            self.n1 = self.n2 = keep.sum(axis=0)
+            X, Y = np.where(keep, matrix[:, I], 0.0), np.where(keep, matrix[:, J], 0.0)
+            self.mean1 = X.sum(axis=0) / self.n1
+            self.mean2 = Y.sum(axis=0) / self.n2
+            dbar = np.where(keep, D, 0.0).sum(axis=0) / self.n1
+            ss = (np.where(keep, D - dbar, 0.0) ** 2).sum(axis=0)
+            self.df = self.n1 - 1
+            self.tval = dbar / np.sqrt(ss / self.df / self.n1)
+        else:
+            keep = ~np.isnan(matrix)
+            n = keep.sum(axis=0)
+            mean = np.where(keep, matrix, 0.0).sum(axis=0) / n
+            var = (np.where(keep, matrix - mean, 0.0) ** 2).sum(axis=0) / (n - 1)
+            self.n1, self.n2 = n[I], n[J]
+            self.mean1, self.mean2 = mean[I], mean[J]
+            self.df = self.n1 + self.n2 - 2
+            self.tval = (self.mean1 - self.mean2) / np.sqrt(var[I] / self.n1 + var[J] / self.n2)
+
+    def __t_tests_loop(self):
+        self.n1, self.n2, self.mean1, self.mean2 = [], [], [], []
+        self.tval, self.df, self.P = [], [], []
+        for i, j in self.pairs:
+            X, Y = self.columns[i], self.columns[j]
+            if self.are_paired:
+                # pair by row, leaving out rows where either value is missing
+                rows = [(x, y) for x, y in zip(self.__rows[i], self.__rows[j])
+                        if x == x and y == y]
+                X, Y = [x for x, y in rows], [y for x, y in rows]
+                tval, P, df = ttest_paired(X, Y)
+            else:
+                tval, P, df = ttest_independent(X, Y)
+            self.n1.append(len(X))
+            self.n2.append(len(Y))
+            self.mean1.append(mean(X))
+            self.mean2.append(mean(Y))
+            self.tval.append(tval)
+            self.df.append(df)
+            self.P.append(P)
+
+    def rows(self):
+        """ Results table: one tuple (name1, name2, n1, n2, mean1, mean2,
+        t, df, P) for each pair of columns. """
+        return [(self.names[i], self.names[j], int(self.n1[k]), int(self.n2[k]),
+                 float(self.mean1[k]), float(self.mean2[k]), float(self.tval[k]),
+                 int(self.df[k]), float(self.P[k]))
+                for k, (i, j) in enumerate(self.pairs)]
+
+    def __repr__(self):
+        title = 'paired' if self.are_paired else 'unpaired'
+        repr_string = ('\n {0:d} {1} Student\'s t-tests:'.format(len(self.pairs), title) +
+            '\nSet 1\tSet 2\tn1\tn2\tMean 1\tMean 2\tt\tdf\ttwo tail P')
+        for row in self.rows():
+            repr_string += ('\n{0}\t{1}\t{2:d}\t{3:d}\t{4:.6f}\t{5:.6f}\t{6:.6f}\t{7:d}\t{8:.6f}'.
+                format(*row))
+        return repr_string
@@ -0,0 +1,62 @@
+#!/usr/bin python
+""" Random streams and block sizes shared by the batched randomisation and
+bootstrap engines (rantest, Hedges). """
+
+import random
+
+try:
+    import numpy as np
+except ImportError:
+    # NumPy is optional: the streams are then the random module or
+    # random.Random instances.
+    np = None
+
+# Largest number of array elements (randomisations x observations) that the
+# batched NumPy engines hold in memory at once.
+BLOCK_ELEMENTS = 2 ** 20
+
+# Randomisations per independently seeded chunk in seeded or parallel runs.
+# Results depend on this but not on the number of worker processes.
+CHUNK_SIZE = 2 ** 16
+
+def numpy_rng():
+    """Return a NumPy generator seeded from the random module, so that
+    random.seed() makes batched runs reproducible as before."""
+    return np.random.default_rng(random.getrandbits(64))
+
+def serial_rng(seed):
+    """Return the single random stream used by runs that are not split
+    into chunks."""
+    if seed is not None:
+        return chunk_rng(seed, 0)
+    return random if np is None else numpy_rng()
+
+def chunk_rng(seed, index):
+    """Return the random stream for chunk index of a run with this seed.
+
+    With NumPy the streams are spawned from one SeedSequence, otherwise
+    each is a random.Random seeded by hashing the seed and index."""
+    if np is None:
+        return random.Random('{0}/{1}'.format(seed, index))
+    return np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(index,)))
+
+def block_sizes(nran, nobs):
+    """Split nran randomisations into blocks of at most BLOCK_ELEMENTS
+    elements when each randomisation touches nobs observations."""
+    rows = max(1, BLOCK_ELEMENTS // max(1, nobs))
+    done = 0
+    while done < nran:
+        size = min(rows, nran - done)
+        yield size
+        done += size
+
+def growing_sizes(nran, nobs, first=64):
+    """Like block_sizes but starting with small blocks that double in
+    size, so that a sequential test can stop soon after it is decided."""
+    rows = max(1, BLOCK_ELEMENTS // max(1, nobs))
+    done = 0
+    while done < nran:
+        size = min(first, rows, nran - done)
+        yield size
+        done += size
+        first *= 2
@@ -1,182 +1,1613 @@
-#!/usr/bin python
-"""rantest.py -- RANDOMISATION TEST FOR TWO SAMPLES.\
-               Converted from David Colquhoun's FORTRAN version RANTEST.FOR"""
-
-import sys
-import math
-import random
-
-import dcstats.basic_stats as bs
-
-# AP 091202 Minor corrections to spelling and spacing of introd.
-# AP 140418 more cosmetic changes for deposition
-# AP 150512 corrected implementation of paired tests, more verbose output.
-
-__author__="Remis Lape"
-__date__ ="$01-May-2009 17:42:28$"
-
-class Rantest(object):
-
-    introd = "  RANTEST performs a randomisation test to compare two " +\
-    "independent samples.  According to the null hypothesis of " +\
-    "no-difference, each outcome would have been the same " +\
-    "regardless of which group the individual happened to " +\
-    "be allocated to.  Therefore all N = n1 + n2 observations are " +\
-    "pooled and, as in the actual experiment, divided at " +\
-    "random into groups of size n1 and n2.  The fraction " +\
-    "of randomisations that gives rise to a difference " +\
-    "between the groups at least as large as that observed " +\
-    "gives the P value.\n" +\
-    "  In the binomial case, in which the measurement is the " +\
-    "fraction of 'successes' in each sample (say r1 out " +\
-    "of n1, and r2 out of n2) a 'success' is given a " +\
-    "score of 1, 'failure' scores 0.\n"
-
-    criterion =  " Randomisation test on binomial data could be done\
-    using as criterion: (1) number of successes in set 1 (r1)\
-    or (2) difference between the p=r/n values.\
-    Both criteria give the same one-tail P value.\
-    Use of r1 as criterion is the direct Monte Carlo\
-    equivalent of summing the the exact Fisher test probabilities\
-    for the observed 2x2 table with those for all tables that depart\
-    further from the null hypothesis in the observed direction.\
-    A 2-tail probablilty can be found by doubling the one-tail\
-    value, at least if the displayed distribution is symmetrical\
-    Use of (p1-p2) as criterion gives both one and two-tail\
-    probabilities directly by seeing how many random allocations\
-    of the observations to groups of size n1 and n2 produce and\
-    absolute value of (p1-p2) at least as big as that observed."
-
-    def __init__(self):
-        pass
-
-class RantestBinomial(Rantest):
-    
-    def __init__(self, ir1, if1, ir2, if2):
-        """ 
-        Parameters
-        ----------
-        ir1 : number of successes in first trial, int
-        if1 : number of failures in first trial, int
-        ir2 : number of successes in second trial, int
-        if2 : number of failures in second trial, int       
-        """
-        self.ir1 = ir1
-        self.if1 = if1
-        self.ir2 = ir2
-        self.if2 = if2
-        self.n1 = ir1 + if1 # tot number of tests in first trial 
-        self.n2 = ir2 + if2 # tot number of tests in second trial
-        self.p1 = float(self.ir1) / float(self.n1) # prob of success in first trial
-        self.p2 = float(self.ir2) / float(self.n2) # prob of success in second trial
-        
-
-    def run_rantest(self, nran):
-        self.nran = nran
-        self.dobs = self.p1 - self.p2
-        allobs = [1]*self.ir1 + [0]*self.if1 + [1]*self.ir2 + [0]*self.if2
-        self.randiff = []
-        self.randis1 = []
-        for n in range(0, self.nran):
-            # this if is needed for Python backward compatibility 
-            if sys.version_info[0] < 3: 
-                iran = range(0,(self.n1 + self.n2))
-            else:
-                iran = list(range(0, self.n1 + self.n2))
-            random.shuffle(iran)
-            
-            # number of success in randomised second trial
-            is2 = [allobs[i] for i in iran[self.n1:]].count(1)
-            is1 = self.ir1 + self.ir2 - is2 # number of success in randomised first trial
-            dran = is1 / float(self.n1) - is2 / float(self.n2) # difference between means
-            self.randis1.append(float(is1))
-            self.randiff.append(float(dran))
-            
-        self.ng1 = len([i for i in self.randiff if i >= self.dobs])
-        self.ne1 = len([i for i in self.randiff if i == self.dobs])
-        self.nl1 = len([i for i in self.randiff if i <= self.dobs])
-
-        self.pg1 = float(self.ng1) / float(self.nran)
-        self.pl1 = float(self.nl1) / float(self.nran)
-        self.pe1 = float(self.ne1) / float(self.nran)
-        self.__rantest_done = True
-        
-    def __repr__(self):        
-        return ('\n\n Rantest:  {0:d} randomisations:'.format(self.nran) +
-            '\n P values for difference between sets are:' +
-            '\n  r1 greater than or equal to observed: P = {0:.6f}'.format(self.pg1) +
-            '\n  r1 less than or equal to observed: P = {0:.6f}'.format(self.pl1) +
-            '\n  r1 equal to observed: number = {0:d} (P = {1:.6f})'.format(self.ne1, self.pe1))
-
-
-class RantestContinuous(Rantest):
-    def __init__(self, X, Y, are_paired):
-        """ 
-        Parameters
-        ----------
-        X : observations in first trial, list of floats
-        Y : observations in second trial, list of floats
-        are_paired : are observations paired, boolean
-        """
-        
-        self.X, self.Y = X, Y
-        self.nx, self.ny = len(X), len(Y)
-        self.are_paired = are_paired
-            
-    def run_rantest(self, nran):
-
-        self.randiff = []
-        self.na1 = 0
-        self.ne2 = 0
-        if self.are_paired:
-            self.D = []
-            for i in range(self.nx):
-                self.D.append(self.X[i] - self.Y[i])    # differences for paired test
-            self.dbar = bs.mean(self.D)
-            
-            for n in range(nran):
-                sd = 0.0
-                for i in range(0, self.nx):
-                    u = random.random()
-                    if u < 0.5:
-                        sd -= self.D[i]
-                    else:
-                        sd += self.D[i]
-                dran = sd / float(self.nx)    # mean difference
-                self.randiff.append(dran)
-                if math.fabs(dran) >= math.fabs(self.dbar): self.na1 += 1
-                if math.fabs(dran) == math.fabs(self.dbar): self.ne2 += 1
-                # end of if(paired)
-
-        else:    # if not paired
-            self.dbar = bs.mean(self.X) - bs.mean(self.Y)
-            allobs = self.X + self.Y
-            stot = sum(self.X) + sum(self.Y)
-            # start randomisation
-            for n in range(0, nran):
-                random.shuffle(allobs)
-                sy = sum(allobs[self.nx : ])
-                dran = (stot - sy) / float(self.nx) - sy / float(self.ny)
-                self.randiff.append(dran)
-                if math.fabs(dran) >= math.fabs(self.dbar): self.na1 += 1
-                if math.fabs(dran) == math.fabs(self.dbar): self.ne2 += 1
-                
-        self.ng1 = len([i for i in self.randiff if i >= self.dbar])
-        self.ne1 = len([i for i in self.randiff if i == self.dbar])
-        self.nl1 = len([i for i in self.randiff if i <= self.dbar])
-        self.pg1 = self.ng1 / float(nran)
-        self.pl1 = self.nl1 / float(nran)
-        self.pe1 = self.ne1 / float(nran)
-        self.pa1 = self.na1 / float(nran)
-        self.pe2 = self.ne2 / float(nran)
-        self.nran = nran
-        
-    def __repr__(self):
-        return ('\n\n   Rantest:  {0:d} randomisations'.format(self.nran) +
-        '\n P values for difference between means ' +
-        '\n  greater than or equal to observed: P = \t {0:.6f}'.format(self.pg1) +
-        '\n  less than or equal to observed: P = \t {0:.6f}'.format(self.pl1) +
-        '\n  greater than or equal in absolute value to observed: P = \t {0:.6f}'.format(self.pa1) +
-        '\n  Number equal to observed = {0:d} (P= {1:.6f})'.format(self.ne1, self.pe1) +
-        '\n  Number equal in absolute value to observed = {0:d} (P= {1:.6f})'.format(self.ne2, self.pe2))
-
+#!/usr/bin python
+"""rantest.py -- RANDOMISATION TEST FOR TWO SAMPLES.\
+               Converted from David Colquhoun's FORTRAN version RANTEST.FOR"""
+
+import copy
+import math
+import bisect
+import random
+
+import dcstats.basic_stats as bs
+from dcstats.statistics_EJ import clopper_pearson
+from dcstats.random_streams import CHUNK_SIZE
+from dcstats.random_streams import block_sizes, growing_sizes
+from dcstats.random_streams import chunk_rng, numpy_rng, serial_rng
+
+try:
+    import numpy as np
+except ImportError:
+    # NumPy is optional: without it the randomisations run in the
+    # original pure Python loops.
+    np = None
+
+# AP 091202 Minor corrections to spelling and spacing of introd.
+# AP 140418 more cosmetic changes for deposition
+# AP 150512 corrected implementation of paired tests, more verbose output.
+
+__author__="Remis Lape"
+__date__ ="$01-May-2009 17:42:28$"
+
+# Stream state recorded for sequential and adaptive runs, which cannot be
+# topped up.
+_SEQUENTIAL = ('sequential',)
+
+def _check_extend(h, alpha, se, ci_width, stream):
+    """Only fixed-size Monte Carlo runs can be topped up."""
+    if (not (h is None and alpha is None and se is None and ci_width is None)
+        or stream == _SEQUENTIAL):
+        raise ValueError('Sequential and adaptive runs cannot be extended')
+
+_pools = {}
+
+def _pool(workers):
+    """Return a process pool of this size, created once and reused by
+    later calls."""
+    if workers not in _pools:
+        import atexit
+        import multiprocessing
+        _pools[workers] = multiprocessing.Pool(workers)
+        atexit.register(_pools[workers].terminate)
+    return _pools[workers]
+
+def _rantest_chunk(task):
+    """Run one chunk of randomisations; module level so a pool can call it."""
+    rantest, nran, seed, index = task
+    return rantest._run_chunk(nran, seed, index)
+
+def _randomise(rantest, nran, workers, seed, stream=None):
+    """Run nran randomisations of rantest and merge them into its counts.
+
+    Without a seed or workers this draws from the random module as usual.
+    Otherwise nran is split into chunks of CHUNK_SIZE, each run on its own
+    stream derived from seed, and merged in order, so a given seed gives
+    bit-identical results however many worker processes share the work.
+
+    Returns the state of the random stream, which can be passed back as
+    stream to continue the same run with more randomisations. A seeded
+    top-up starts at the next chunk, so it gives the counts of a single
+    seeded run of the full size only if every earlier nran was a multiple
+    of CHUNK_SIZE."""
+    if stream is None:
+        if not workers and seed is None:
+            stream = ('rng', random if np is None else numpy_rng())
+        else:
+            stream = ('chunks', random.getrandbits(63) if seed is None else seed, 0)
+    if stream[0] == 'rng':
+        rantest._run_blocks(nran, stream[1])
+        return stream
+    seed, first = stream[1], stream[2]
+    tasks = []
+    done = 0
+    while done < nran:
+        size = min(CHUNK_SIZE, nran - done)
+        # a copy without the counts accumulated so far, so that randiff and
+        # the histogram are not sent to the workers with every chunk
+        worker = copy.copy(rantest)
+        worker._clear_counts()
+        tasks.append((worker, size, seed, first + len(tasks)))
+        done += size
+    if workers and workers > 1:
+        results = _pool(workers).map(_rantest_chunk, tasks)
+    else:
+        results = [_rantest_chunk(task) for task in tasks]
+    for counts in results:
+        rantest._merge(counts)
+    return ('chunks', seed, first + len(tasks))
+
+# Largest number of pairs for which the exact paired test is attempted; the
+# meet-in-the-middle count then holds 2 ** 20 sums for each half.
+EXACT_PAIRED_MAX = 40
+# Largest number of allocations C(n1 + n2, n1) for which the exact unpaired
+# test is attempted.
+EXACT_UNPAIRED_MAX = 10 ** 8
+# Finest quantisation step looked for when detecting discretised data.
+LATTICE_DECIMALS = 6
+# Largest number of counts (subset sizes x sums) the shift algorithm holds.
+EXACT_SHIFT_MAX = 10 ** 7
+# Sums from the exact enumerations are compared with the observed sum to
+# within this fraction of sum(|D|), to absorb rounding in the updates.
+EXACT_RTOL = 1e-9
+
+# log(n!) for n = 0, 1, ...; grown as needed and kept for later calls.
+_log_factorials = [0.0]
+
+def _log_factorial(n):
+    """Return log(n!) from the cached table."""
+    if n >= len(_log_factorials):
+        _log_factorials.extend(math.lgamma(m + 1)
+            for m in range(len(_log_factorials), n + 1))
+    return _log_factorials[n]
+
+def _hypergeometric_pmf(ngood, nbad, nsample):
+    """Return the probabilities of 0..nsample good items in a sample of
+    nsample drawn without replacement from ngood good and nbad bad ones."""
+    lf = _log_factorial
+    ntotal = ngood + nbad
+    lf(ntotal)    # fill the table once for every term below
+    lognorm = (lf(ngood) + lf(nbad) + lf(nsample) + lf(ntotal - nsample) -
+        lf(ntotal))
+    pmf = [0.0] * (nsample + 1)
+    for k in range(max(0, nsample - nbad), min(nsample, ngood) + 1):
+        pmf[k] = math.exp(lognorm - lf(k) - lf(ngood - k) - lf(nsample - k) -
+            lf(nbad - nsample + k))
+    return pmf
+
+def _signed_sums(values):
+    """Return the 2**len(values) sums of values for every choice of signs."""
+    if np is None:
+        sums = [0.0]
+        for v in values:
+            sums = [s + v for s in sums] + [s - v for s in sums]
+        return sorted(sums)
+    sums = np.zeros(1)
+    for v in values:
+        sums = np.concatenate((sums + v, sums - v))
+    return np.sort(sums)
+
+def _count_pair_sums(A, B, c, strict=False):
+    """Count pairs (a, b) from ascending A and B with a + b >= c, or with
+    a + b > c if strict."""
+    if np is not None:
+        side = 'right' if strict else 'left'
+        return int(len(A) * len(B) - np.searchsorted(B, c - A, side=side).sum())
+    # Two pointers: as a increases the smallest admissible b moves down.
+    count, j = 0, len(B)
+    for a in A:
+        while j > 0 and (B[j - 1] > c - a if strict else B[j - 1] >= c - a):
+            j -= 1
+        count += len(B) - j
+    return count
+
+def _binomial(n, k):
+    """Return C(n, k) as an exact integer."""
+    if hasattr(math, 'comb'):
+        return math.comb(n, k)
+    c = 1
+    for i in range(min(k, n - k)):
+        c = c * (n - i) // (i + 1)
+    return c
+
+def _binomial_table(n, k):
+    """Return table with table[m][r] = C(m, r) for m <= n and r <= k."""
+    table = [[1] + [0] * k]
+    for m in range(1, n + 1):
+        prev = table[-1]
+        table.append([1] + [prev[r - 1] + prev[r] for r in range(1, k + 1)])
+    return table
+
+def _count_subsets(values, k, t, strict=False):
+    """Count k-subsets of values (sorted in descending order) whose sum is at
+    least t, or greater than t if strict.
+
+    Depth-first branch and bound: a subtree in which even the smallest
+    reachable sum passes the threshold is counted as a whole from the
+    binomial table, and one in which the largest cannot is dropped."""
+    n = len(values)
+    comb = _binomial_table(n, k)
+    prefix = [0.0]
+    for v in values:
+        prefix.append(prefix[-1] + v)
+    count = 0
+    stack = [(0, k, 0.0)]    # (next index, number still to choose, sum so far)
+    while stack:
+        i, r, s = stack.pop()
+        lo = s + (prefix[n] - prefix[n - r])
+        hi = s + (prefix[i + r] - prefix[i])
+        if lo > t or (lo == t and not strict):
+            count += comb[n - i][r]
+        elif hi > t or (hi == t and not strict):
+            stack.append((i + 1, r - 1, s + values[i]))
+            if n - i - 1 >= r:
+                stack.append((i + 1, r, s))
+    return count
+
+def _count_subsets_beyond(values, k, t, upper, strict=False):
+    """Count k-subsets of values with sum >= t (upper) or <= t (not upper),
+    the inequality being strict if strict.
+
+    The tail on the far side of the mean subset sum is the one enumerated,
+    and the other is found as its complement."""
+    mu = k * sum(values) / float(len(values))
+    if (t >= mu) == upper:
+        if upper:
+            return _count_subsets(sorted(values, reverse=True), k, t, strict)
+        return _count_subsets(sorted([-v for v in values], reverse=True),
+            k, -t, strict)
+    total = _binomial(len(values), k)
+    return total - _count_subsets_beyond(values, k, t, not upper, not strict)
+
+def _lattice(values, step=None):
+    """Express values as integer multiples of a quantisation step.
+
+    Returns (ints, step). Without a step, the coarsest step 10**-d * g with
+    d <= LATTICE_DECIMALS that fits every value is detected, and None is
+    returned if there is none. A step only fits if every value is within
+    1e-6 steps of a multiple, values that differ by more than rounding
+    (EXACT_RTOL of the largest) get different multiples, not all of them
+    are zero, and the multiples reproduce the values to within rounding.
+    A given step that does not fit the values raises ValueError."""
+    if step is not None:
+        ints = [int(round(v / float(step))) for v in values]
+        if any(math.fabs(i * step - v) > 1e-6 * math.fabs(step)
+            for i, v in zip(ints, values)):
+            raise ValueError('Data are not multiples of step {0}'.format(step))
+        return ints, step
+    tol = EXACT_RTOL * max([math.fabs(v) for v in values] or [0.0])
+    if tol == 0.0:
+        return None    # all zero: there is no step to find
+    for d in range(LATTICE_DECIMALS + 1):
+        unit = 10.0 ** -d
+        ints = [int(round(v / unit)) for v in values]
+        if any(math.fabs(i * unit - v) > 1e-6 * unit for i, v in zip(ints, values)):
+            continue
+        if not any(ints) or not _separates(values, ints, tol):
+            continue
+        g = 0
+        for i in ints:
+            while i:
+                g, i = i, g % i
+        g = abs(g) or 1
+        ints, step = [i // g for i in ints], g * unit
+        if all(math.fabs(i * step - v) <= tol for i, v in zip(ints, values)):
+            return ints, step
+    return None
+
+def _separates(values, ints, tol):
+    """True if values sharing a multiple agree to within tol, so that the
+    lattice does not merge distinct values."""
+    spans = {}
+    for i, v in zip(ints, values):
+        lo, hi = spans.get(i, (v, v))
+        spans[i] = (min(lo, v), max(hi, v))
+    return all(hi - lo <= tol for lo, hi in spans.values())
+
+def _shift_size(k, ints):
+    """Number of counts the shift algorithm holds for k-subsets of the
+    nonnegative ints (k = 1: signed sums of the paired ints)."""
+    if k == 1:
+        return 2 * sum(abs(i) for i in ints) + 1
+    return (k + 1) * (k * max(ints) + 1)
+
+def _check_shift_size(k, ints):
+    if _shift_size(k, ints) > EXACT_SHIFT_MAX:
+        raise ValueError('Shift algorithm is limited to ' +
+            '{0:d} counts; use a coarser step'.format(EXACT_SHIFT_MAX))
+
+class Rantest(object):
+
+    introd = "  RANTEST performs a randomisation test to compare two " +\
+    "independent samples.  According to the null hypothesis of " +\
+    "no-difference, each outcome would have been the same " +\
+    "regardless of which group the individual happened to " +\
+    "be allocated to.  Therefore all N = n1 + n2 observations are " +\
+    "pooled and, as in the actual experiment, divided at " +\
+    "random into groups of size n1 and n2.  The fraction " +\
+    "of randomisations that gives rise to a difference " +\
+    "between the groups at least as large as that observed " +\
+    "gives the P value.\n" +\
+    "  In the binomial case, in which the measurement is the " +\
+    "fraction of 'successes' in each sample (say r1 out " +\
+    "of n1, and r2 out of n2) a 'success' is given a " +\
+    "score of 1, 'failure' scores 0.\n"
+
+    criterion =  " Randomisation test on binomial data could be done\
+    using as criterion: (1) number of successes in set 1 (r1)\
+    or (2) difference between the p=r/n values.\
+    Both criteria give the same one-tail P value.\
+    Use of r1 as criterion is the direct Monte Carlo\
+    equivalent of summing the the exact Fisher test probabilities\
+    for the observed 2x2 table with those for all tables that depart\
+    further from the null hypothesis in the observed direction.\
+    A 2-tail probablilty can be found by doubling the one-tail\
+    value, at least if the displayed distribution is symmetrical\
+    Use of (p1-p2) as criterion gives both one and two-tail\
+    probabilities directly by seeing how many random allocations\
+    of the observations to groups of size n1 and n2 produce and\
+    absolute value of (p1-p2) at least as big as that observed."
+
+    def __init__(self):
+        pass
+
+    def _run_sequential(self, nran, h, alpha, seed, nobs):
+        """Randomise until h randomisations as extreme as the observation
+        have been seen, or at most nran times (Besag & Clifford, 1991).
+
+        With alpha, also stop once the decision at alpha cannot change:
+        h is lowered to the count that makes P > alpha, and the run stops
+        early as soon as P <= alpha whatever the remaining randomisations
+        give. Returns (randomisations done, P). P is h / L when stopped at
+        L randomisations with h exceedances and (g + 1) / (nran + 1) with g
+        exceedances otherwise."""
+        if alpha is not None:
+            # the smallest h with h / nran > alpha, so P = h / L > alpha
+            # wherever the h-th exceedance falls
+            halpha = int(math.floor(alpha * nran)) + 1
+            h = halpha if h is None else min(h, halpha)
+        done, g = 0, 0
+        for block in self._blocks(growing_sizes(nran, nobs), serial_rng(seed)):
+            exceed = self._exceeds(block)
+            if np is None:
+                hits = [i for i, e in enumerate(exceed) if e]
+            else:
+                hits = np.flatnonzero(exceed)
+            if g + len(hits) >= h:
+                block = block[:hits[h - g - 1] + 1]    # stop at the h-th
+                self._add(block)
+                done += len(block)
+                return done, h / float(done)
+            self._add(block)
+            done += len(block)
+            g += len(hits)
+            if alpha is not None and g + nran - done + 1 <= alpha * (nran + 1):
+                # significant at alpha even if every remaining one exceeds
+                return done, (g + nran - done + 1) / float(nran + 1)
+        return done, (g + 1) / float(nran + 1)
+
+    def _run_adaptive(self, nran, se, ci_width, confidence, seed, nobs):
+        """Randomise in growing batches until the P value for results as
+        extreme as observed has standard error at most se and/or an exact
+        confidence interval no wider than ci_width, or nran are done.
+        Returns the number of randomisations done."""
+        done, g = 0, 0
+        for block in self._blocks(growing_sizes(nran, nobs), serial_rng(seed)):
+            exceed = self._exceeds(block)
+            g += int(sum(exceed)) if np is None else int(np.count_nonzero(exceed))
+            self._add(block)
+            done += len(block)
+            # shrink the estimate away from 0 and 1 so a few randomisations
+            # without exceedances do not look infinitely precise
+            p = (g + 1.0) / (done + 2.0)
+            if se is not None and math.sqrt(p * (1 - p) / done) > se:
+                continue
+            if ci_width is not None:
+                lower, upper = clopper_pearson(g, done, confidence)
+                if upper - lower > ci_width:
+                    continue
+            break
+        return done
+
+class RantestBinomial(Rantest):
+    
+    def __init__(self, ir1, if1, ir2, if2):
+        """ 
+        Parameters
+        ----------
+        ir1 : number of successes in first trial, int
+        if1 : number of failures in first trial, int
+        ir2 : number of successes in second trial, int
+        if2 : number of failures in second trial, int       
+        """
+        self.ir1 = ir1
+        self.if1 = if1
+        self.ir2 = ir2
+        self.if2 = if2
+        self.n1 = ir1 + if1 # tot number of tests in first trial 
+        self.n2 = ir2 + if2 # tot number of tests in second trial
+        self.p1 = float(self.ir1) / float(self.n1) # prob of success in first trial
+        self.p2 = float(self.ir2) / float(self.n2) # prob of success in second trial
+        self.exact = False
+        self.__stream = None    # random stream of the last run, for top-ups
+        self.__cdf = None       # null distribution of r1, for sampling
+        
+
+    def run_rantest(self, nran, keep_randiff=True, workers=None, seed=None,
+        h=None, alpha=None, se=None, ci_width=None, confidence=0.95,
+        extend=False, exact=False):
+        """
+        Parameters
+        ----------
+        nran : number of randomisations, int
+        keep_randiff : keep every randomised statistic in randiff and
+            randis1. If False only the number of randomisations giving each
+            r1 (r1dist) is kept, so memory does not grow with nran, boolean
+        workers : share the randomisations among this many processes, int
+        seed : seed for reproducible random streams; the result for a seed
+            does not depend on workers, int
+        h : stop sequentially once h randomisations give r1 at least as far
+            as observed from its expected value (in the observed direction);
+            nran is then the most that are done and the Besag-Clifford P
+            value is returned in pseq, int
+        alpha : stop sequentially as soon as significance at alpha is
+            settled; may be combined with h, float
+        se : randomise in growing batches until the standard error of the
+            one-tail P in the observed direction is at most se; nran is then
+            the most that are done, float
+        ci_width : as se, but until the Clopper-Pearson interval for that P
+            is no wider than ci_width, float
+        confidence : confidence level of the intervals pg1_ci and pl1_ci
+            reported with se or ci_width, float
+        extend : top up the previous run to nran randomisations in all,
+            keeping its counts and continuing its random stream (see
+            _randomise for seeded runs). An exact result is final and is
+            left as it is; sequential and adaptive runs raise ValueError,
+            boolean
+        exact : instead of randomising, sum the exact hypergeometric
+            probabilities of r1 over all C(n1 + n2, n1) allocations (the
+            Fisher exact test). Only the P values and the distribution of
+            r1 (r1prob) are returned; nran is then the number of
+            allocations, boolean
+        """
+        if extend:
+            _check_extend(h, alpha, se, ci_width, self.__stream)
+            if self.exact:
+                return
+            if self.__stream is not None:
+                if nran > self.nran:
+                    self.__stream = _randomise(self, nran - self.nran, workers,
+                        None, self.__stream)
+                    self.nran = nran
+                    self.__tails()
+                return
+        if exact:
+            self.__exact()
+            return
+        self.nran = nran
+        self.exact = False
+        self.r1prob = None
+        self.dobs = self.p1 - self.p2
+        self.__keep_randiff = keep_randiff
+        self.randiff = []
+        self.randis1 = []
+        self.r1dist = [0] * (self.n1 + 1)    # randomisations giving each r1
+        self.pseq = None
+        self.pg1_ci, self.pl1_ci = None, None
+        self.__stream = None
+        if se is not None or ci_width is not None:
+            self.__stream = _SEQUENTIAL
+            self.nran = self._run_adaptive(nran, se, ci_width, confidence, seed,
+                1)
+        elif h is None and alpha is None:
+            self.__stream = _randomise(self, nran, workers, seed)
+        else:
+            self.__stream = _SEQUENTIAL
+            self.nran, self.pseq = self._run_sequential(nran, h, alpha, seed,
+                1)
+
+        self.__tails()
+        if se is not None or ci_width is not None:
+            self.pg1_ci = clopper_pearson(self.ng1, self.nran, confidence)
+            self.pl1_ci = clopper_pearson(self.nl1, self.nran, confidence)
+        self.__rantest_done = True
+
+    def __exact(self):
+        """Exact P values from the hypergeometric distribution of r1."""
+        self.exact = True
+        self.nran = _binomial(self.n1 + self.n2, self.n1)
+        self.dobs = self.p1 - self.p2
+        self.randiff, self.randis1 = [], []
+        self.r1dist = None
+        self.ng1, self.ne1, self.nl1 = None, None, None
+        self.pseq = None
+        self.pg1_ci, self.pl1_ci = None, None
+        self.__stream = None
+        self.r1prob = _hypergeometric_pmf(self.ir1 + self.ir2,
+            self.if1 + self.if2, self.n1)
+        self.pg1 = min(1.0, math.fsum(self.r1prob[self.ir1:]))
+        self.pl1 = min(1.0, math.fsum(self.r1prob[:self.ir1 + 1]))
+        self.pe1 = self.r1prob[self.ir1]
+
+    def __tails(self):
+        """Tail counts and P values from r1dist."""
+        # p1 - p2 increases with r1, so the tails of r1 give the tail counts
+        self.ng1 = sum(self.r1dist[self.ir1:])
+        self.ne1 = self.r1dist[self.ir1]
+        self.nl1 = sum(self.r1dist[:self.ir1 + 1])
+
+        self.pg1 = float(self.ng1) / float(self.nran)
+        self.pl1 = float(self.nl1) / float(self.nran)
+        self.pe1 = float(self.ne1) / float(self.nran)
+        
+    def _run_blocks(self, nran, rng):
+        """Run nran randomisations drawing from rng (a NumPy generator, or
+        the random module or a random.Random without NumPy) and add them to
+        r1dist."""
+        for is1 in self._blocks(block_sizes(nran, 1), rng):
+            self._add(is1)
+
+    def _blocks(self, sizes, rng):
+        """Yield blocks of randomised r1, one block of each size.
+
+        Randomly allocating the pooled successes to sets of n1 and n2 puts
+        a hypergeometric number of them in set 1, so r1 is drawn directly
+        rather than by shuffling all n1 + n2 observations."""
+        nsucc, nfail = self.ir1 + self.ir2, self.if1 + self.if2
+        if np is not None:
+            for size in sizes:
+                yield rng.hypergeometric(nsucc, nfail, self.n1, size)
+            return
+        if self.__cdf is None:
+            # inverse transform sampling from the cumulative distribution
+            self.__cdf, total = [], 0.0
+            for p in _hypergeometric_pmf(nsucc, nfail, self.n1):
+                total += p
+                self.__cdf.append(total)
+        top = min(self.n1, nsucc)    # guards against rounding in the sum
+        for size in sizes:
+            yield [min(bisect.bisect_right(self.__cdf, rng.random()), top)
+                for n in range(size)]
+
+    def _add(self, block):
+        """Add a block of randomised r1 to r1dist (and randis1, randiff)."""
+        if np is None:
+            for is1 in block:
+                self.r1dist[is1] += 1
+        else:
+            counts = np.bincount(block, minlength=self.n1 + 1)
+            for is1, c in enumerate(counts.tolist()):
+                self.r1dist[is1] += c
+            block = block.tolist()
+        if self.__keep_randiff:
+            for is1 in block:
+                is2 = self.ir1 + self.ir2 - is1
+                dran = is1 / float(self.n1) - is2 / float(self.n2) # difference between means
+                self.randis1.append(float(is1))
+                self.randiff.append(float(dran))
+
+    def _exceeds(self, block):
+        """Flag randomised r1 at least as far from expectation as observed."""
+        expected = self.n1 * (self.ir1 + self.ir2) / float(self.n1 + self.n2)
+        if np is not None:
+            return block >= self.ir1 if self.ir1 >= expected else block <= self.ir1
+        if self.ir1 >= expected:
+            return [is1 >= self.ir1 for is1 in block]
+        return [is1 <= self.ir1 for is1 in block]
+
+    def _clear_counts(self):
+        """Start the counts afresh, as for a new chunk."""
+        self.randiff, self.randis1 = [], []
+        self.r1dist = [0] * (self.n1 + 1)
+
+    def _run_chunk(self, nran, seed, index):
+        """Run one chunk on its own stream and return its counts."""
+        self._clear_counts()
+        self._run_blocks(nran, chunk_rng(seed, index))
+        return self.r1dist, self.randis1, self.randiff
+
+    def _merge(self, counts):
+        """Add the counts returned by _run_chunk."""
+        r1dist, randis1, randiff = counts
+        for i, c in enumerate(r1dist):
+            self.r1dist[i] += c
+        self.randis1.extend(randis1)
+        self.randiff.extend(randiff)
+
+    def __repr__(self):        
+        if self.exact:
+            if self.nran < 10 ** 12:
+                nalloc = '{0:d}'.format(self.nran)
+            else:
+                nalloc = 'about 10^{0:d}'.format(
+                    int(math.log10(2) * (self.nran.bit_length() - 1)))
+            return ('\n\n Exact test (Fisher):  all {0} allocations:'.format(nalloc) +
+                '\n P values for difference between sets are:' +
+                '\n  r1 greater than or equal to observed: P = {0:.6f}'.format(self.pg1) +
+                '\n  r1 less than or equal to observed: P = {0:.6f}'.format(self.pl1) +
+                '\n  r1 equal to observed: P = {0:.6f}'.format(self.pe1))
+        repr_string = ('\n\n Rantest:  {0:d} randomisations:'.format(self.nran) +
+            '\n P values for difference between sets are:' +
+            '\n  r1 greater than or equal to observed: P = {0:.6f}'.format(self.pg1) +
+            '\n  r1 less than or equal to observed: P = {0:.6f}'.format(self.pl1) +
+            '\n  r1 equal to observed: number = {0:d} (P = {1:.6f})'.format(self.ne1, self.pe1))
+        if self.pseq is not None:
+            repr_string += ('\n  sequential (Besag-Clifford) one-tail P = {0:.6f}'.format(self.pseq))
+        if self.pg1_ci is not None:
+            repr_string += ('\n  confidence limits for P (r1 >= observed): {0:.6f} to {1:.6f}'.format(*self.pg1_ci) +
+                '\n  confidence limits for P (r1 <= observed): {0:.6f} to {1:.6f}'.format(*self.pl1_ci))
+        return repr_string
+
+
+class RantestBinomialBatch(Rantest):
+
+    def __init__(self, tables):
+        """
+        Parameters
+        ----------
+        tables : 2x2 tables to screen, each (ir1, if1, ir2, if2) as for
+            RantestBinomial; a list of tuples or an array with 4 columns
+        """
+        self.tables = [tuple(int(c) for c in table) for table in tables]
+        self.ntables = len(self.tables)
+        self.__t_test()
+
+    def __t_test(self):
+        """Gaussian approximation of TTestBinomial for every table."""
+        if np is None:
+            self.p1 = [float(t[0]) / (t[0] + t[1]) for t in self.tables]
+            self.p2 = [float(t[2]) / (t[2] + t[3]) for t in self.tables]
+            self.tval = []
+            for (r1, f1, r2, f2), p1, p2 in zip(self.tables, self.p1, self.p2):
+                n1, n2 = r1 + f1, r2 + f2
+                ppool = float(r1 + r2) / float(n1 + n2)
+                sdiff = math.sqrt(ppool * (1.0 - ppool) * (1.0 / n1 + 1.0 / n2))
+                self.tval.append(math.fabs(p1 - p2) / sdiff if sdiff > 0
+                    else float('nan'))
+        else:
+            table = np.array(self.tables, dtype=float).reshape(-1, 4)
+            n1, n2 = table[:, 0] + table[:, 1], table[:, 2] + table[:, 3]
+            self.p1, self.p2 = table[:, 0] / n1, table[:, 2] / n2
+            ppool = (table[:, 0] + table[:, 2]) / (n1 + n2)
+            sdiff = np.sqrt(ppool * (1.0 - ppool) * (1.0 / n1 + 1.0 / n2))
+            with np.errstate(divide='ignore', invalid='ignore'):
+                self.tval = np.where(sdiff > 0,
+                    np.fabs(self.p1 - self.p2) / sdiff, np.nan)
+        df = 100000    # to get Gaussian
+        P = [bs.ttestPDF(t, df) if t == t else float('nan') for t in self.tval]
+        self.P = P if np is None else np.array(P)
+
+    def run_rantest(self, nran, exact=False, seed=None):
+        """
+        Tables with the same margins (n1, n2 and total successes) share
+        one null distribution of r1, which is computed or sampled once for
+        the group by RantestBinomial and read off for each table in it.
+
+        Parameters
+        ----------
+        nran : number of randomisations for each group of tables, int
+        exact : exact Fisher P values instead of randomisation, boolean
+        seed : seed for reproducible random streams, int
+
+        Results are in pg1, pl1 and pe1, one P value for each table (NumPy
+        arrays if NumPy is available, lists otherwise), and the number of
+        distinct margins in ngroups.
+        """
+        groups = {}
+        for i, (ir1, if1, ir2, if2) in enumerate(self.tables):
+            margins = (ir1 + if1, ir2 + if2, ir1 + ir2)
+            groups.setdefault(margins, []).append(i)
+        self.ngroups = len(groups)
+        self.nran = nran
+        self.exact = exact
+        self.pg1, self.pl1, self.pe1 = ([0.0] * self.ntables for i in range(3))
+        seeds = random.Random(seed) if seed is not None else None
+        # first appearance order, so a seed gives the same streams each time
+        for margins in sorted(groups, key=lambda m: groups[m][0]):
+            n1, n2, nsucc = margins
+            rnt = RantestBinomial(min(nsucc, n1), n1 - min(nsucc, n1),
+                nsucc - min(nsucc, n1), n2 - nsucc + min(nsucc, n1))
+            rnt.run_rantest(nran, keep_randiff=False, exact=exact,
+                seed=None if seeds is None else seeds.getrandbits(63))
+            if exact:
+                dist, total = rnt.r1prob, 1.0
+            else:
+                dist, total = rnt.r1dist, float(nran)
+            # cumulative sums give both tails for every r1 at once
+            below = [0] * (n1 + 2)
+            for r1 in range(n1 + 1):
+                below[r1 + 1] = below[r1] + dist[r1]
+            for i in groups[margins]:
+                ir1 = self.tables[i][0]
+                self.pg1[i] = min(1.0, (below[-1] - below[ir1]) / total)
+                self.pl1[i] = min(1.0, below[ir1 + 1] / total)
+                self.pe1[i] = dist[ir1] / total
+        if np is not None:
+            self.pg1, self.pl1, self.pe1 = (np.array(self.pg1),
+                np.array(self.pl1), np.array(self.pe1))
+
+    def __repr__(self):
+        if self.exact:
+            title = 'Exact test (Fisher)'
+        else:
+            title = 'Rantest:  {0:d} randomisations per margin'.format(self.nran)
+        repr_string = ('\n\n {0}: {1:d} tables, {2:d} distinct margins'.format(
+            title, self.ntables, self.ngroups) +
+            '\n  table   r1   f1   r2   f2     p1-p2        z        P(z)' +
+            '    P(r1>=obs) P(r1<=obs)')
+        for i, (ir1, if1, ir2, if2) in enumerate(self.tables):
+            repr_string += ('\n  {0:5d} {1:4d} {2:4d} {3:4d} {4:4d} {5:9.6f} {6:9.6f} {7:9.6f}'
+                '  {8:9.6f}  {9:9.6f}'.format(i + 1, ir1, if1, ir2, if2,
+                self.p1[i] - self.p2[i], self.tval[i], self.P[i],
+                self.pg1[i], self.pl1[i]))
+        return repr_string
+
+
+class RantestStratified(Rantest):
+
+    def __init__(self, tables):
+        """
+        Parameters
+        ----------
+        tables : one 2x2 table (ir1, if1, ir2, if2) for each stratum (day,
+            cell, ...), as for RantestBinomial
+        """
+        self.strata = [RantestBinomial(*table) for table in tables]
+        self.n1 = sum(s.n1 for s in self.strata)
+        self.robs = sum(s.ir1 for s in self.strata)
+        self.exact = False
+        self.__cdfs = None      # null distributions of r1, for sampling
+        self.__mantel_haenszel()
+
+    def __mantel_haenszel(self):
+        """Gaussian approximation (Mantel-Haenszel test, without continuity
+        correction) to the distribution of the sum of r1 over strata."""
+        self.expected, var = 0.0, 0.0
+        for s in self.strata:
+            n, nsucc = s.n1 + s.n2, s.ir1 + s.ir2
+            self.expected += s.n1 * nsucc / float(n)
+            if n > 1:
+                var += s.n1 * s.n2 * nsucc * (n - nsucc) / float(n * n * (n - 1))
+        self.sdr = math.sqrt(var)
+        if self.sdr > 0:
+            self.tval = math.fabs(self.robs - self.expected) / self.sdr
+            df = 100000    # to get Gaussian
+            self.P = bs.ttestPDF(self.tval, df)
+        else:
+            self.tval, self.P = float('nan'), float('nan')
+
+    def run_rantest(self, nran, exact=None, workers=None, seed=None):
+        """
+        Allocations are randomised within each stratum, and the criterion
+        is r1 summed over strata (robs observed).
+
+        Parameters
+        ----------
+        nran : number of randomisations, int
+        exact : convolve the exact hypergeometric distributions of r1 in
+            each stratum instead of randomising. By default (None) this is
+            done whenever it is cheaper than nran randomisations, boolean
+        workers : share the randomisations among this many processes, int
+        seed : seed for reproducible random streams; the result for a seed
+            does not depend on workers, int
+        """
+        cost, width = 0, 1
+        for s in self.strata:
+            cost += width * (s.n1 + 1)
+            width += s.n1
+        if exact or (exact is None and cost <= nran * len(self.strata)):
+            self.exact = True
+            self.rdist = None
+            self.rprob = self.__convolve()
+            self.nran = 1
+            for s in self.strata:
+                self.nran *= _binomial(s.n1 + s.n2, s.n1)
+            dist, total = self.rprob, 1.0
+        else:
+            self.exact = False
+            self.rprob = None
+            self.rdist = [0] * (self.n1 + 1)    # randomisations giving each sum
+            self.nran = nran
+            _randomise(self, nran, workers, seed)
+            dist, total = self.rdist, float(nran)
+        self.pg1 = min(1.0, math.fsum(dist[self.robs:]) / total)
+        self.pl1 = min(1.0, math.fsum(dist[:self.robs + 1]) / total)
+        self.pe1 = dist[self.robs] / total
+
+    def __convolve(self):
+        """Exact distribution of the sum of r1 over independent strata."""
+        if np is not None:
+            dist = np.ones(1)
+            for s in self.strata:
+                dist = np.convolve(dist, _hypergeometric_pmf(s.ir1 + s.ir2,
+                    s.if1 + s.if2, s.n1))
+            return dist.tolist()
+        dist = [1.0]
+        for s in self.strata:
+            pmf = _hypergeometric_pmf(s.ir1 + s.ir2, s.if1 + s.if2, s.n1)
+            new = [0.0] * (len(dist) + len(pmf) - 1)
+            for i, p in enumerate(dist):
+                if p > 0:
+                    for j, q in enumerate(pmf):
+                        new[i + j] += p * q
+            dist = new
+        return dist
+
+    def _run_blocks(self, nran, rng):
+        """Run nran randomisations drawing from rng and add them to rdist."""
+        for block in self._blocks(block_sizes(nran, len(self.strata)), rng):
+            self._add(block)
+
+    def _blocks(self, sizes, rng):
+        """Yield blocks of randomised sums of r1, one block of each size.
+        With NumPy every stratum of a block is drawn in a single call."""
+        good = [s.ir1 + s.ir2 for s in self.strata]
+        bad = [s.if1 + s.if2 for s in self.strata]
+        nsample = [s.n1 for s in self.strata]
+        if np is not None:
+            for size in sizes:
+                r1 = rng.hypergeometric(good, bad, nsample,
+                    size=(size, len(self.strata)))
+                yield r1.sum(axis=1)
+            return
+        if self.__cdfs is None:
+            self.__cdfs = []
+            for g, b, n in zip(good, bad, nsample):
+                cdf, total = [], 0.0
+                for p in _hypergeometric_pmf(g, b, n):
+                    total += p
+                    cdf.append(total)
+                self.__cdfs.append((cdf, min(g, n)))
+        for size in sizes:
+            yield [sum(min(bisect.bisect_right(cdf, rng.random()), top)
+                for cdf, top in self.__cdfs) for n in range(size)]
+
+    def _add(self, block):
+        """Add a block of randomised sums to rdist."""
+        if np is None:
+            for r in block:
+                self.rdist[r] += 1
+            return
+        counts = np.bincount(block, minlength=self.n1 + 1)
+        for r, c in enumerate(counts.tolist()):
+            self.rdist[r] += c
+
+    def _clear_counts(self):
+        """Start the counts afresh, as for a new chunk."""
+        self.rdist = [0] * (self.n1 + 1)
+
+    def _run_chunk(self, nran, seed, index):
+        """Run one chunk on its own stream and return its counts."""
+        self._clear_counts()
+        self._run_blocks(nran, chunk_rng(seed, index))
+        return self.rdist
+
+    def _merge(self, rdist):
+        """Add the counts returned by _run_chunk."""
+        for r, c in enumerate(rdist):
+            self.rdist[r] += c
+
+    def __repr__(self):
+        if self.exact:
+            title = 'Exact stratified test:  all allocations'
+        else:
+            title = 'Stratified rantest:  {0:d} randomisations'.format(self.nran)
+        return ('\n\n {0:d} strata; r1 summed over strata = {1:d}'.format(
+            len(self.strata), self.robs) +
+            '\n expected under null hypothesis = {0:.6f}; SD = {1:.6f}'.format(
+            self.expected, self.sdr) +
+            '\n Mantel-Haenszel test using Gaussian approximation:' +
+            '\n standard normal deviate = {0:.6f}; two tail P = {1:.6f}.'.format(
+            self.tval, self.P) +
+            '\n\n ' + title + ' within strata:' +
+            '\n  summed r1 greater than or equal to observed: P = {0:.6f}'.format(self.pg1) +
+            '\n  summed r1 less than or equal to observed: P = {0:.6f}'.format(self.pl1) +
+            '\n  summed r1 equal to observed: P = {0:.6f}'.format(self.pe1))
+
+
+class RantestContingency(Rantest):
+
+    def __init__(self, table, statistic='chi2'):
+        """
+        Parameters
+        ----------
+        table : counts with one row for each group and one column for each
+            outcome category, list of lists of ints
+        statistic : 'chi2' for Pearson's chi-square or 'lr' for the
+            likelihood ratio statistic G, string
+        """
+        if statistic not in ('chi2', 'lr'):
+            raise ValueError("statistic must be 'chi2' or 'lr'")
+        self.table = [[int(c) for c in row] for row in table]
+        self.statistic = statistic
+        self.rows = [sum(row) for row in self.table]
+        self.cols = [sum(col) for col in zip(*self.table)]
+        self.ntot = sum(self.rows)
+        self.sobs = self.__statistic(self.table)
+
+    def __statistic(self, table):
+        """Chi-square or G for one table (with Python lists)."""
+        s = 0.0
+        for row, ri in zip(table, self.rows):
+            for o, cj in zip(row, self.cols):
+                e = ri * cj / float(self.ntot)
+                if e <= 0:
+                    continue
+                if self.statistic == 'chi2':
+                    s += (o - e) ** 2 / e
+                elif o > 0:
+                    s += 2.0 * o * math.log(o / e)
+        return s
+
+    def __statistics(self, tables):
+        """Chi-square or G for a block of tables of shape (size, r, c)."""
+        e = np.outer(self.rows, self.cols) / float(self.ntot)
+        keep = e > 0
+        o, e = tables[:, keep], e[keep]
+        if self.statistic == 'chi2':
+            return ((o - e) ** 2 / e).sum(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            terms = np.where(o > 0, o * np.log(o / e), 0.0)
+        return 2.0 * terms.sum(axis=1)
+
+    def run_rantest(self, nran, workers=None, seed=None):
+        """
+        Tables are drawn with the row and column totals of the observed one
+        (the multivariate hypergeometric distribution that random allocation
+        of the pooled observations to groups gives).
+
+        Parameters
+        ----------
+        nran : number of randomisations, int
+        workers : share the randomisations among this many processes, int
+        seed : seed for reproducible random streams; the result for a seed
+            does not depend on workers, int
+        """
+        self.nran = nran
+        self.ng1 = 0
+        _randomise(self, nran, workers, seed)
+        self.pg1 = self.ng1 / float(nran)
+
+    def _run_blocks(self, nran, rng):
+        """Run nran randomisations drawing from rng and count those with a
+        statistic at least as large as observed."""
+        nobs = len(self.rows) * len(self.cols)
+        for stat in self._blocks(block_sizes(nran, nobs), rng):
+            self._add(stat)
+
+    def _blocks(self, sizes, rng):
+        """Yield blocks of randomised statistics, one block of each size.
+
+        Each row is drawn from the column totals still unallocated, one cell
+        at a time as a hypergeometric draw of the cell from the rest of the
+        row, so no list of individual observations is ever built. With
+        NumPy each cell of a whole block is drawn in one call."""
+        nrow, ncol = len(self.rows), len(self.cols)
+        for size in sizes:
+            if np is None:
+                yield [self.__statistic(self.__draw_table(rng))
+                    for n in range(size)]
+                continue
+            tables = np.zeros((size, nrow, ncol), dtype=np.int64)
+            left = np.tile(np.array(self.cols, dtype=np.int64), (size, 1))
+            for i in range(nrow - 1):
+                need = np.full(size, self.rows[i], dtype=np.int64)
+                rest = left.sum(axis=1)
+                for j in range(ncol - 1):
+                    rest -= left[:, j]
+                    x = rng.hypergeometric(left[:, j], rest, need)
+                    tables[:, i, j] = x
+                    need -= x
+                tables[:, i, ncol - 1] = need
+                left -= tables[:, i]
+            tables[:, nrow - 1] = left
+            yield self.__statistics(tables)
+
+    def __draw_table(self, rng):
+        """Draw one table with the observed margins (without NumPy)."""
+        left = list(self.cols)
+        table = []
+        for ri in self.rows[:-1]:
+            row, need, rest = [], ri, sum(left)
+            for j in range(len(left) - 1):
+                rest -= left[j]
+                pmf = _hypergeometric_pmf(left[j], rest, need)
+                u, x, total = rng.random(), 0, pmf[0]
+                while total <= u and x < min(need, left[j]):
+                    x += 1
+                    total += pmf[x]
+                row.append(x)
+                need -= x
+            row.append(need)
+            left = [l - x for l, x in zip(left, row)]
+            table.append(row)
+        table.append(left)
+        return table
+
+    def _add(self, stat):
+        """Count statistics at least as large as observed."""
+        # identical tables can give statistics that differ by rounding
+        cut = self.sobs - EXACT_RTOL * max(1.0, self.sobs)
+        if np is None:
+            self.ng1 += sum(1 for s in stat if s >= cut)
+        else:
+            self.ng1 += int(np.count_nonzero(stat >= cut))
+
+    def _clear_counts(self):
+        """Start the count afresh, as for a new chunk."""
+        self.ng1 = 0
+
+    def _run_chunk(self, nran, seed, index):
+        """Run one chunk on its own stream and return its count."""
+        self._clear_counts()
+        self._run_blocks(nran, chunk_rng(seed, index))
+        return self.ng1
+
+    def _merge(self, ng1):
+        """Add the count returned by _run_chunk."""
+        self.ng1 += ng1
+
+    def __repr__(self):
+        name = {'chi2': 'chi-square', 'lr': 'likelihood ratio G'}[self.statistic]
+        return ('\n\n {0:d} x {1:d} table; {2:d} observations'.format(
+            len(self.rows), len(self.cols), self.ntot) +
+            '\n Observed {0} = {1:.6f}'.format(name, self.sobs) +
+            '\n\n Rantest:  {0:d} randomisations:'.format(self.nran) +
+            '\n  {0} greater than or equal to observed: P = {1:.6f}'.format(
+            name, self.pg1))
+
+
+class RantestContinuous(Rantest):
+    def __init__(self, X, Y, are_paired):
+        """ 
+        Parameters
+        ----------
+        X : observations in first trial, list of floats or a SampleSummary
+        Y : observations in second trial, list of floats or a SampleSummary
+        are_paired : are observations paired, boolean
+        """
+        
+        self.X, self.Y = X, Y
+        self.sx, self.sy = bs.summarise(X), bs.summarise(Y)
+        self.nx, self.ny = self.sx.n, self.sy.n
+        self.are_paired = are_paired
+        self.nran = 0
+        self.exact = False
+        self.__stream = None    # random stream of the last run, for top-ups
+            
+    def run_rantest(self, nran, exact=None, step=None, keep_randiff=True,
+        hist_bins=None, workers=None, seed=None, h=None, alpha=None,
+        se=None, ci_width=None, confidence=0.95, extend=False):
+        """
+        Parameters
+        ----------
+        nran : number of randomisations, int
+        exact : enumerate all 2**n sign assignments (paired data) or all
+            C(n1 + n2, n1) allocations to groups (unpaired data) instead of
+            sampling them. By default (None) the exact test is used
+            whenever it is cheaper than nran randomisations and still
+            fills randiff and hist as asked for, boolean
+        step : quantisation step of the data (e.g. 1 for counts, 0.1 for
+            values recorded in 0.1 mV steps). The exact distribution is then
+            built by the shift algorithm; without it a step is looked for
+            and used when that is cheapest, float
+        keep_randiff : keep every randomised difference in randiff. If False
+            only the tail counts are updated as the randomisations stream
+            past, so memory does not grow with nran, boolean
+        hist_bins : if given, also count the randomised differences in
+            hist_bins equal bins spanning every attainable difference,
+            returned in hist with edges hist_edges. Exact tests that count
+            tails without building the distribution leave hist None, int
+        workers : share the randomisations among this many processes, int
+        seed : seed for reproducible random streams; the result for a seed
+            does not depend on workers, int
+        h : stop sequentially once h randomisations give a difference at
+            least as large in absolute value as observed; nran is then the
+            most that are done and the Besag-Clifford P value is returned
+            in pseq, int
+        alpha : stop sequentially as soon as significance at alpha is
+            settled; may be combined with h, float
+        se : randomise in growing batches until the standard error of pa1
+            is at most se; nran is then the most that are done, float
+        ci_width : as se, but until the Clopper-Pearson interval for pa1 is
+            no wider than ci_width, float
+        confidence : confidence level of the intervals pg1_ci, pl1_ci and
+            pa1_ci reported with se or ci_width, float
+        extend : top up the previous run to nran randomisations in all,
+            keeping its counts, histogram and random stream (see _randomise
+            for seeded runs). An exact result is final and is left as it is;
+            sequential and adaptive runs raise ValueError, boolean
+        """
+
+        if extend:
+            _check_extend(h, alpha, se, ci_width, self.__stream)
+            if self.exact:
+                return
+            if self.__stream is not None:
+                if nran > self.nran:
+                    self.__stream = _randomise(self, nran - self.nran, workers,
+                        None, self.__stream)
+                    self.__p_values(nran)
+                return
+
+        self.__keep_randiff = keep_randiff
+        self.hist, self.hist_edges = None, None
+        self.randiff = []
+        self.ng1, self.ne1, self.nl1 = 0, 0, 0
+        self.na1 = 0
+        self.ne2 = 0
+        self.exact = False
+        self.exact_dist = []
+        self.pseq = None
+        self.pg1_ci, self.pl1_ci, self.pa1_ci = None, None, None
+        self.__stream = None
+        self.__target = (se, ci_width, confidence)
+        if self.are_paired:
+            self.D = []
+            for i in range(self.nx):
+                self.D.append(self.X[i] - self.Y[i])    # differences for paired test
+            self.dbar = bs.mean(self.D)
+            # randomised means are summed in another order than dbar, so
+            # ties are taken within the rounding of sums of +/-D
+            self.__tol = EXACT_RTOL * sum(math.fabs(d) for d in self.D) / self.nx
+            if hist_bins:
+                dmax = sum(math.fabs(d) for d in self.D) / float(self.nx)
+                self.__make_hist(-dmax, dmax, hist_bins)
+            method = self.__exact_paired_method(nran, exact, step)
+            if method is not None:
+                self.exact = True
+                nran = 2 ** self.nx
+                if method == 'gray':
+                    self.__exact_paired_gray()
+                elif method == 'shift':
+                    self.__shift_paired(step)
+                else:
+                    self.__exact_paired_split()
+                    self.hist, self.hist_edges = None, None
+            else:
+                nran = self.__randomise(nran, workers, seed, h, alpha)
+        else:    # if not paired
+            self.dbar = self.sx.mean - self.sy.mean
+            # groups are summed as deviations from the pooled mean (see
+            # __centred), so ties are taken within the rounding of those sums
+            spread = sum(math.fabs(x) for x in self.__centred())
+            self.__tol = EXACT_RTOL * spread * (1.0 / self.nx + 1.0 / self.ny)
+            if hist_bins:
+                allobs = sorted(list(self.X) + list(self.Y))
+                stot = float(sum(allobs))
+                sylo, syhi = sum(allobs[:self.ny]), sum(allobs[len(allobs) - self.ny:])
+                self.__make_hist((stot - syhi) / self.nx - syhi / self.ny,
+                    (stot - sylo) / self.nx - sylo / self.ny, hist_bins)
+            # C(n1 + n2, n1) is only needed when an exact test is possible;
+            # neither exact method keeps randiff, so by default none is
+            wanted = exact or (exact is None and (step is not None or not keep_randiff))
+            nall = _binomial(self.nx + self.ny, self.nx) if wanted else None
+            method = self.__exact_unpaired_method(nall, nran, exact, step)
+            if method is not None:
+                self.exact = True
+                nran = nall
+                if method == 'shift':
+                    self.__shift_unpaired(step)
+                else:
+                    self.__exact_unpaired()
+                    self.hist, self.hist_edges = None, None
+            else:
+                nran = self.__randomise(nran, workers, seed, h, alpha)
+
+        self.__p_values(nran)
+        if not self.exact and (se is not None or ci_width is not None):
+            self.pg1_ci = clopper_pearson(self.ng1, nran, confidence)
+            self.pl1_ci = clopper_pearson(self.nl1, nran, confidence)
+            self.pa1_ci = clopper_pearson(self.na1, nran, confidence)
+
+    def __p_values(self, nran):
+        """P values from the tail counts of nran randomisations."""
+        self.pg1 = self.ng1 / float(nran)
+        self.pl1 = self.nl1 / float(nran)
+        self.pe1 = self.ne1 / float(nran)
+        self.pa1 = self.na1 / float(nran)
+        self.pe2 = self.ne2 / float(nran)
+        self.nran = nran
+
+    def __exact_paired_method(self, nran, exact, step):
+        """Choose 'gray', 'split', 'shift' or None (Monte Carlo) for the
+        paired test."""
+        if exact is False:
+            return None
+        if step is not None:
+            return 'shift'
+        costs = {}
+        if self.nx <= EXACT_PAIRED_MAX:
+            half = (self.nx + 1) // 2
+            costs['gray'] = 2 ** self.nx
+            costs['split'] = 2 ** half * half
+        lattice = _lattice(self.D)
+        if lattice is not None and _shift_size(1, lattice[0]) <= EXACT_SHIFT_MAX:
+            costs['shift'] = self.nx * (2 * sum(abs(i) for i in lattice[0]) + 1)
+        if not exact:
+            # by default the exact test stands in for the Monte Carlo one
+            # only if it gives the randiff and hist asked for as well
+            if self.__keep_randiff:
+                costs.pop('shift', None)
+            if self.__keep_randiff or self.hist is not None:
+                costs.pop('split', None)
+        if not costs:
+            if exact:
+                raise ValueError('Exact paired test is limited to ' +
+                    '{0:d} pairs of continuous data'.format(EXACT_PAIRED_MAX))
+            return None
+        method = min(costs, key=costs.get)
+        if exact or costs[method] <= nran * self.nx:
+            return method
+        return None
+
+    def __exact_paired_gray(self):
+        """Enumerate all sign assignments in Gray-code order.
+
+        Successive assignments differ in a single sign, so each sum is the
+        previous one -/+ 2 D[i]. The mean differences stream past __count in
+        blocks of CHUNK_SIZE, so memory only grows with 2**n if randiff is
+        kept."""
+        n = self.nx
+        signs = [1] * n
+        s = sum(self.D)
+        block = [s / float(n)]
+        for k in range(1, 2 ** n):
+            i = (k & -k).bit_length() - 1    # sign flipped at step k
+            s -= 2 * signs[i] * self.D[i]
+            signs[i] = -signs[i]
+            block.append(s / float(n))
+            if len(block) == CHUNK_SIZE:
+                self.__count(block)
+                block = []
+                # resum so that rounding does not drift along the walk
+                s = math.fsum(sg * d for sg, d in zip(signs, self.D))
+        self.__count(block)
+
+    def __exact_paired_split(self):
+        """Count all sign assignments by meet-in-the-middle.
+
+        The signed sums of each half of D are sorted and pairs of sums
+        beyond a threshold are counted with two pointers, so 2**n
+        assignments cost about 2**(n/2) operations. The distribution of
+        sums is symmetric about zero, which gives the absolute counts."""
+        h = self.nx // 2
+        A, B = _signed_sums(self.D[:h]), _signed_sums(self.D[h:])
+        nall = 2 ** self.nx
+        total, tol = sum(self.D), EXACT_RTOL * sum(math.fabs(d) for d in self.D)
+        atotal = math.fabs(total)
+        self.ng1 = _count_pair_sums(A, B, total - tol)
+        self.nl1 = nall - _count_pair_sums(A, B, total + tol, strict=True)
+        self.ne1 = self.ng1 + self.nl1 - nall
+        if atotal - tol > 0:
+            self.na1 = 2 * _count_pair_sums(A, B, atotal - tol)
+        else:
+            self.na1 = nall
+        self.ne2 = self.na1 - 2 * _count_pair_sums(A, B, atotal + tol, strict=True)
+
+    def __exact_unpaired_method(self, nall, nran, exact, step):
+        """Choose 'enumerate', 'shift' or None (Monte Carlo) for the
+        unpaired test of nall allocations (None if no exact test is
+        wanted)."""
+        if nall is None:
+            return None
+        if step is not None:
+            return 'shift'
+        ntot, k = self.nx + self.ny, min(self.nx, self.ny)
+        costs = {}
+        # by default counting without the distribution cannot stand in for
+        # a Monte Carlo test that bins it
+        if nall <= EXACT_UNPAIRED_MAX and (exact or self.hist is None):
+            costs['enumerate'] = nall * k
+        allobs = list(self.X) + list(self.Y)
+        lattice = _lattice([x - min(allobs) for x in allobs])
+        if lattice is not None and _shift_size(k, lattice[0]) <= EXACT_SHIFT_MAX:
+            costs['shift'] = ntot * (k + 1) * (k * max(lattice[0]) + 1)
+        if not costs:
+            if exact:
+                raise ValueError('Exact unpaired test is limited to ' +
+                    '{0:d} allocations of continuous data'.format(EXACT_UNPAIRED_MAX))
+            return None
+        method = min(costs, key=costs.get)
+        if exact or costs[method] <= nran * ntot:
+            return method
+        return None
+
+    def __shift_unpaired(self, step):
+        """Build the exact distribution of the sum of the smaller group.
+
+        Shift algorithm (Streitberg & Rohmel, 1986): with the data as
+        integer multiples of the step, f[c][s] counts the c-subsets of the
+        pooled observations that sum to s steps, and each observation v
+        updates it by f[c][s] += f[c - 1][s - v]. Counts are kept as exact
+        integers, so ties are counted exactly."""
+        allobs = list(self.X) + list(self.Y)
+        offset = min(allobs)
+        ints, step = _lattice([x - offset for x in allobs], step)
+        ntot, k = len(allobs), min(self.nx, self.ny)
+        _check_shift_size(k, ints)
+        nall = _binomial(ntot, k)
+        width = k * max(ints) + 1
+        if np is not None:
+            # C(N, c) <= C(N, k) bounds every entry, so int64 is exact below 2**63
+            f = np.zeros((k + 1, width), dtype=np.int64 if nall < 2 ** 63 else object)
+            f[0, 0] = 1
+            for v in ints:
+                f[1:, v:] += f[:-1, :width - v]
+            counts = f[k].tolist()
+        else:
+            f = [[1] + [0] * (width - 1)] + [[0] * width for c in range(k)]
+            for v in ints:
+                for c in range(k, 0, -1):
+                    row, prev = f[c], f[c - 1]
+                    for s in range(width - 1, v - 1, -1):
+                        if prev[s - v]:
+                            row[s] += prev[s - v]
+            counts = f[k]
+
+        # work on integer sums: |dran| >= |dbar| when |N s - k sum| is as large
+        group = range(self.nx, ntot) if k == self.ny else range(self.nx)
+        sobs = sum(ints[i] for i in group)
+        ksum = k * sum(ints)
+        eobs = abs(ntot * sobs - ksum)
+        nlow = sum(counts[:sobs + 1])
+        nhigh = sum(counts[sobs:])
+        self.ng1, self.nl1 = (nlow, nhigh) if k == self.ny else (nhigh, nlow)
+        self.ne1 = counts[sobs]
+        self.na1 = sum(c for s, c in enumerate(counts) if abs(ntot * s - ksum) >= eobs)
+        self.ne2 = sum(c for s, c in enumerate(counts) if abs(ntot * s - ksum) == eobs)
+
+        stot = float(sum(allobs))
+        for s, c in enumerate(counts):
+            if c:
+                g = k * offset + s * step
+                if k == self.ny:
+                    dran = (stot - g) / self.nx - g / self.ny
+                else:
+                    dran = g / self.nx - (stot - g) / self.ny
+                self.exact_dist.append((dran, c))
+        self.__bin([d for d, c in self.exact_dist], [c for d, c in self.exact_dist])
+
+    def __shift_paired(self, step):
+        """Build the exact distribution of sum(+/-D) by the shift algorithm.
+
+        With the differences as integer multiples of the step, f[s] counts
+        the sign assignments giving a sum of s steps, and each difference d
+        updates it to f[s - d] + f[s + d]."""
+        ints, step = _lattice(self.D, step)
+        _check_shift_size(1, ints)
+        smax = sum(abs(i) for i in ints)
+        width = 2 * smax + 1
+        if np is not None:
+            f = np.zeros(width, dtype=np.int64 if self.nx < 63 else object)
+            f[smax] = 1
+            for d in ints:
+                d = abs(d)
+                g = np.zeros_like(f)
+                g[d:] += f[:width - d]
+                g[:width - d] += f[d:]
+                f = g
+            counts = f.tolist()
+        else:
+            counts = [0] * width
+            counts[smax] = 1
+            for d in ints:
+                d = abs(d)
+                g = [0] * width
+                for s in range(width):
+                    if counts[s]:
+                        g[s + d] += counts[s]
+                        g[s - d] += counts[s]
+                counts = g
+
+        total = sum(ints)
+        for i, c in enumerate(counts):
+            s = i - smax
+            if c:
+                if s >= total: self.ng1 += c
+                if s == total: self.ne1 += c
+                if s <= total: self.nl1 += c
+                if abs(s) >= abs(total): self.na1 += c
+                if abs(s) == abs(total): self.ne2 += c
+                self.exact_dist.append((s * step / float(self.nx), c))
+        self.__bin([d for d, c in self.exact_dist], [c for d, c in self.exact_dist])
+
+    def __exact_unpaired(self):
+        """Count all allocations to groups of size n1 and n2.
+
+        The difference between means is a linear function of the sum s of
+        the smaller group, and |dran| >= |dbar| exactly when s is at least
+        as far from its mean k * (n1 + n2) / N as the observed sum, so every
+        count is a count of subset sums beyond a threshold."""
+        allobs = list(self.X) + list(self.Y)
+        k = min(self.nx, self.ny)
+        group = self.Y if k == self.ny else self.X
+        nall = _binomial(len(allobs), k)
+        # work with deviations from the pooled mean, so that the tolerance
+        # follows the spread of the data and not its distance from zero
+        centre = math.fsum(allobs) / len(allobs)
+        allobs = [x - centre for x in allobs]
+        sobs = math.fsum([x - centre for x in group])
+        mu = k * sum(allobs) / float(len(allobs))
+        tol = EXACT_RTOL * sum(math.fabs(x) for x in allobs)
+        count = lambda t, upper, strict=False: \
+            _count_subsets_beyond(allobs, k, t, upper, strict)
+
+        nlow = count(sobs + tol, False)    # s <= observed
+        nhigh = count(sobs - tol, True)    # s >= observed
+        # dran falls as the sum of Y rises
+        if group is self.Y:
+            self.ng1, self.nl1 = nlow, nhigh
+        else:
+            self.ng1, self.nl1 = nhigh, nlow
+        self.ne1 = self.ng1 + self.nl1 - nall
+        e = math.fabs(sobs - mu)
+        if e > tol:
+            self.na1 = count(mu + e - tol, True) + count(mu - e + tol, False)
+        else:
+            self.na1 = nall
+        self.ne2 = (self.na1 - count(mu + e + tol, True, True) -
+            count(mu - e - tol, False, True))
+
+    def __randomise(self, nran, workers, seed, h, alpha):
+        """Run the Monte Carlo test and return the number of randomisations."""
+        nobs = self.nx if self.are_paired else self.nx + self.ny
+        se, ci_width, confidence = self.__target
+        if se is not None or ci_width is not None:
+            self.__stream = _SEQUENTIAL
+            return self._run_adaptive(nran, se, ci_width, confidence, seed, nobs)
+        if h is None and alpha is None:
+            self.__stream = _randomise(self, nran, workers, seed)
+            return nran
+        self.__stream = _SEQUENTIAL
+        done, self.pseq = self._run_sequential(nran, h, alpha, seed, nobs)
+        return done
+
+    def _run_blocks(self, nran, rng):
+        """Run nran randomisations drawing from rng (a NumPy generator, or
+        without NumPy the random module or a random.Random) and add them to
+        the counts."""
+        nobs = self.nx if self.are_paired else self.nx + self.ny
+        for dran in self._blocks(block_sizes(nran, nobs), rng):
+            self._add(dran)
+
+    def _blocks(self, sizes, rng):
+        """Yield blocks of randomised differences, one block of each size."""
+        if self.are_paired:
+            blocks = self.__paired_blocks if np is None else self.__paired_blocks_numpy
+        else:
+            blocks = self.__unpaired_blocks if np is None else self.__unpaired_blocks_numpy
+        return blocks(sizes, rng)
+
+    def _add(self, dran):
+        """Add a block of randomised differences to the counts."""
+        self.__count(dran)
+
+    def _exceeds(self, dran):
+        """Flag differences at least as large in absolute value as observed."""
+        cut = math.fabs(self.dbar) - self.__tol
+        if np is None:
+            return [math.fabs(d) >= cut for d in dran]
+        return np.fabs(dran) >= cut
+
+    def _clear_counts(self):
+        """Start the counts afresh, as for a new chunk."""
+        self.ng1, self.ne1, self.nl1, self.na1, self.ne2 = 0, 0, 0, 0, 0
+        self.randiff = []
+        self.exact_dist = []
+        if self.hist is not None:
+            self.hist = [0] * len(self.hist)
+
+    def _run_chunk(self, nran, seed, index):
+        """Run one chunk on its own stream and return its counts."""
+        self._clear_counts()
+        self._run_blocks(nran, chunk_rng(seed, index))
+        return ((self.ng1, self.ne1, self.nl1, self.na1, self.ne2),
+            self.hist, self.randiff)
+
+    def _merge(self, counts):
+        """Add the counts returned by _run_chunk."""
+        tails, hist, randiff = counts
+        self.ng1 += tails[0]
+        self.ne1 += tails[1]
+        self.nl1 += tails[2]
+        self.na1 += tails[3]
+        self.ne2 += tails[4]
+        if hist is not None:
+            for i, c in enumerate(hist):
+                self.hist[i] += c
+        self.randiff.extend(randiff)
+
+    def __paired_blocks(self, sizes, rng):
+        """Yield lists of random mean differences with randomly flipped signs."""
+        for size in sizes:
+            block = []
+            for n in range(size):
+                sd = 0.0
+                for i in range(0, self.nx):
+                    u = rng.random()
+                    if u < 0.5:
+                        sd -= self.D[i]
+                    else:
+                        sd += self.D[i]
+                block.append(sd / float(self.nx))    # mean difference
+            yield block
+
+    def __paired_blocks_numpy(self, sizes, rng):
+        """Yield arrays of random mean differences with randomly flipped signs.
+
+        Signs are drawn as packed bits, one 64-bit integer per 64 pairs, so
+        a block of sums(+/-D) is a single matrix-vector product with D."""
+        D = np.asarray(self.D, dtype=float)
+        nwords = (self.nx + 63) // 64
+        for size in sizes:
+            words = rng.integers(0, 2**64, size=(size, nwords),
+                                 dtype=np.uint64, endpoint=False)
+            bits = np.unpackbits(words.view(np.uint8), axis=1,
+                                 count=self.nx, bitorder='little')
+            signs = 2.0 * bits - 1.0
+            yield signs.dot(D) / float(self.nx)    # mean difference
+
+    def __centred(self):
+        """Pooled observations as deviations from the pooled mean, so that
+        rounding follows the spread of the data and not its distance from
+        zero; differences between means are unchanged."""
+        allobs = list(self.X) + list(self.Y)
+        centre = math.fsum(allobs) / len(allobs)
+        return [x - centre for x in allobs]
+
+    def __unpaired_blocks(self, sizes, rng):
+        """Yield lists of differences between means of shuffled groups."""
+        allobs = self.__centred()
+        stot = math.fsum(allobs)
+        for size in sizes:
+            block = []
+            for n in range(size):
+                rng.shuffle(allobs)
+                sy = sum(allobs[self.nx : ])
+                block.append((stot - sy) / float(self.nx) - sy / float(self.ny))
+            yield block
+
+    def __unpaired_blocks_numpy(self, sizes, rng):
+        """Yield arrays of differences between means of randomised groups.
+
+        Each row of a block picks the members of the smaller group as the
+        indices of its k smallest random keys, which is a uniformly random
+        allocation, and all rows are summed in one operation."""
+        allobs = np.asarray(self.__centred(), dtype=float)
+        ntot = self.nx + self.ny
+        stot = math.fsum(allobs)
+        k = min(self.nx, self.ny)
+        for size in sizes:
+            keys = rng.random((size, ntot))
+            idx = np.argpartition(keys, k - 1, axis=1)[:, :k]
+            s = allobs[idx].sum(axis=1)
+            sy = s if k == self.ny else stot - s
+            yield (stot - sy) / float(self.nx) - sy / float(self.ny)
+
+    def __count(self, dran):
+        """Add a block of randomised differences to the tail counts, taking
+        differences within the rounding tolerance of dbar as ties."""
+        dbar, tol = self.dbar, self.__tol
+        adbar = math.fabs(dbar)
+        if np is None:
+            for d in dran:
+                if d >= dbar - tol: self.ng1 += 1
+                if math.fabs(d - dbar) <= tol: self.ne1 += 1
+                if d <= dbar + tol: self.nl1 += 1
+                if math.fabs(d) >= adbar - tol: self.na1 += 1
+                if math.fabs(math.fabs(d) - adbar) <= tol: self.ne2 += 1
+        else:
+            dran = np.asarray(dran, dtype=float)
+            absd = np.fabs(dran)
+            self.ng1 += int(np.count_nonzero(dran >= dbar - tol))
+            self.ne1 += int(np.count_nonzero(np.fabs(dran - dbar) <= tol))
+            self.nl1 += int(np.count_nonzero(dran <= dbar + tol))
+            self.na1 += int(np.count_nonzero(absd >= adbar - tol))
+            self.ne2 += int(np.count_nonzero(np.fabs(absd - adbar) <= tol))
+        self.__bin(dran)
+        if self.__keep_randiff:
+            self.randiff.extend(dran if np is None else dran.tolist())
+
+    def __make_hist(self, lo, hi, nbins):
+        """Set up an empty histogram of nbins equal bins from lo to hi."""
+        if hi <= lo:
+            lo, hi = lo - 0.5, hi + 0.5
+        width = (hi - lo) / float(nbins)
+        self.hist_edges = [lo + i * width for i in range(nbins)] + [hi]
+        self.hist = [0] * nbins
+
+    def __bin(self, dran, weights=None):
+        """Add randomised differences (with optional counts) to hist."""
+        if self.hist is None:
+            return
+        lo, hi = self.hist_edges[0], self.hist_edges[-1]
+        nbins = len(self.hist)
+        if np is not None and weights is None:
+            # clip so rounding at the extremes cannot drop a value
+            counts = np.histogram(np.clip(dran, lo, hi), bins=nbins, range=(lo, hi))[0]
+            for i, c in enumerate(counts.tolist()):
+                self.hist[i] += c
+            return
+        if weights is None:
+            weights = [1] * len(dran)
+        for d, w in zip(dran, weights):
+            i = int((d - lo) / (hi - lo) * nbins)
+            self.hist[min(max(i, 0), nbins - 1)] += w
+
+    def __repr__(self):
+        if self.exact:
+            title = '\n\n   Exact randomisation test:  all {0:d} allocations'
+        else:
+            title = '\n\n   Rantest:  {0:d} randomisations'
+        return (title.format(self.nran) +
+        '\n P values for difference between means ' +
+        '\n  greater than or equal to observed: P = \t {0:.6f}'.format(self.pg1) +
+        '\n  less than or equal to observed: P = \t {0:.6f}'.format(self.pl1) +
+        '\n  greater than or equal in absolute value to observed: P = \t {0:.6f}'.format(self.pa1) +
+        '\n  Number equal to observed = {0:d} (P= {1:.6f})'.format(self.ne1, self.pe1) +
+        '\n  Number equal in absolute value to observed = {0:d} (P= {1:.6f})'.format(self.ne2, self.pe2) +
+        ('' if self.pseq is None else
+        '\n  sequential (Besag-Clifford) P for absolute value = \t {0:.6f}'.format(self.pseq)) +
+        ('' if self.pa1_ci is None else
+        '\n  confidence limits for P (greater than or equal): \t {0:.6f} to {1:.6f}'.format(*self.pg1_ci) +
+        '\n  confidence limits for P (less than or equal): \t {0:.6f} to {1:.6f}'.format(*self.pl1_ci) +
+        '\n  confidence limits for P (absolute value): \t {0:.6f} to {1:.6f}'.format(*self.pa1_ci)))
+
@@ -1,365 +1,775 @@
-#!/usr/bin/python
-
-"""Basic statistics utility functions.
-    
-The implementation of Student's t distribution inverse CDF was ported to Python
-from JSci. The parameters are set to only be accurate to approximately 5
-decimal places.
-
-The JSci port comes first. "New" code is near the bottom.
-
-JSci information:
-http://jsci.sourceforge.net/
-Original Author: Mark Hale
-Original Licence: LGPL
-"""
-
-import math
-
-# Relative machine precision.
-EPS = 2.22e-16
-# The smallest positive floating-point number such that 1/xminin is machine representable.
-XMININ = 2.23e-308
-# Square root of 2 * pi
-SQRT2PI = 2.5066282746310005024157652848110452530069867406099
-LOGSQRT2PI = math.log(SQRT2PI);
-# Rough estimate of the fourth root of logGamma_xBig
-lg_frtbig = 2.25e76
-pnt68 = 0.6796875
-# lower value = higher precision
-PRECISION = 4.0 * EPS
-
-def betaFraction(x, p, q):
-    """Evaluates of continued fraction part of incomplete beta function.
-        
-        Based on an idea from Numerical Recipes (W.H. Press et al, 1992)."""
-    
-    sum_pq  = p + q
-    p_plus  = p + 1.0
-    p_minus = p - 1.0
-    h = 1.0 - sum_pq * x / p_plus;
-    if abs(h) < XMININ:
-        h = XMININ
-    h = 1.0 / h
-    frac = h
-    m = 1
-    delta = 0.0
-    c = 1.0
-    
-    while m <= MAX_ITERATIONS and abs(delta-1.0) > PRECISION:
-        m2 = 2 * m
-        
-        # even index for d
-        d=m*(q-m)*x/((p_minus+m2)*(p+m2))
-        h=1.0+d*h
-        if abs(h) < XMININ: h=XMININ
-        h=1.0/h;
-        c=1.0+d/c;
-        if abs(c) < XMININ: c=XMININ
-        frac *= h*c;
-        
-        # odd index for d
-        d = -(p+m)*(sum_pq+m)*x/((p+m2)*(p_plus+m2))
-        h=1.0+d*h
-        if abs(h) < XMININ: h=XMININ;
-        h=1.0/h
-        c=1.0+d/c
-        if abs(c) < XMININ: c = XMININ
-        delta=h*c
-        frac *= delta
-        m += 1
-    
-    return frac
-
-# The largest argument for which <code>logGamma(x)</code> is representable in the machine.
-LOG_GAMMA_X_MAX_VALUE = 2.55e305
-# Log Gamma related constants
-lg_d1 = -0.5772156649015328605195174;
-lg_d2 = 0.4227843350984671393993777;
-lg_d4 = 1.791759469228055000094023;
-lg_p1 = [ 4.945235359296727046734888,
-         201.8112620856775083915565, 2290.838373831346393026739,
-         11319.67205903380828685045, 28557.24635671635335736389,
-         38484.96228443793359990269, 26377.48787624195437963534,
-         7225.813979700288197698961 ]
-lg_q1 = [ 67.48212550303777196073036,
-         1113.332393857199323513008, 7738.757056935398733233834,
-         27639.87074403340708898585, 54993.10206226157329794414,
-         61611.22180066002127833352, 36351.27591501940507276287,
-         8785.536302431013170870835 ]
-lg_p2 = [ 4.974607845568932035012064,
-         542.4138599891070494101986, 15506.93864978364947665077,
-         184793.2904445632425417223, 1088204.76946882876749847,
-         3338152.967987029735917223, 5106661.678927352456275255,
-         3074109.054850539556250927 ]
-lg_q2 = [ 183.0328399370592604055942,
-         7765.049321445005871323047, 133190.3827966074194402448,
-         1136705.821321969608938755, 5267964.117437946917577538,
-         13467014.54311101692290052, 17827365.30353274213975932,
-         9533095.591844353613395747 ]
-lg_p4 = [ 14745.02166059939948905062,
-         2426813.369486704502836312, 121475557.4045093227939592,
-         2663432449.630976949898078, 29403789566.34553899906876,
-         170266573776.5398868392998, 492612579337.743088758812,
-         560625185622.3951465078242 ]
-lg_q4 = [ 2690.530175870899333379843,
-         639388.5654300092398984238, 41355999.30241388052042842,
-         1120872109.61614794137657, 14886137286.78813811542398,
-         101680358627.2438228077304, 341747634550.7377132798597,
-         446315818741.9713286462081 ]
-lg_c = [ -0.001910444077728,8.4171387781295e-4,
-        -5.952379913043012e-4, 7.93650793500350248e-4,
-        -0.002777777777777681622553, 0.08333333333333333331554247,
-        0.0057083835261 ]
-
-
-def logGamma(x):
-    """The natural logarithm of the gamma function.
-        Based on public domain NETLIB (Fortran) code by W. J. Cody and L. Stoltz<BR>
-        Applied Mathematics Division<BR>
-        Argonne National Laboratory<BR>
-        Argonne, IL 60439<BR>
-        <P>
-        References:
-        <OL>
-        <LI>W. J. Cody and K. E. Hillstrom, 'Chebyshev Approximations for the Natural Logarithm of the Gamma Function,' Math. Comp. 21, 1967, pp. 198-203.
-        <LI>K. E. Hillstrom, ANL/AMD Program ANLC366S, DGAMMA/DLGAMA, May, 1969.
-        <LI>Hart, Et. Al., Computer Approximations, Wiley and sons, New York, 1968.
-        </OL></P><P>
-        From the original documentation:
-        </P><P>
-        This routine calculates the LOG(GAMMA) function for a positive real argument X.
-        Computation is based on an algorithm outlined in references 1 and 2.
-        The program uses rational functions that theoretically approximate LOG(GAMMA)
-        to at least 18 significant decimal digits.  The approximation for X > 12 is from reference 3,
-        while approximations for X < 12.0 are similar to those in reference 1, but are unpublished.
-        The accuracy achieved depends on the arithmetic system, the compiler, the intrinsic functions,
-        and proper selection of the machine-dependent constants.
-        </P><P>
-        Error returns:<BR>
-        The program returns the value XINF for X .LE. 0.0 or when overflow would occur.
-        The computation is believed to be free of underflow and overflow."""
-    
-    y = x
-    if y < 0.0 or y > LOG_GAMMA_X_MAX_VALUE:
-        # Bad arguments
-        return float("inf")
-    
-    if y <= EPS:
-        return -math.log(y)
-    
-    if y <= 1.5:
-        if (y < pnt68):
-            corr = -math.log(y)
-            xm1 = y
-        else:
-            corr = 0.0;
-            xm1 = y - 1.0;
-        
-        if y <= 0.5 or y >= pnt68:
-            xden = 1.0;
-            xnum = 0.0;
-            for i in range(8):
-                xnum = xnum * xm1 + lg_p1[i];
-                xden = xden * xm1 + lg_q1[i];
-            return corr + xm1 * (lg_d1 + xm1 * (xnum / xden));
-        else:
-            xm2 = y - 1.0;
-            xden = 1.0;
-            xnum = 0.0;
-            for i in range(8):
-                xnum = xnum * xm2 + lg_p2[i];
-                xden = xden * xm2 + lg_q2[i];
-            return corr + xm2 * (lg_d2 + xm2 * (xnum / xden));
-
-    if (y <= 4.0):
-        xm2 = y - 2.0;
-        xden = 1.0;
-        xnum = 0.0;
-        for i in range(8):
-            xnum = xnum * xm2 + lg_p2[i];
-            xden = xden * xm2 + lg_q2[i];
-        return xm2 * (lg_d2 + xm2 * (xnum / xden));
-
-    if y <= 12.0:
-        xm4 = y - 4.0;
-        xden = -1.0;
-        xnum = 0.0;
-        for i in range(8):
-            xnum = xnum * xm4 + lg_p4[i];
-            xden = xden * xm4 + lg_q4[i];
-        return lg_d4 + xm4 * (xnum / xden);
-
-    assert y <= lg_frtbig
-    res = lg_c[6];
-    ysq = y * y;
-    for i in range(6):
-        res = res / ysq + lg_c[i];
-    res /= y;
-    corr = math.log(y);
-    res = res + LOGSQRT2PI - 0.5 * corr;
-    res += y * (corr - 1.0);
-    return res
-
-
-def logBeta(p, q):
-    """The natural logarithm of the beta function."""
-    assert p > 0
-    assert q > 0
-    if p <= 0 or q <= 0 or p + q > LOG_GAMMA_X_MAX_VALUE:
-        return 0
-    
-    return logGamma(p) + logGamma(q) - logGamma(p + q)
-
-
-def incompleteBeta(x, p, q):
-    """Incomplete beta function.
-        
-        The computation is based on formulas from Numerical Recipes, Chapter 6.4 (W.H. Press et al, 1992).
-        Ported from Java: http://jsci.sourceforge.net/"""
-    
-    assert 0 <= x <= 1
-    assert p > 0
-    assert q > 0
-    
-    # Range checks to avoid numerical stability issues?
-    if x <= 0.0:
-        return 0.0
-    if x >= 1.0:
-        return 1.0
-    if p <= 0.0 or q <= 0.0 or (p + q) > LOG_GAMMA_X_MAX_VALUE:
-        return 0.0
-    
-    beta_gam = math.exp(-logBeta(p, q) + p * math.log(x) + q * math.log(1.0 - x))
-    if x < (p + 1.0)/(p + q + 2.0):
-        return beta_gam * betaFraction(x, p, q) / p
-    else:
-        return 1.0 - (beta_gam * betaFraction(1.0 - x, q, p) / q)
-
-
-ACCURACY = 10**-7
-MAX_ITERATIONS = 10000
-
-def findRoot(value, x_low, x_high, function):
-    """Use the bisection method to find root such that function(root) == value."""
-    
-    guess = (x_high + x_low) / 2.0
-    v = function(guess)
-    difference = v - value
-    i = 0
-    while abs(difference) > ACCURACY and i < MAX_ITERATIONS:
-        i += 1
-        if difference > 0:
-            x_high = guess
-        else:
-            x_low = guess
-        
-        guess = (x_high + x_low) / 2.0
-        v = function(guess)
-        difference = v - value
-        #print (guess)
-    return guess
-
-
-def StudentTCDF(degree_of_freedom, X):
-    """Student's T distribution CDF. Returns probability that a value x < X.
-        
-        Ported from Java: http://jsci.sourceforge.net/"""
-    
-    A = 0.5 * incompleteBeta(degree_of_freedom / (degree_of_freedom + X * X), 0.5 *degree_of_freedom, 0.5)
-    if X > 0:
-        return 1 - A
-    return A
-
-
-def InverseStudentT(degree_of_freedom, probability):
-    """Inverse of Student's T distribution CDF. Returns the value x such that CDF(x) = probability.
-        
-        Ported from Java: http://jsci.sourceforge.net/
-        
-        This is not the best algorithm in the world. SciPy has a Fortran version
-        (see special.stdtrit):
-        http://svn.scipy.org/svn/scipy/trunk/scipy/stats/distributions.py
-        http://svn.scipy.org/svn/scipy/trunk/scipy/special/cdflib/cdft.f
-        
-        Very detailed information:
-        http://www.maths.ox.ac.uk/~shaww/finpapers/tdist.pdf
-        """
-    
-    assert 0 <= probability <= 1
-    
-    if probability == 1:
-        return float("inf")
-    if probability == 0:
-        return float("-inf")
-    if probability == 0.5:
-        return 0.0
-
-    def f(x):
-        return StudentTCDF(degree_of_freedom, x)
-
-    return findRoot(probability, -10 ** 4, 10 ** 4, f)
-
-
-def tinv(p, degree_of_freedom, tails=2):
-    """Similar to the TINV function in Excel
-        
-        p: 1-confidence (eg. 0.05 = 95% confidence)
-        but generates two-tail value by default"""
-    
-    assert 0 <= p <= 1
-    confidence = 1 - p
-    ###AP's modification to get the right tailed distribution
-    if tails == 2:
-        return InverseStudentT(degree_of_freedom, confidence)
-    else:
-        return InverseStudentT(degree_of_freedom, (1+confidence)/2.0)
-
-
-def memoize(function):
-    cache = {}
-    def closure(*args):
-        if args not in cache:
-            cache[args] = function(*args)
-        return cache[args]
-    return closure
-
-# Cache tinv results, since we typically call it with the same args over and over
-cached_tinv = memoize(tinv)
-
-#AP's addition for Hedge's calculation
-def simple_stats(r):
-    total = sum(r)
-    average = total / float(len(r))
-    sum_deviation_squared = sum([(i - average) ** 2 for i in r])
-    standard_deviation = math.sqrt(sum_deviation_squared / (len(r) - 1 or 1))
-
-    return average, standard_deviation
-
-def stats(r, confidence_interval=0.05):
-    """Returns statistics about a sequence of numbers.
-        
-        By default it computes the 95% confidence interval.
-        
-        Returns (average, median, standard deviation, min, max, confidence interval)"""
-    
-    total = sum(r)
-    average = total / float(len(r))
-    sum_deviation_squared = sum([(i - average) ** 2 for i in r])
-    standard_deviation = math.sqrt(sum_deviation_squared / (len(r) - 1 or 1))
-    s = list(r)
-    s.sort()
-    median = s[len(s) / 2]
-    minimum = s[0]
-    maximum = s[-1]
-    # See: http://davidmlane.com/hyperstat/
-    # confidence_95 = 1.959963984540051 * standard_deviation / math.sqrt(len(r))
-    # We must estimate both using the t distribution:
-    # http://davidmlane.com/hyperstat/B7483.html
-    # s_m = s / sqrt(N)
-    s_m = standard_deviation / math.sqrt(len(r))
-    # Degrees of freedom = n-1
-    # t = tinv(0.05, degrees_of_freedom)
-    # confidence = +/- t * s_m
-    confidence = cached_tinv(confidence_interval, len(r) - 1) * s_m
-    return average, median, standard_deviation, minimum, maximum, confidence
+#!/usr/bin/python
+
+"""Basic statistics utility functions.
+    
+The implementation of Student's t distribution inverse CDF was ported to Python
+from JSci. The parameters are set to only be accurate to approximately 5
+decimal places.
+
+The JSci port comes first. "New" code is near the bottom.
+
+JSci information:
+http://jsci.sourceforge.net/
+Original Author: Mark Hale
+Original Licence: LGPL
+"""
+
+import math
+import threading
+from collections import OrderedDict
+
+try:
+    import numpy as np
+except ImportError:
+    # NumPy is optional: the array versions then map the scalar functions.
+    np = None
+
+# Relative machine precision.
+EPS = 2.22e-16
+# The smallest positive floating-point number such that 1/xminin is machine representable.
+XMININ = 2.23e-308
+# Square root of 2 * pi
+SQRT2PI = 2.5066282746310005024157652848110452530069867406099
+LOGSQRT2PI = math.log(SQRT2PI);
+# Rough estimate of the fourth root of logGamma_xBig
+lg_frtbig = 2.25e76
+pnt68 = 0.6796875
+# lower value = higher precision
+PRECISION = 4.0 * EPS
+
+def betaFraction(x, p, q):
+    """Evaluates of continued fraction part of incomplete beta function.
+        
+        Based on an idea from Numerical Recipes (W.H. Press et al, 1992)."""
+    
+    sum_pq  = p + q
+    p_plus  = p + 1.0
+    p_minus = p - 1.0
+    h = 1.0 - sum_pq * x / p_plus;
+    if abs(h) < XMININ:
+        h = XMININ
+    h = 1.0 / h
+    frac = h
+    m = 1
+    delta = 0.0
+    c = 1.0
+    
+    while m <= MAX_ITERATIONS and abs(delta-1.0) > PRECISION:
+        m2 = 2 * m
+        
+        # even index for d
+        d=m*(q-m)*x/((p_minus+m2)*(p+m2))
+        h=1.0+d*h
+        if abs(h) < XMININ: h=XMININ
+        h=1.0/h;
+        c=1.0+d/c;
+        if abs(c) < XMININ: c=XMININ
+        frac *= h*c;
+        
+        # odd index for d
+        d = -(p+m)*(sum_pq+m)*x/((p+m2)*(p_plus+m2))
+        h=1.0+d*h
+        if abs(h) < XMININ: h=XMININ;
+        h=1.0/h
+        c=1.0+d/c
+        if abs(c) < XMININ: c = XMININ
+        delta=h*c
+        frac *= delta
+        m += 1
+    
+    return frac
+
+# The largest argument for which <code>logGamma(x)</code> is representable in the machine.
+LOG_GAMMA_X_MAX_VALUE = 2.55e305
+# Log Gamma related constants
+lg_d1 = -0.5772156649015328605195174;
+lg_d2 = 0.4227843350984671393993777;
+lg_d4 = 1.791759469228055000094023;
+lg_p1 = [ 4.945235359296727046734888,
+         201.8112620856775083915565, 2290.838373831346393026739,
+         11319.67205903380828685045, 28557.24635671635335736389,
+         38484.96228443793359990269, 26377.48787624195437963534,
+         7225.813979700288197698961 ]
+lg_q1 = [ 67.48212550303777196073036,
+         1113.332393857199323513008, 7738.757056935398733233834,
+         27639.87074403340708898585, 54993.10206226157329794414,
+         61611.22180066002127833352, 36351.27591501940507276287,
+         8785.536302431013170870835 ]
+lg_p2 = [ 4.974607845568932035012064,
+         542.4138599891070494101986, 15506.93864978364947665077,
+         184793.2904445632425417223, 1088204.76946882876749847,
+         3338152.967987029735917223, 5106661.678927352456275255,
+         3074109.054850539556250927 ]
+lg_q2 = [ 183.0328399370592604055942,
+         7765.049321445005871323047, 133190.3827966074194402448,
+         1136705.821321969608938755, 5267964.117437946917577538,
+         13467014.54311101692290052, 17827365.30353274213975932,
+         9533095.591844353613395747 ]
+lg_p4 = [ 14745.02166059939948905062,
+         2426813.369486704502836312, 121475557.4045093227939592,
+         2663432449.630976949898078, 29403789566.34553899906876,
+         170266573776.5398868392998, 492612579337.743088758812,
+         560625185622.3951465078242 ]
+lg_q4 = [ 2690.530175870899333379843,
+         639388.5654300092398984238, 41355999.30241388052042842,
+         1120872109.61614794137657, 14886137286.78813811542398,
+         101680358627.2438228077304, 341747634550.7377132798597,
+         446315818741.9713286462081 ]
+lg_c = [ -0.001910444077728,8.4171387781295e-4,
+        -5.952379913043012e-4, 7.93650793500350248e-4,
+        -0.002777777777777681622553, 0.08333333333333333331554247,
+        0.0057083835261 ]
+
+
+# logGamma at the integers and half-integers up to this value is taken from
+# a table built by the exact recurrence log(Gamma(x + 1)) = log(Gamma(x)) + log(x)
+# from Gamma(1/2) = sqrt(pi) and Gamma(1) = 1; these are the arguments that
+# come from degrees of freedom. Larger ones use the rational approximations.
+LOG_GAMMA_TABLE_MAX = 1024
+# _log_gamma_halves[k] = logGamma(k / 2), grown as needed; only one thread
+# grows it at a time, and entries once appended never change
+_log_gamma_halves = [float("inf"), LOGSQRT2PI - 0.5 * math.log(2.0), 0.0]
+_log_gamma_lock = threading.Lock()
+
+def _logGammaHalf(k):
+    """logGamma(k / 2) from the table, for 0 < k <= 2 * LOG_GAMMA_TABLE_MAX."""
+    table = _log_gamma_halves
+    if len(table) <= k:
+        with _log_gamma_lock:
+            while len(table) <= k:
+                m = len(table)
+                table.append(table[m - 2] + math.log(0.5 * (m - 2)))
+    return table[k]
+
+def logGamma(x):
+    """The natural logarithm of the gamma function.
+        Based on public domain NETLIB (Fortran) code by W. J. Cody and L. Stoltz<BR>
+        Applied Mathematics Division<BR>
+        Argonne National Laboratory<BR>
+        Argonne, IL 60439<BR>
+        <P>
+        References:
+        <OL>
+        <LI>W. J. Cody and K. E. Hillstrom, 'Chebyshev Approximations for the Natural Logarithm of the Gamma Function,' Math. Comp. 21, 1967, pp. 198-203.
+        <LI>K. E. Hillstrom, ANL/AMD Program ANLC366S, DGAMMA/DLGAMA, May, 1969.
+        <LI>Hart, Et. Al., Computer Approximations, Wiley and sons, New York, 1968.
+        </OL></P><P>
+        From the original documentation:
+        </P><P>
+        This routine calculates the LOG(GAMMA) function for a positive real argument X.
+        Computation is based on an algorithm outlined in references 1 and 2.
+        The program uses rational functions that theoretically approximate LOG(GAMMA)
+        to at least 18 significant decimal digits.  The approximation for X > 12 is from reference 3,
+        while approximations for X < 12.0 are similar to those in reference 1, but are unpublished.
+        The accuracy achieved depends on the arithmetic system, the compiler, the intrinsic functions,
+        and proper selection of the machine-dependent constants.
+        </P><P>
+        Error returns:<BR>
+        The program returns the value XINF for X .LE. 0.0 or when overflow would occur.
+        The computation is believed to be free of underflow and overflow."""
+    
+    y = x
+    if y < 0.0 or y > LOG_GAMMA_X_MAX_VALUE:
+        # Bad arguments
+        return float("inf")
+    
+    if 0.0 < y <= LOG_GAMMA_TABLE_MAX and 2.0 * y == int(2.0 * y):
+        return _logGammaHalf(int(2.0 * y))
+    
+    if y <= EPS:
+        return -math.log(y)
+    
+    if y <= 1.5:
+        if (y < pnt68):
+            corr = -math.log(y)
+            xm1 = y
+        else:
+            corr = 0.0;
+            xm1 = y - 1.0;
+        
+        if y <= 0.5 or y >= pnt68:
+            xden = 1.0;
+            xnum = 0.0;
+            for i in range(8):
+                xnum = xnum * xm1 + lg_p1[i];
+                xden = xden * xm1 + lg_q1[i];
+            return corr + xm1 * (lg_d1 + xm1 * (xnum / xden));
+        else:
+            xm2 = y - 1.0;
+            xden = 1.0;
+            xnum = 0.0;
+            for i in range(8):
+                xnum = xnum * xm2 + lg_p2[i];
+                xden = xden * xm2 + lg_q2[i];
+            return corr + xm2 * (lg_d2 + xm2 * (xnum / xden));
+
+    if (y <= 4.0):
+        xm2 = y - 2.0;
+        xden = 1.0;
+        xnum = 0.0;
+        for i in range(8):
+            xnum = xnum * xm2 + lg_p2[i];
+            xden = xden * xm2 + lg_q2[i];
+        return xm2 * (lg_d2 + xm2 * (xnum / xden));
+
+    if y <= 12.0:
+        xm4 = y - 4.0;
+        xden = -1.0;
+        xnum = 0.0;
+        for i in range(8):
+            xnum = xnum * xm4 + lg_p4[i];
+            xden = xden * xm4 + lg_q4[i];
+        return lg_d4 + xm4 * (xnum / xden);
+
+    assert y <= lg_frtbig
+    res = lg_c[6];
+    ysq = y * y;
+    for i in range(6):
+        res = res / ysq + lg_c[i];
+    res /= y;
+    corr = math.log(y);
+    res = res + LOGSQRT2PI - 0.5 * corr;
+    res += y * (corr - 1.0);
+    return res
+
+
+def logBeta(p, q):
+    """The natural logarithm of the beta function."""
+    assert p > 0
+    assert q > 0
+    if p <= 0 or q <= 0 or p + q > LOG_GAMMA_X_MAX_VALUE:
+        return 0
+    
+    return logGamma(p) + logGamma(q) - logGamma(p + q)
+
+
+def incompleteBeta(x, p, q):
+    """Incomplete beta function.
+        
+        The computation is based on formulas from Numerical Recipes, Chapter 6.4 (W.H. Press et al, 1992).
+        Ported from Java: http://jsci.sourceforge.net/"""
+    
+    assert 0 <= x <= 1
+    assert p > 0
+    assert q > 0
+    
+    # Range checks to avoid numerical stability issues?
+    if x <= 0.0:
+        return 0.0
+    if x >= 1.0:
+        return 1.0
+    if p <= 0.0 or q <= 0.0 or (p + q) > LOG_GAMMA_X_MAX_VALUE:
+        return 0.0
+    
+    beta_gam = math.exp(-logBeta(p, q) + p * math.log(x) + q * math.log(1.0 - x))
+    if x < (p + 1.0)/(p + q + 2.0):
+        return beta_gam * betaFraction(x, p, q) / p
+    else:
+        return 1.0 - (beta_gam * betaFraction(1.0 - x, q, p) / q)
+
+
+ACCURACY = 10**-7
+MAX_ITERATIONS = 10000
+
+def findRoot(value, x_low, x_high, function):
+    """Use the bisection method to find root such that function(root) == value."""
+    
+    guess = (x_high + x_low) / 2.0
+    v = function(guess)
+    difference = v - value
+    i = 0
+    while abs(difference) > ACCURACY and i < MAX_ITERATIONS:
+        i += 1
+        if difference > 0:
+            x_high = guess
+        else:
+            x_low = guess
+        
+        guess = (x_high + x_low) / 2.0
+        v = function(guess)
+        difference = v - value
+        #print (guess)
+    return guess
+
+
+def StudentTCDF(degree_of_freedom, X):
+    """Student's T distribution CDF. Returns probability that a value x < X.
+        
+        Ported from Java: http://jsci.sourceforge.net/"""
+    
+    A = 0.5 * incompleteBeta(degree_of_freedom / (degree_of_freedom + X * X), 0.5 *degree_of_freedom, 0.5)
+    if X > 0:
+        return 1 - A
+    return A
+
+
+def InverseStudentT(degree_of_freedom, probability):
+    """Inverse of Student's T distribution CDF. Returns the value x such that CDF(x) = probability.
+        
+        Starts from Hill's approximation (G. W. Hill, 'Algorithm 396:
+        Student's t-quantiles', Comm. ACM 13, 1970, pp. 619-620) and refines
+        it by Halley iterations on the tail probability, falling back to
+        bisection whenever a step would leave the bracket known to hold the
+        root. This converges to full double precision in x, usually in two
+        or three evaluations of incompleteBeta.
+        
+        Very detailed information:
+        http://www.maths.ox.ac.uk/~shaww/finpapers/tdist.pdf
+        """
+    
+    assert 0 <= probability <= 1
+    
+    if probability == 1:
+        return float("inf")
+    if probability == 0:
+        return float("-inf")
+    if probability == 0.5:
+        return 0.0
+    
+    # solve for the upper tail probability of |x|, which keeps its
+    # precision however small it is
+    tail = min(probability, 1.0 - probability)
+    t = _hillStudentT(degree_of_freedom, tail)
+    if degree_of_freedom not in (1, 2):    # else Hill's formula is exact
+        t = _halleyStudentT(degree_of_freedom, tail, t)
+    return -t if probability < 0.5 else t
+
+
+def _normalQuantile(probability):
+    """Standard normal quantile to about 1e-9 relative accuracy (P. J.
+        Acklam's rational approximation), used as a starting point."""
+    
+    a = [-3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02,
+         1.383577518672690e+02, -3.066479806614716e+01, 2.506628277459239e+00]
+    b = [-5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02,
+         6.680131188771972e+01, -1.328068155288572e+01]
+    c = [-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e+00,
+         -2.549732539343734e+00, 4.374664141464968e+00, 2.938163982698783e+00]
+    d = [7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e+00,
+         3.754408661907416e+00]
+    
+    if 0.02425 <= probability <= 0.97575:
+        q = probability - 0.5
+        r = q * q
+        return ((((((a[0] * r + a[1]) * r + a[2]) * r + a[3]) * r + a[4]) * r + a[5]) * q /
+                (((((b[0] * r + b[1]) * r + b[2]) * r + b[3]) * r + b[4]) * r + 1.0))
+    q = math.sqrt(-2.0 * math.log(min(probability, 1.0 - probability)))
+    x = ((((((c[0] * q + c[1]) * q + c[2]) * q + c[3]) * q + c[4]) * q + c[5]) /
+         ((((d[0] * q + d[1]) * q + d[2]) * q + d[3]) * q + 1.0))
+    return x if probability < 0.5 else -x
+
+def NormalCDF(X):
+    """Standard normal cumulative distribution function."""
+    return 0.5 * math.erfc(-X / math.sqrt(2.0))
+
+def InverseNormal(probability):
+    """Inverse of the standard normal CDF. Returns the value x such that
+        NormalCDF(x) = probability.
+        
+        Acklam's approximation, refined by one Halley step on the tail
+        probability to about full double precision.
+        """
+    
+    assert 0 <= probability <= 1
+    
+    if probability == 1:
+        return float("inf")
+    if probability == 0:
+        return float("-inf")
+    if probability == 0.5:
+        return 0.0
+    
+    tail = min(probability, 1.0 - probability)
+    x = _normalQuantile(tail)
+    u = (NormalCDF(x) - tail) * math.sqrt(2.0 * math.pi) * math.exp(0.5 * x * x)
+    x -= u / (1.0 + 0.5 * x * u)
+    return x if probability < 0.5 else -x
+
+
+def _hillStudentT(degree_of_freedom, tail):
+    """Hill's approximation to the positive x with upper tail probability
+        tail; exact for 1 and 2 degrees of freedom."""
+    
+    n = float(degree_of_freedom)
+    P = 2.0 * tail    # two-tail probability
+    if n == 1 or n < 1.5:
+        return 1.0 / math.tan(0.5 * P * math.pi)
+    if n == 2:
+        return math.sqrt(2.0 / (P * (2.0 - P)) - 2.0)
+    
+    a = 1.0 / (n - 0.5)
+    b = 48.0 / (a * a)
+    c = ((20700.0 * a / b - 98.0) * a - 16.0) * a + 96.36
+    d = ((94.5 / (b + c) - 3.0) / b + 1.0) * math.sqrt(a * math.pi / 2.0) * n
+    log_y = (2.0 / n) * math.log(d * P)
+    if log_y < math.log(EPS):
+        # far tail, where x is close to sqrt(n / y)
+        return math.exp(0.5 * (math.log(n) - log_y))
+    y = math.exp(log_y)
+    if y > 0.05 + a:
+        # asymptotic inverse expansion about the normal
+        x = _normalQuantile(0.5 * P)
+        y = x * x
+        if n < 5:
+            c += 0.3 * (n - 4.5) * (x + 0.6)
+        c = (((0.05 * d * x - 5.0) * x - 7.0) * x - 2.0) * x + b + c
+        y = (((((0.4 * y + 6.3) * y + 36.0) * y + 94.5) / c - y - 3.0) / b + 1.0) * x
+        y = math.expm1(a * y * y)
+    else:
+        y = ((1.0 / (((n + 6.0) / (n * y) - 0.089 * d - 0.822) * (n + 2.0) * 3.0) +
+              0.5 / (n + 4.0)) * y - 1.0) * (n + 1.0) / (n + 2.0) + 1.0 / y
+    return math.sqrt(n * y)
+
+
+def _halleyStudentT(degree_of_freedom, tail, t):
+    """Refine t > 0 so that the upper tail probability of Student's T is
+        tail, by safeguarded Halley iterations.
+        
+        The iterations solve log(upper tail) = log(tail), which is close to
+        linear in log(t) far out in the tail where the tail itself is not."""
+    
+    n = float(degree_of_freedom)
+    log_norm = (logGamma(0.5 * (n + 1.0)) - logGamma(0.5 * n) -
+                0.5 * math.log(n * math.pi))
+    log_tail = math.log(tail)
+    # the tail decreases with t, so the root stays between low and high
+    low, high = 0.0, float("inf")
+    for i in range(100):
+        upper = 0.5 * incompleteBeta(n / (n + t * t), 0.5 * n, 0.5)
+        if upper > tail:
+            low = t
+        elif upper < tail:
+            high = t
+        else:
+            return t
+        new = low    # rejected below unless a step can be taken
+        density = math.exp(log_norm - 0.5 * (n + 1.0) * math.log1p(t * t / n))
+        if upper > 0 and density > 0:
+            # ratio of the density to the tail, and minus the logarithmic
+            # derivative of the density
+            r = density / upper
+            k = (n + 1.0) * t / (n + t * t)
+            v = (math.log(upper) - log_tail) / r
+            halley = 1.0 - 0.5 * v * (k - r)
+            # Newton's step if Halley's would turn the wrong way
+            new = t + (v / halley if halley > 0.5 else v)
+        if not low < new < high:
+            if high == float("inf"):
+                new = 2.0 * t
+            elif high > 4.0 * max(low, 1.0):
+                new = math.sqrt(max(low, 1.0)) * math.sqrt(high)    # in log(t)
+            else:
+                new = 0.5 * (low + high)
+        if abs(new - t) <= 2.0 * EPS * new:
+            return new
+        t = new
+    return t
+
+
+def InverseIncompleteBeta(probability, p, q):
+    """Inverse of the incomplete beta function in x. Returns the value x such
+    that incompleteBeta(x, p, q) = probability.
+        
+        Bisection on x itself, so the result is accurate to double precision
+        in x rather than to a tolerance on the function value."""
+    
+    assert 0 <= probability <= 1
+    
+    if probability == 0:
+        return 0.0
+    if probability == 1:
+        return 1.0
+    
+    x_low, x_high = 0.0, 1.0
+    for i in range(200):
+        guess = (x_high + x_low) / 2.0
+        if guess <= x_low or guess >= x_high:
+            break
+        if incompleteBeta(guess, p, q) < probability:
+            x_low = guess
+        else:
+            x_high = guess
+    return (x_high + x_low) / 2.0
+
+
+def clopper_pearson(k, n, confidence=0.95):
+    """Exact (Clopper-Pearson) confidence interval for a binomial proportion
+    estimated as k successes out of n trials.
+        
+        Returns (lower, upper)."""
+    
+    assert 0 <= k <= n
+    alpha = 1 - confidence
+    lower = 0.0 if k == 0 else InverseIncompleteBeta(alpha / 2.0, k, n - k + 1)
+    upper = 1.0 if k == n else InverseIncompleteBeta(1 - alpha / 2.0, k + 1, n - k)
+    return lower, upper
+
+
+# Array versions of the functions above. Each evaluates whole arrays of
+# arguments (broadcast together) with NumPy, following the scalar code step
+# by step so that every element agrees with the scalar result; loops that
+# iterate to convergence stop separately for each element. Without NumPy
+# they fall back to the scalar functions and return lists.
+
+def _scalar_map(function, *args):
+    """Apply a scalar function elementwise to lists or scalars."""
+    lists = [a if hasattr(a, '__len__') else None for a in args]
+    n = max([len(a) for a in lists if a is not None] or [0])
+    return [function(*[a[i] if l is not None else a
+        for a, l in zip(args, lists)]) for i in range(n)]
+
+def _floor_xminin(h):
+    """Elementwise version of 'if abs(h) < XMININ: h = XMININ'."""
+    return np.where(np.fabs(h) < XMININ, XMININ, h)
+
+def betaFractionArray(x, p, q):
+    """Array version of betaFraction."""
+    if np is None:
+        return _scalar_map(betaFraction, x, p, q)
+    shape = np.broadcast(x, p, q).shape
+    x, p, q = [np.array(a, dtype=float).ravel() for a in np.broadcast_arrays(x, p, q)]
+    sum_pq = p + q
+    p_plus = p + 1.0
+    p_minus = p - 1.0
+    h = 1.0 / _floor_xminin(1.0 - sum_pq * x / p_plus)
+    frac = h.copy()
+    c = np.ones_like(x)
+    # indices of the elements still iterating
+    active = np.arange(x.size)
+    m = 1
+    while m <= MAX_ITERATIONS and active.size:
+        xa, pa, qa, ha, ca = x[active], p[active], q[active], h[active], c[active]
+        m2 = 2 * m
+        
+        # even index for d
+        d = m * (qa - m) * xa / ((p_minus[active] + m2) * (pa + m2))
+        ha = 1.0 / _floor_xminin(1.0 + d * ha)
+        ca = _floor_xminin(1.0 + d / ca)
+        fa = frac[active] * (ha * ca)
+        
+        # odd index for d
+        d = -(pa + m) * (sum_pq[active] + m) * xa / ((pa + m2) * (p_plus[active] + m2))
+        ha = 1.0 / _floor_xminin(1.0 + d * ha)
+        ca = _floor_xminin(1.0 + d / ca)
+        delta = ha * ca
+        frac[active] = fa * delta
+        h[active], c[active] = ha, ca
+        active = active[np.fabs(delta - 1.0) > PRECISION]
+        m += 1
+    return frac.reshape(shape)
+
+def _rational(z, p, q, den):
+    """Evaluate the Cody-Stoltz rational function xnum / xden at z."""
+    xnum, xden = np.zeros_like(z), np.full_like(z, den)
+    for i in range(8):
+        xnum = xnum * z + p[i]
+        xden = xden * z + q[i]
+    return xnum / xden
+
+def logGammaArray(x):
+    """Array version of logGamma."""
+    if np is None:
+        return _scalar_map(logGamma, x)
+    y = np.asarray(x, dtype=float)
+    res = np.full(y.shape, float("inf"))
+    halves = (y > 0.0) & (y <= LOG_GAMMA_TABLE_MAX) & (2.0 * y == np.floor(2.0 * y))
+    if np.any(halves):
+        _logGammaHalf(int(2.0 * y[halves].max()))
+        res[halves] = np.array(_log_gamma_halves)[(2.0 * y[halves]).astype(int)]
+    y = np.where(halves, np.nan, y)    # leave them out of the cases below
+    with np.errstate(divide='ignore'):
+        sel = (y >= 0.0) & (y <= EPS)
+        res[sel] = -np.log(y[sel])
+    sel = (y > EPS) & (y <= 1.5)
+    z = y[sel]
+    small = z < pnt68
+    corr = np.where(small, -np.log(z), 0.0)
+    xm1 = np.where(small, z, z - 1.0)
+    first = (z <= 0.5) | (z >= pnt68)
+    r = np.empty_like(z)
+    r[first] = corr[first] + xm1[first] * (lg_d1 + xm1[first] *
+        _rational(xm1[first], lg_p1, lg_q1, 1.0))
+    xm2 = z[~first] - 1.0
+    r[~first] = corr[~first] + xm2 * (lg_d2 + xm2 * _rational(xm2, lg_p2, lg_q2, 1.0))
+    res[sel] = r
+    sel = (y > 1.5) & (y <= 4.0)
+    xm2 = y[sel] - 2.0
+    res[sel] = xm2 * (lg_d2 + xm2 * _rational(xm2, lg_p2, lg_q2, 1.0))
+    sel = (y > 4.0) & (y <= 12.0)
+    xm4 = y[sel] - 4.0
+    res[sel] = lg_d4 + xm4 * _rational(xm4, lg_p4, lg_q4, -1.0)
+    sel = (y > 12.0) & (y <= LOG_GAMMA_X_MAX_VALUE)
+    z = y[sel]
+    r = np.full_like(z, lg_c[6])
+    ysq = z * z
+    for i in range(6):
+        r = r / ysq + lg_c[i]
+    r /= z
+    corr = np.log(z)
+    r = r + LOGSQRT2PI - 0.5 * corr
+    r += z * (corr - 1.0)
+    res[sel] = r
+    return res if res.ndim else float(res)
+
+def incompleteBetaArray(x, p, q):
+    """Array version of incompleteBeta."""
+    if np is None:
+        return _scalar_map(incompleteBeta, x, p, q)
+    x, p, q = [a.astype(float) for a in np.broadcast_arrays(x, p, q)]
+    assert np.all((0 <= x) & (x <= 1))
+    assert np.all(p > 0)
+    assert np.all(q > 0)
+    
+    res = np.where(x >= 1.0, 1.0, 0.0)
+    sel = (x > 0.0) & (x < 1.0) & (p + q <= LOG_GAMMA_X_MAX_VALUE)
+    xs, ps, qs = x[sel], p[sel], q[sel]
+    log_beta = logGammaArray(ps) + logGammaArray(qs) - logGammaArray(ps + qs)
+    beta_gam = np.exp(-log_beta + ps * np.log(xs) + qs * np.log(1.0 - xs))
+    lower = xs < (ps + 1.0) / (ps + qs + 2.0)
+    r = np.empty_like(xs)
+    r[lower] = beta_gam[lower] * betaFractionArray(xs[lower], ps[lower],
+        qs[lower]) / ps[lower]
+    upper = ~lower
+    r[upper] = 1.0 - (beta_gam[upper] * betaFractionArray(1.0 - xs[upper],
+        qs[upper], ps[upper]) / qs[upper])
+    res[sel] = r
+    return res
+
+def StudentTCDFArray(degree_of_freedom, X):
+    """Array version of StudentTCDF."""
+    if np is None:
+        return _scalar_map(StudentTCDF, degree_of_freedom, X)
+    df, X = [a.astype(float) for a in np.broadcast_arrays(degree_of_freedom, X)]
+    A = 0.5 * incompleteBetaArray(df / (df + X * X), 0.5 * df, 0.5)
+    return np.where(X > 0, 1 - A, A)
+
+
+def tinv(p, degree_of_freedom, tails=2):
+    """Similar to the TINV function in Excel
+        
+        p: 1-confidence (eg. 0.05 = 95% confidence)
+        but generates two-tail value by default"""
+    
+    assert 0 <= p <= 1
+    confidence = 1 - p
+    ###AP's modification to get the right tailed distribution
+    if tails == 2:
+        return InverseStudentT(degree_of_freedom, confidence)
+    else:
+        return InverseStudentT(degree_of_freedom, (1+confidence)/2.0)
+
+
+class QuantileCache(object):
+    """Bounded, thread-safe cache of distribution quantiles, keyed on
+        (distribution, df, probability) and discarding the least recently
+        used entry when full. One instance, quantile_cache, is shared by
+        every caller in the package.
+        
+        Distributions are looked up by name in QuantileCache.functions,
+        each called as function(df, probability)."""
+    
+    functions = {'t': InverseStudentT}
+    
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.__values = OrderedDict()
+        self.__lock = threading.Lock()
+    
+    def get(self, distribution, df, probability):
+        """Return the quantile, computing and storing it if not cached."""
+        key = (distribution, df, probability)
+        with self.__lock:
+            if key in self.__values:
+                self.hits += 1
+                # move to the most recently used end
+                value = self.__values.pop(key)
+                self.__values[key] = value
+                return value
+            self.misses += 1
+        # computed outside the lock so that other threads are not held up
+        value = self.functions[distribution](df, probability)
+        self.__store(key, value)
+        return value
+    
+    def __store(self, key, value):
+        with self.__lock:
+            self.__values.pop(key, None)
+            self.__values[key] = value
+            while len(self.__values) > self.maxsize:
+                self.__values.popitem(last=False)
+    
+    def preseed(self, table=None, distribution='t', dfs=range(1, 121),
+                probabilities=(0.9, 0.95, 0.975, 0.99, 0.995, 0.9995)):
+        """Fill the cache from table, a dict {(distribution, df, probability):
+            quantile} of precomputed values, or else by computing the given
+            distribution for every combination of dfs and probabilities
+            (by default the t values for common confidence levels)."""
+        if table is None:
+            table = dict(((distribution, df, p), self.functions[distribution](df, p))
+                         for df in dfs for p in probabilities)
+        for key in table:
+            self.__store(key, table[key])
+    
+    def clear(self):
+        """Empty the cache and reset the statistics."""
+        with self.__lock:
+            self.__values.clear()
+            self.hits, self.misses = 0, 0
+    
+    def __len__(self):
+        return len(self.__values)
+    
+    def __repr__(self):
+        return ('QuantileCache: {0:d} of {1:d} entries; {2:d} hits, {3:d} misses'.
+                format(len(self), self.maxsize, self.hits, self.misses))
+
+# Shared by fieller, Hedges and stats, so batch runs reuse t quantiles
+quantile_cache = QuantileCache()
+
+def cached_tinv(p, degree_of_freedom, tails=2):
+    """tinv, through the shared quantile cache."""
+    assert 0 <= p <= 1
+    confidence = 1 - p
+    if tails != 2:
+        confidence = (1 + confidence) / 2.0
+    return quantile_cache.get('t', degree_of_freedom, confidence)
+
+#AP's addition for Hedge's calculation
+def simple_stats(r):
+    total = sum(r)
+    average = total / float(len(r))
+    sum_deviation_squared = sum([(i - average) ** 2 for i in r])
+    standard_deviation = math.sqrt(sum_deviation_squared / (len(r) - 1 or 1))
+
+    return average, standard_deviation
+
+def stats(r, confidence_interval=0.05):
+    """Returns statistics about a sequence of numbers.
+        
+        By default it computes the 95% confidence interval.
+        
+        Returns (average, median, standard deviation, min, max, confidence interval)"""
+    
+    total = sum(r)
+    average = total / float(len(r))
+    sum_deviation_squared = sum([(i - average) ** 2 for i in r])
+    standard_deviation = math.sqrt(sum_deviation_squared / (len(r) - 1 or 1))
+    s = list(r)
+    s.sort()
+    half = len(s) // 2
+    median = s[half] if len(s) % 2 else 0.5 * (s[half - 1] + s[half])
+    minimum = s[0]
+    maximum = s[-1]
+    # See: http://davidmlane.com/hyperstat/
+    # confidence_95 = 1.959963984540051 * standard_deviation / math.sqrt(len(r))
+    # We must estimate both using the t distribution:
+    # http://davidmlane.com/hyperstat/B7483.html
+    # s_m = s / sqrt(N)
+    s_m = standard_deviation / math.sqrt(len(r))
+    # Degrees of freedom = n-1
+    # t = tinv(0.05, degrees_of_freedom)
+    # confidence = +/- t * s_m
+    confidence = cached_tinv(confidence_interval, len(r) - 1) * s_m
+    return average, median, standard_deviation, minimum, maximum, confidence
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Micro-benchmark of InverseStudentT against the bisection it replaced.
+
+Run from the repository root:  PYTHONPATH=. python tests/benchmark_inverse_t.py
+"""
+
+import timeit
+
+import dcstats.statistics_EJ as s
+
+
+def bisection_inverse_t(degree_of_freedom, probability):
+    """The previous InverseStudentT: bisection on the CDF value."""
+    return s.findRoot(probability, -10 ** 4, 10 ** 4,
+        lambda x: s.StudentTCDF(degree_of_freedom, x))
+
+CASES = [(df, p) for df in (3, 10, 30, 120) for p in (0.9, 0.975, 0.995, 0.9995)]
+
+
+def run_all(function):
+    for df, p in CASES:
+        function(df, p)
+
+
+if __name__ == "__main__":
+    repeats = 20
+    for name, function in (('bisection', bisection_inverse_t),
+                           ('Halley', s.InverseStudentT)):
+        seconds = min(timeit.repeat(lambda: run_all(function), number=1,
+                                    repeat=repeats))
+        print('{0:>10}: {1:8.3f} ms per call'.format(name,
+              1000 * seconds / len(CASES)))
+    print('\n  df       P      bisection                Halley       CDF error (Halley)')
+    for df, p in CASES:
+        tb, th = bisection_inverse_t(df, p), s.InverseStudentT(df, p)
+        print('{0:4d} {1:7.4f} {2:22.16f} {3:22.16f} {4:10.2e}'.format(
+              df, p, tb, th, s.StudentTCDF(df, th) - p))
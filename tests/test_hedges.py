@@ -54,5 +54,39 @@ def test_gaussian_case_med():
 def test_gaussian_case_high():
     gaussian_case(1.0)  #expect d = 1, fail
 
+def test_bootstrap_seed():
+    random.seed(7)
+    s1 = generate_sample(50, 1, 1.0)
+    s2 = generate_sample(60, 2, 1.0)
+    h_testing = Hedges_d(s1, s2)
+    h_testing.hedges_d_unbiased()
+    first = h_testing.bootstrap_CI(2000, seed=11)
+    assert h_testing.bootstrap_CI(2000, seed=11) == first
+    assert len(h_testing.hedges_d_bs) == 2000
+    assert first[0] < h_testing.d < first[1]
 
+def test_bca_bootstrap():
+    random.seed(3)
+    s1 = [random.expovariate(1.0) for n in range(40)]
+    s2 = [random.expovariate(0.5) for n in range(30)]
+    h_testing = Hedges_d(s1, s2)
+    h_testing.hedges_d_unbiased()
+    percentile = h_testing.bootstrap_CI(4000, seed=5)
+    # BCa reuses the replicates already drawn
+    bca = h_testing.bias_corrected_bs_CI()
+    assert h_testing.bootstrap_CI(4000, bCA=True, seed=5) == bca
+    assert bca != percentile
+    assert bca[0] < h_testing.d < bca[1]
 
+def test_sketch_bootstrap():
+    random.seed(5)
+    s1 = generate_sample(30, 1, 1.0)
+    s2 = generate_sample(25, 2, 1.0)
+    h_testing = Hedges_d(s1, s2)
+    h_testing.hedges_d_unbiased()
+    exact = h_testing.bootstrap_CI(20000, seed=2)
+    sketched = h_testing.bootstrap_CI(20000, seed=2, sketch=True)
+    assert h_testing.hedges_d_bs is None
+    bound = h_testing.sketch.error_bound() * h_testing.correction
+    assert abs(exact[0] - sketched[0]) <= bound
+    assert abs(exact[1] - sketched[1]) <= bound
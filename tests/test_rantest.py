@@ -1,38 +1,404 @@
-#!/usr/bin/env python3
-# -*- coding: utf-8 -*-
-
-from dcstats.rantest import RantestBinomial
-from dcstats.rantest import RantestContinuous
-#from test_statistics import isclose
-
-def test_regression_rantest_continuos():
-    # Samples from treatment T1 and T2
-    T1 = [100, 108, 119, 127, 132, 135, 136] #, 164]
-    T2 = [122, 130, 138, 142, 152, 154, 176]
-    nran = 5000
-    rnt = RantestContinuous(T1, T2, True)    
-    rnt.run_rantest(nran)
-    assert rnt.pg1 == 1.0
-    assert (rnt.pa1 > 0.01) and (rnt.pa1 < 0.025)
-    assert (rnt.ne2 > 50) and (rnt.ne2 < 100)
-
-    rnt = RantestContinuous(T1, T2, False)
-    rnt.run_rantest(nran)    
-    assert (rnt.pg1 > 0.98) and (rnt.pg1 < 1.0)
-    assert (rnt.pa1 > 0.015) and (rnt.pa1 < 0.035)
-    assert (rnt.ne2 > 0) and (rnt.ne2 < 20)
-   
-
-def test_regression_rantest_binomial():
-    
-    ir1, if1 = 3, 4
-    ir2, if2 = 4, 5
-    nran = 5000
-    rnt = RantestBinomial(ir1, if1, ir2, if2)
-    rnt.run_rantest(nran)
-
-    assert (rnt.pg1 > 0.6) and (rnt.pg1 < 0.8)
-    assert (rnt.pl1 > 0.6) and (rnt.pl1 < 0.8)
-    assert (rnt.pe1 > 0.2) and (rnt.pe1 < 0.4)
-    assert (rnt.ne1 > 1800) and (rnt.ne1 < 2000)
- 
\ No newline at end of file
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import math
+import random
+
+from dcstats.rantest import RantestBinomial
+from dcstats.rantest import RantestContinuous
+from dcstats.rantest import RantestBinomialBatch
+from dcstats.rantest import RantestStratified
+from dcstats.rantest import RantestContingency
+from dcstats.rantest import _lattice
+from dcstats import random_streams
+from dcstats.basic_stats import TTestBinomial
+#from test_statistics import isclose
+
+def test_regression_rantest_continuos():
+    # Samples from treatment T1 and T2
+    T1 = [100, 108, 119, 127, 132, 135, 136] #, 164]
+    T2 = [122, 130, 138, 142, 152, 154, 176]
+    nran = 5000
+    rnt = RantestContinuous(T1, T2, True)    
+    rnt.run_rantest(nran, exact=False)
+    assert rnt.pg1 == 1.0
+    assert (rnt.pa1 > 0.01) and (rnt.pa1 < 0.025)
+    assert (rnt.ne2 > 50) and (rnt.ne2 < 100)
+
+    rnt = RantestContinuous(T1, T2, False)
+    rnt.run_rantest(nran, exact=False)
+    assert (rnt.pg1 > 0.98) and (rnt.pg1 < 1.0)
+    assert (rnt.pa1 > 0.015) and (rnt.pa1 < 0.035)
+    assert (rnt.ne2 > 0) and (rnt.ne2 < 20)
+   
+
+def test_regression_rantest_binomial():
+    
+    ir1, if1 = 3, 4
+    ir2, if2 = 4, 5
+    nran = 5000
+    rnt = RantestBinomial(ir1, if1, ir2, if2)
+    rnt.run_rantest(nran)
+
+    assert (rnt.pg1 > 0.6) and (rnt.pg1 < 0.8)
+    assert (rnt.pl1 > 0.6) and (rnt.pl1 < 0.8)
+    assert (rnt.pe1 > 0.2) and (rnt.pe1 < 0.4)
+    assert (rnt.ne1 > 1800) and (rnt.ne1 < 2000)
+ 
+def test_rantest_continuous_without_numpy(monkeypatch):
+    # the pure Python loops must give the same answers as the batched engine
+    import dcstats.rantest as rantest
+    monkeypatch.setattr(rantest, 'np', None)
+    monkeypatch.setattr(random_streams, 'np', None)
+    random.seed(1)
+    T1 = [100, 108, 119, 127, 132, 135, 136]
+    T2 = [122, 130, 138, 142, 152, 154, 176]
+    rnt = RantestContinuous(T1, T2, False)
+    rnt.run_rantest(5000, exact=False)
+    assert (rnt.pg1 > 0.98) and (rnt.pg1 < 1.0)
+    assert (rnt.pa1 > 0.015) and (rnt.pa1 < 0.035)
+    assert (rnt.ne2 > 0) and (rnt.ne2 < 20)
+    assert len(rnt.randiff) == 5000
+
+def test_rantest_paired_without_numpy(monkeypatch):
+    import dcstats.rantest as rantest
+    monkeypatch.setattr(rantest, 'np', None)
+    monkeypatch.setattr(random_streams, 'np', None)
+    random.seed(1)
+    T1 = [100, 108, 119, 127, 132, 135, 136]
+    T2 = [122, 130, 138, 142, 152, 154, 176]
+    rnt = RantestContinuous(T1, T2, True)
+    rnt.run_rantest(5000, exact=False)
+    assert rnt.pg1 == 1.0
+    assert (rnt.pa1 > 0.01) and (rnt.pa1 < 0.025)
+    assert (rnt.ne2 > 50) and (rnt.ne2 < 100)
+
+def test_exact_paired_rantest():
+    # 2**7 = 128 sign assignments are fewer than nran, so the test is exact
+    T1 = [100, 108, 119, 127, 132, 135, 136]
+    T2 = [122, 130, 138, 142, 152, 154, 176]
+    rnt = RantestContinuous(T1, T2, True)
+    rnt.run_rantest(5000)
+    assert rnt.exact and rnt.nran == 128
+    assert rnt.pg1 == 1.0
+    assert rnt.pa1 == 2.0 / 128
+    assert (rnt.ne1, rnt.ne2) == (1, 2)
+    assert len(rnt.randiff) == 128
+
+    # without randiff the sums stream past the counts and the histogram
+    counts = RantestContinuous(T1, T2, True)
+    counts.run_rantest(5000, keep_randiff=False, hist_bins=8)
+    assert counts.exact and sum(counts.hist) == 128 and counts.randiff == []
+    assert (counts.ne1, counts.ne2, counts.na1) == (1, 2, 2)
+
+    # meet-in-the-middle counting gives the same answer
+    split = RantestContinuous(T1, T2, True)
+    split.run_rantest(10, exact=True)
+    assert split.nran == 128
+    assert (split.ng1, split.nl1, split.ne1, split.na1, split.ne2) == \
+        (rnt.ng1, rnt.nl1, rnt.ne1, rnt.na1, rnt.ne2)
+
+def test_paired_rantest_ties():
+    # 0.1-step differences: randomised means are summed in another order
+    # than the observed mean, but ties must still count as ties
+    X = [0.7, 1.6, 1.1, 1.8, 1.9, 0.2, 0.0, 2.5, 0.8]
+    Y = [0.7, 3.0, 1.4, 2.5, 1.4, 1.9, 0.5, 1.9, 2.6]
+    exact = RantestContinuous(X, Y, True)
+    exact.run_rantest(10, exact=True)
+    assert (exact.pe1, exact.pe2) == (1.0 / 128, 2.0 / 128)
+    rnt = RantestContinuous(X, Y, True)
+    rnt.run_rantest(20000, exact=False, seed=1)
+    assert math.fabs(rnt.pe1 - exact.pe1) < 0.002
+    assert math.fabs(rnt.pe2 - exact.pe2) < 0.003
+    assert math.fabs(rnt.pa1 - exact.pa1) < 0.01
+
+def test_exact_unpaired_rantest():
+    # C(14, 7) = 3432 allocations are fewer than nran, so without randiff
+    # the test is exact
+    T1 = [100, 108, 119, 127, 132, 135, 136]
+    T2 = [122, 130, 138, 142, 152, 154, 176]
+    rnt = RantestContinuous(T1, T2, False)
+    rnt.run_rantest(5000)
+    assert not rnt.exact and len(rnt.randiff) == 5000
+    rnt.run_rantest(5000, keep_randiff=False)
+    assert rnt.exact and rnt.nran == 3432
+    assert (rnt.ng1, rnt.ne1, rnt.na1, rnt.ne2) == (3400, 4, 72, 8)
+    assert rnt.nl1 == 36
+
+    # the same data at high resolution far from zero: only ties count as ties
+    rnt = RantestContinuous([50 + 1e-7 * t for t in T1], [50 + 1e-7 * t for t in T2], False)
+    rnt.run_rantest(10, exact=True)
+    assert (rnt.ng1, rnt.ne1, rnt.na1, rnt.ne2, rnt.nl1) == (3400, 4, 72, 8, 36)
+
+def test_unpaired_rantest_ties(monkeypatch):
+    # 0.1-step samples: the NumPy and pure Python engines sum the groups in
+    # different orders, and both must count the same ties as the exact test
+    import dcstats.rantest as rantest
+    X = [0.7, 1.6, 1.1, 1.8, 1.9, 0.2, 0.0, 2.5]
+    Y = [0.7, 3.0, 1.4, 2.5, 1.4, 1.9, 0.5, 1.9]
+    exact = RantestContinuous(X, Y, False)
+    exact.run_rantest(10, exact=True)
+    assert (exact.ne1, exact.ne2) == (142, 284)
+    rnt = RantestContinuous(X, Y, False)
+    rnt.run_rantest(20000, exact=False, seed=1)
+    monkeypatch.setattr(rantest, 'np', None)
+    monkeypatch.setattr(random_streams, 'np', None)
+    slow = RantestContinuous(X, Y, False)
+    slow.run_rantest(20000, exact=False, seed=1)
+    for r in (rnt, slow):
+        assert math.fabs(r.pe1 - exact.pe1) < 0.002
+        assert math.fabs(r.pe2 - exact.pe2) < 0.003
+    assert math.fabs(rnt.pe1 - slow.pe1) < 0.003
+    assert math.fabs(rnt.pe2 - slow.pe2) < 0.004
+
+def test_shift_algorithm_rantest():
+    # integer data: the shift algorithm must reproduce the enumerated counts
+    T1 = [100, 108, 119, 127, 132, 135, 136]
+    T2 = [122, 130, 138, 142, 152, 154, 176]
+    for paired in (True, False):
+        ref = RantestContinuous(T1, T2, paired)
+        ref.run_rantest(5000, keep_randiff=False)
+        rnt = RantestContinuous(T1, T2, paired)
+        rnt.run_rantest(5000, step=1)
+        assert rnt.exact and rnt.nran == ref.nran
+        assert (rnt.ng1, rnt.nl1, rnt.ne1, rnt.na1, rnt.ne2) == \
+            (ref.ng1, ref.nl1, ref.ne1, ref.na1, ref.ne2)
+        assert sum(c for dran, c in rnt.exact_dist) == rnt.nran
+
+    # 0.1 steps are detected; far too many allocations to enumerate
+    X = [0.1 * (i % 7) for i in range(40)]
+    Y = [0.1 * (i % 5) + 0.2 for i in range(40)]
+    rnt = RantestContinuous(X, Y, False)
+    rnt.run_rantest(10, exact=True)
+    assert rnt.exact and rnt.nran == 107507208733336176461620
+    assert rnt.ne1 > 0
+
+    # spreads far below the finest step are not mistaken for a lattice
+    assert _lattice([3e-7, 1e-7, 2.5e-7]) is None
+    assert _lattice([5.0000001 - 5, 5.0000002 - 5]) is None
+    # decimal data with rounding noise still are
+    assert _lattice([1.3 - 1.0, 0.5 - 0.2, 0.1]) == ([3, 3, 1], 0.1)
+    rnt = RantestContinuous([0, 10 ** 8, 3], [1, 3, 5], False)
+    try:
+        rnt.run_rantest(10, step=1)
+        assert False, 'shift table too large'
+    except ValueError:
+        pass
+
+def test_rantest_counts_only():
+    T1 = [100, 108, 119, 127, 132, 135, 136]
+    T2 = [122, 130, 138, 142, 152, 154, 176]
+    rnt = RantestContinuous(T1, T2, False)
+    rnt.run_rantest(5000, exact=False, keep_randiff=False, hist_bins=20, seed=1)
+    assert rnt.randiff == []
+    assert len(rnt.hist) == 20 and sum(rnt.hist) == 5000
+    assert (rnt.pa1 > 0.015) and (rnt.pa1 < 0.035)
+
+    rnt = RantestBinomial(3, 4, 4, 5)
+    rnt.run_rantest(5000, keep_randiff=False, seed=1)
+    assert rnt.randiff == [] and rnt.randis1 == []
+    assert sum(rnt.r1dist) == 5000
+    assert rnt.ne1 == rnt.r1dist[3]
+    assert (rnt.ne1 > 1800) and (rnt.ne1 < 2000)
+
+def test_rantest_seeded_workers():
+    # a seed gives the same answer however many processes share the work
+    T1 = [100, 108, 119, 127, 132, 135, 136]
+    T2 = [122, 130, 138, 142, 152, 154, 176]
+    results = []
+    for workers in (None, 2):
+        rnt = RantestContinuous(T1, T2, False)
+        rnt.run_rantest(100000, exact=False, workers=workers, seed=2009)
+        results.append((rnt.ng1, rnt.ne1, rnt.nl1, rnt.na1, rnt.ne2, rnt.randiff))
+    assert results[0] == results[1]
+
+    results = []
+    for workers in (None, 2):
+        rnt = RantestBinomial(3, 4, 4, 5)
+        rnt.run_rantest(100000, workers=workers, seed=2009)
+        results.append((rnt.r1dist, rnt.randis1))
+    assert results[0] == results[1]
+
+def test_sequential_rantest():
+    # clearly non-significant: stops at the 10th exceedance
+    rnt = RantestBinomial(3, 4, 4, 5)
+    rnt.run_rantest(100000, h=10, seed=1)
+    assert rnt.nran < 100
+    assert rnt.pseq == 10.0 / rnt.nran
+
+    # significant: never reaches h, so all randomisations are done
+    T1 = [100, 108, 119, 127, 132, 135, 136]
+    T2 = [122, 130, 138, 142, 152, 154, 176]
+    rnt = RantestContinuous(T1, T2, True)
+    rnt.run_rantest(2000, exact=False, h=100, seed=1)
+    assert rnt.nran == 2000
+    assert rnt.pseq == (rnt.na1 + 1) / 2001.0
+
+    # non-significance at alpha = 0.05 is settled long before 10**6
+    rnt = RantestBinomial(3, 4, 4, 5)
+    rnt.run_rantest(10 ** 6, alpha=0.05, seed=1, keep_randiff=False)
+    assert rnt.nran < 10 ** 5
+    assert rnt.pseq > 0.05
+
+    # every randomisation is as extreme: stops at the first h with h / nran > alpha
+    rnt = RantestContinuous(T1, T1, True)
+    rnt.run_rantest(1000, exact=False, alpha=0.05, seed=1)
+    assert rnt.nran == 51 and rnt.pseq == 1.0
+
+def test_adaptive_rantest():
+    T1 = [100, 108, 119, 127, 132, 135, 136]
+    T2 = [122, 130, 138, 142, 152, 154, 176]
+    rnt = RantestContinuous(T1, T2, False)
+    rnt.run_rantest(10 ** 7, exact=False, se=0.002, seed=1, keep_randiff=False)
+    assert rnt.nran < 10 ** 5
+    assert (rnt.pa1 * (1 - rnt.pa1) / rnt.nran) ** 0.5 <= 0.002
+    assert rnt.pa1_ci[0] < rnt.pa1 < rnt.pa1_ci[1]
+
+    rnt = RantestBinomial(3, 4, 4, 5)
+    rnt.run_rantest(10 ** 7, ci_width=0.05, seed=1, keep_randiff=False)
+    # r1 = 3 is below its expected value, so pl1 is the P being refined
+    assert rnt.pl1_ci[1] - rnt.pl1_ci[0] <= 0.05
+
+def test_extend_rantest():
+    T1 = [100, 108, 119, 127, 132, 135, 136]
+    T2 = [122, 130, 138, 142, 152, 154, 176]
+    rnt = RantestContinuous(T1, T2, False)
+    rnt.run_rantest(5000, exact=False)
+    na1 = rnt.na1
+    rnt.run_rantest(20000, extend=True)
+    assert rnt.nran == 20000
+    assert len(rnt.randiff) == 20000
+    assert rnt.na1 >= na1
+
+    # a seeded run topped up in steps matches one run of the same total
+    once = RantestContinuous(T1, T2, False)
+    once.run_rantest(200000, exact=False, seed=1, keep_randiff=False)
+    steps = RantestContinuous(T1, T2, False)
+    steps.run_rantest(2 ** 16, exact=False, seed=1, keep_randiff=False)
+    steps.run_rantest(200000, extend=True)
+    assert (steps.ng1, steps.nl1, steps.na1) == (once.ng1, once.nl1, once.na1)
+
+    rnt = RantestBinomial(3, 4, 4, 5)
+    rnt.run_rantest(5000)
+    rnt.run_rantest(10000, extend=True)
+    assert sum(rnt.r1dist) == 10000
+
+    # a sequential run is not silently restarted
+    binomial = RantestBinomial(3, 4, 4, 5)
+    binomial.run_rantest(100000, h=5, seed=1)
+    continuous = RantestContinuous(T1, T2, False)
+    continuous.run_rantest(100000, exact=False, h=5, seed=1)
+    for rnt in (binomial, continuous):
+        try:
+            rnt.run_rantest(20000, extend=True)
+            assert False, 'sequential run extended'
+        except ValueError:
+            pass
+
+def test_chunk_tasks_without_counts(monkeypatch):
+    # chunks of an extended run are not sent the randiff accumulated so far
+    from dcstats import rantest
+    T1 = [100, 108, 119, 127, 132, 135, 136]
+    T2 = [122, 130, 138, 142, 152, 154, 176]
+    rnt = RantestContinuous(T1, T2, False)
+    rnt.run_rantest(5000, exact=False, seed=1, hist_bins=10)
+    run_chunk = rantest._rantest_chunk
+    def check_task(task):
+        assert task[0].randiff == [] and sum(task[0].hist) == 0
+        return run_chunk(task)
+    monkeypatch.setattr(rantest, '_rantest_chunk', check_task)
+    rnt.run_rantest(150000, extend=True)
+    assert len(rnt.randiff) == 150000 and sum(rnt.hist) == 150000
+
+def test_rantest_binomial_large_table(monkeypatch):
+    # r1 is drawn from its hypergeometric distribution, so large tables
+    # cost no more per randomisation than small ones
+    import dcstats.rantest as rantest
+    rnt = RantestBinomial(1500, 2500, 1600, 2400)
+    rnt.run_rantest(20000, seed=1)
+    assert len(rnt.r1dist) == 4001
+    assert sum(rnt.r1dist) == 20000
+    assert 0.005 < rnt.pl1 < 0.02
+
+    monkeypatch.setattr(rantest, 'np', None)
+    monkeypatch.setattr(random_streams, 'np', None)
+    random.seed(1)
+    rnt = RantestBinomial(3, 4, 4, 5)
+    rnt.run_rantest(5000)
+    assert (rnt.pe1 > 0.35) and (rnt.pe1 < 0.42)
+    assert rnt.ng1 + rnt.nl1 - rnt.ne1 == 5000
+
+def test_exact_binomial_rantest():
+    rnt = RantestBinomial(3, 4, 4, 5)
+    rnt.run_rantest(5000, exact=True)
+    assert rnt.nran == 11440
+    # P(r1 = 3) = C(7, 3) C(9, 4) / C(16, 7)
+    assert math.fabs(rnt.pe1 - 35 * 126 / 11440.0) < 1e-12
+    assert math.fabs(rnt.pg1 - 8170 / 11440.0) < 1e-12
+    assert math.fabs(rnt.pl1 - 7680 / 11440.0) < 1e-12
+    assert math.fabs(sum(rnt.r1prob) - 1) < 1e-12
+    rnt.run_rantest(10000, extend=True)
+    assert rnt.nran == 11440
+
+def test_binomial_batch():
+    tables = [(3, 4, 4, 5), (4, 3, 3, 6), (10, 2, 3, 9), (3, 4, 4, 5)]
+    batch = RantestBinomialBatch(tables)
+    batch.run_rantest(5000, exact=True)
+    # the first, second and fourth tables share their margins
+    assert batch.ngroups == 2
+    for i, table in enumerate(tables):
+        ttb = TTestBinomial(*table)
+        rnt = RantestBinomial(*table)
+        rnt.run_rantest(5000, exact=True)
+        assert math.fabs(batch.tval[i] - ttb.tval) < 1e-12
+        assert math.fabs(batch.P[i] - ttb.P) < 1e-12
+        assert math.fabs(batch.pg1[i] - rnt.pg1) < 1e-12
+        assert math.fabs(batch.pl1[i] - rnt.pl1) < 1e-12
+        assert math.fabs(batch.pe1[i] - rnt.pe1) < 1e-12
+
+    batch.run_rantest(5000, seed=1)
+    assert batch.pg1[0] == batch.pg1[3]
+    assert (batch.pe1[0] > 0.35) and (batch.pe1[0] < 0.42)
+
+def test_stratified_rantest(monkeypatch):
+    # one stratum is the ordinary exact test
+    strat = RantestStratified([(3, 4, 4, 5)])
+    strat.run_rantest(5000, exact=True)
+    rnt = RantestBinomial(3, 4, 4, 5)
+    rnt.run_rantest(5000, exact=True)
+    assert math.fabs(strat.pg1 - rnt.pg1) < 1e-12
+    assert math.fabs(strat.pl1 - rnt.pl1) < 1e-12
+
+    tables = [(3, 4, 4, 5), (4, 3, 3, 6), (10, 2, 3, 9)]
+    strat = RantestStratified(tables)
+    assert strat.robs == 17
+    strat.run_rantest(5000)
+    assert strat.exact
+    pg1 = strat.pg1
+    strat.run_rantest(100000, exact=False, seed=1)
+    assert math.fabs(strat.pg1 - pg1) < 0.003
+    assert sum(strat.rdist) == 100000
+
+    import dcstats.rantest as rantest
+    monkeypatch.setattr(rantest, 'np', None)
+    monkeypatch.setattr(random_streams, 'np', None)
+    strat = RantestStratified(tables)
+    strat.run_rantest(5000, exact=True)
+    assert math.fabs(strat.pg1 - pg1) < 1e-12
+
+def test_contingency_rantest():
+    # for a 2x2 table chi-square grows with |r1 - E(r1)|, so P is the sum of
+    # the exact probabilities of r1 at least as far from expectation
+    rnt = RantestBinomial(10, 2, 3, 9)
+    rnt.run_rantest(5000, exact=True)
+    expected = 12 * 13 / 24.0
+    P = sum(p for r1, p in enumerate(rnt.r1prob)
+        if math.fabs(r1 - expected) >= 10 - expected)
+    for statistic in ('chi2', 'lr'):
+        cont = RantestContingency([[10, 2], [3, 9]], statistic)
+        cont.run_rantest(200000, seed=1)
+        assert math.fabs(cont.pg1 - P) < 0.002
+
+    cont = RantestContingency([[30, 12, 5], [28, 18, 9], [25, 14, 10]])
+    cont.run_rantest(20000, seed=1)
+    assert 0.55 < cont.pg1 < 0.62
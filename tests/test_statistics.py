@@ -1,70 +1,194 @@
-#!/usr/bin/env python3
-# -*- coding: utf-8 -*-
-from math import sqrt, fabs
-
-import dcstats.statistics_EJ as s
-from dcstats.basic_stats import mean, sd, sdm, ttestPDF
-
-def isclose(a, b, rel_tol=1e-09, abs_tol=0.0):
-    return abs(a-b) <= max(rel_tol * max(abs(a), abs(b)), abs_tol)
-
-
-def test_beta_incomplete():
-    
-    bi = s.incompleteBeta(0.5, 1, 2)
-    assert isclose(0.75, bi, rel_tol=0.0001)
-    
-    try:
-        from scipy.special import betainc
-        spbi = betainc(1, 2, 0.5)
-        assert isclose(spbi, bi, rel_tol=0.0001)
-    except:
-        print('scipy not available')
-    
-def test_mean():
-    X = [1, 2, 3]
-    assert mean(X) == 2
-    
-def test_sd():
-    X = [1, 2, 3]    
-    assert isclose(sd(X), 1.0, rel_tol=0.0001)
-    
-def test_sdm():
-    X = [1, 2, 3]    
-    print(sdm(X))
-    assert isclose(sdm(X), 0.57735026918963, rel_tol=0.000001)
-    
-def test_ttest_P_paired():
-    D = [1, 2, 3]
-    df = len(D) - 1
-    dbar, dsdm = mean(D), sdm(D)
-    print(dbar, dsdm)
-    tval = dbar / dsdm
-    print(tval)
-    assert isclose(tval, 3.464101615137754, rel_tol=0.0000001)
-    
-    P = ttestPDF(tval, df)
-    print(P)
-    assert isclose(P, 0.07417990022744862, rel_tol=0.0000001)
-
-def test_ttest_P_unpaired():
-    X = [1, 2, 3]
-    Y = [1, 4, 6]
-    df = len(X) + len(Y) - 2
-    
-    xbar, sdx = mean(X), sd(X)
-    ybar, sdy = mean(Y), sd(Y)
-    s = (sdx * sdx * (len(X)-1) + sdy * sdy * (len(Y)-1)) / df
-    sdiff = sqrt(s * (1.0 / len(X) + 1.0 / len(Y)))
-    adiff = fabs(xbar - ybar)
-    
-    print(sdiff, adiff)
-    tval = sdiff / adiff
-    print(tval)
-    assert isclose(tval, 0.9380831519646861, rel_tol=0.0000001)
-    
-    P = ttestPDF(tval, df)
-    print(P)
-    assert isclose(P, 0.40131270580971734, rel_tol=0.0000001)
-    
-    
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+from math import sqrt, fabs, log, pi
+
+import dcstats.statistics_EJ as s
+from dcstats.basic_stats import mean, sd, sdm, ttestPDF, variance, RunningStats
+from dcstats.basic_stats import order_statistics, QuantileSketch
+
+def isclose(a, b, rel_tol=1e-09, abs_tol=0.0):
+    return abs(a-b) <= max(rel_tol * max(abs(a), abs(b)), abs_tol)
+
+
+def test_beta_incomplete():
+    
+    bi = s.incompleteBeta(0.5, 1, 2)
+    assert isclose(0.75, bi, rel_tol=0.0001)
+    
+    try:
+        from scipy.special import betainc
+        spbi = betainc(1, 2, 0.5)
+        assert isclose(spbi, bi, rel_tol=0.0001)
+    except:
+        print('scipy not available')
+    
+def test_mean():
+    X = [1, 2, 3]
+    assert mean(X) == 2
+    
+def test_sd():
+    X = [1, 2, 3]    
+    assert isclose(sd(X), 1.0, rel_tol=0.0001)
+    
+def test_sdm():
+    X = [1, 2, 3]    
+    print(sdm(X))
+    assert isclose(sdm(X), 0.57735026918963, rel_tol=0.000001)
+    
+def test_ttest_P_paired():
+    D = [1, 2, 3]
+    df = len(D) - 1
+    dbar, dsdm = mean(D), sdm(D)
+    print(dbar, dsdm)
+    tval = dbar / dsdm
+    print(tval)
+    assert isclose(tval, 3.464101615137754, rel_tol=0.0000001)
+    
+    P = ttestPDF(tval, df)
+    print(P)
+    assert isclose(P, 0.07417990022744862, rel_tol=0.0000001)
+
+def test_ttest_P_unpaired():
+    X = [1, 2, 3]
+    Y = [1, 4, 6]
+    df = len(X) + len(Y) - 2
+    
+    xbar, sdx = mean(X), sd(X)
+    ybar, sdy = mean(Y), sd(Y)
+    s = (sdx * sdx * (len(X)-1) + sdy * sdy * (len(Y)-1)) / df
+    sdiff = sqrt(s * (1.0 / len(X) + 1.0 / len(Y)))
+    adiff = fabs(xbar - ybar)
+    
+    print(sdiff, adiff)
+    tval = sdiff / adiff
+    print(tval)
+    assert isclose(tval, 0.9380831519646861, rel_tol=0.0000001)
+    
+    P = ttestPDF(tval, df)
+    print(P)
+    assert isclose(P, 0.40131270580971734, rel_tol=0.0000001)
+    
+    
+
+def test_clopper_pearson():
+    lower, upper = s.clopper_pearson(5, 100)
+    assert isclose(lower, 0.016431879, rel_tol=0.000001)
+    assert isclose(upper, 0.112834911, rel_tol=0.000001)
+    assert s.clopper_pearson(0, 10)[0] == 0.0
+    assert s.clopper_pearson(10, 10)[1] == 1.0
+
+def test_inverse_t():
+    # two-tail 5% points from tables
+    assert isclose(s.InverseStudentT(1, 0.975), 12.706204736174707, rel_tol=1e-12)
+    assert isclose(s.InverseStudentT(3, 0.975), 3.182446305284263, rel_tol=1e-12)
+    assert isclose(s.InverseStudentT(10, 0.975), 2.228138851986274, rel_tol=1e-12)
+    assert isclose(s.InverseStudentT(10, 0.025), -2.228138851986274, rel_tol=1e-12)
+    for df in (2, 5, 30, 1000):
+        for P in (1e-12, 0.001, 0.3, 0.8, 0.999):
+            t = s.InverseStudentT(df, P)
+            tail = min(P, 1 - P)
+            cdf = s.StudentTCDF(df, t)
+            assert isclose(min(cdf, 1 - cdf), tail, rel_tol=1e-10)
+
+def test_inverse_normal():
+    assert isclose(s.InverseNormal(0.975), 1.959963984540054, rel_tol=1e-14)
+    assert s.InverseNormal(0.5) == 0.0
+    for P in (1e-12, 0.001, 0.3, 0.8, 0.999):
+        x = s.InverseNormal(P)
+        cdf = s.NormalCDF(x)
+        assert isclose(min(cdf, 1 - cdf), min(P, 1 - P), rel_tol=1e-12)
+
+def test_log_gamma_table():
+    assert isclose(s.logGamma(0.5), 0.5 * log(pi), rel_tol=1e-15)
+    assert s.logGamma(1) == 0.0
+    assert isclose(s.logGamma(10), log(362880), rel_tol=1e-15)
+    # the recurrence and the rational approximations agree where they meet
+    assert isclose(s.logGamma(s.LOG_GAMMA_TABLE_MAX),
+                   s.logGamma(s.LOG_GAMMA_TABLE_MAX + 1) - log(s.LOG_GAMMA_TABLE_MAX),
+                   rel_tol=1e-14)
+    assert isclose(s.logGamma(100.5) - s.logGamma(99.5), log(99.5), rel_tol=1e-13)
+
+def test_array_versions():
+    xs = [0.1, 0.5, 0.9, 0.999]
+    ps = [0.5, 2.0, 30.0, 150.0]
+    qs = [0.5, 3.0, 0.5, 7.5]
+    ib = s.incompleteBetaArray(xs, ps, qs)
+    lg = s.logGammaArray(ps + qs)
+    for i in range(len(xs)):
+        assert isclose(ib[i], s.incompleteBeta(xs[i], ps[i], qs[i]), rel_tol=1e-14)
+        assert isclose(lg[i], s.logGamma(ps[i]), rel_tol=1e-14)
+        assert isclose(lg[i + 4], s.logGamma(qs[i]), rel_tol=1e-14)
+    
+    dfs = [1, 4, 9, 100]
+    ts = [-3.0, 0.2, 2.262, 1.984]
+    cdf = s.StudentTCDFArray(dfs, ts)
+    for i in range(len(dfs)):
+        assert isclose(cdf[i], s.StudentTCDF(dfs[i], ts[i]), rel_tol=1e-14)
+
+def test_quantile_cache():
+    cache = s.QuantileCache(maxsize=2)
+    t10 = cache.get('t', 10, 0.975)
+    assert t10 == s.InverseStudentT(10, 0.975)
+    assert cache.get('t', 10, 0.975) == t10
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.get('t', 20, 0.975)
+    cache.get('t', 10, 0.975)
+    cache.get('t', 30, 0.975)    # evicts df = 20, the least recently used
+    assert len(cache) == 2
+    cache.get('t', 20, 0.975)
+    assert (cache.hits, cache.misses) == (2, 4)
+    
+    cache = s.QuantileCache()
+    cache.preseed({('t', 5, 0.9): 1.476})
+    assert cache.get('t', 5, 0.9) == 1.476
+    cache.preseed(dfs=[3], probabilities=[0.975])
+    assert isclose(cache.get('t', 3, 0.975), 3.182446305284263)
+    assert cache.misses == 0
+
+def test_running_stats():
+    X = [1e9 + x for x in (4.0, 7.0, 13.0, 16.0, 2.5, 8.5, 11.0)]
+    whole = RunningStats(X)
+    one_by_one = RunningStats()
+    for x in X:
+        one_by_one.add(x)
+    merged = RunningStats(X[:3])
+    merged.merge(RunningStats(X[3:]))
+    for summary in (whole, one_by_one, merged):
+        assert summary.n == 7
+        assert isclose(summary.mean, sum(X) / 7.0, rel_tol=1e-15)
+        assert isclose(summary.variance, variance(X), rel_tol=1e-9)
+        assert (summary.min, summary.max) == (min(X), max(X))
+
+def test_stats_median():
+    assert s.stats([3, 1, 2])[1] == 2
+    assert s.stats([4, 3, 1, 2])[1] == 2.5
+
+def test_order_statistics():
+    X = [5.0, 1.0, 4.0, 2.0, 3.0, 9.0, 0.5, 7.0]
+    assert order_statistics(X, [0.0, 0.5, 0.99, 1.0]) == [0.5, 4.0, 9.0, 9.0]
+
+def test_quantile_sketch():
+    X = [((i * 7919) % 10007) / 100.0 for i in range(20000)]
+    exact = order_statistics(X, [0.025, 0.5, 0.975])
+    sketch = QuantileSketch(nbins=256)
+    for start in range(0, len(X), 1000):
+        sketch.extend(X[start:start + 1000])
+    assert sketch.n == len(X) and 0 < sketch.error_bound() < 1
+    for fraction, value in zip([0.025, 0.5, 0.975], exact):
+        assert abs(sketch.quantile(fraction) - value) <= sketch.error_bound()
+    # exact until the bins are needed
+    assert QuantileSketch([3.0, 1.0, 2.0]).quantile(0.5) == 2.0
+
+def test_log_gamma_table_threads():
+    import threading
+    expected = [s.logGamma(0.5 * k) for k in range(1, 2 * s.LOG_GAMMA_TABLE_MAX + 1)]
+    del s._log_gamma_halves[3:]
+    def grow(step):
+        for k in range(step, 2 * s.LOG_GAMMA_TABLE_MAX + 1, step):
+            s.logGamma(0.5 * k)
+    threads = [threading.Thread(target=grow, args=(step,)) for step in (1, 2, 3, 7)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert s._log_gamma_halves[1:] == expected
@@ -1,43 +1,97 @@
-#!/usr/bin/env python3
-# -*- coding: utf-8 -*-
-from math import sqrt, fabs
-
-from test_statistics import isclose
-from dcstats.basic_stats import ttest_independent, ttest_paired
-from dcstats.basic_stats import TTestBinomial, TTestContinuous
-    
-def test_ttest_P_paired():
-    X = [2, 4, 6]
-    Y = [1, 2, 3]
-    tval, P, df = ttest_paired(X, Y)
-    assert isclose(tval, 3.464101615137754, rel_tol=0.0000001)
-    assert isclose(P, 0.07417990022744862, rel_tol=0.0000001)
-
-def test_ttest_P_unpaired():
-    X = [1, 2, 3]
-    Y = [1, 4, 6]
-    tval, P, df = ttest_independent(X, Y)
-    assert isclose(tval, -1.06600358178, rel_tol=0.0000001)
-    assert isclose(P, 0.346490370194, rel_tol=0.0000001)
-    
-def test_regression_ttest_binomial():
-    
-    ir1, if1 = 3, 4
-    ir2, if2 = 4, 5
-    ttb = TTestBinomial(ir1, if1, ir2, if2)
-    
-    assert isclose(ttb.p1, 0.428571, rel_tol=0.0001)
-    assert isclose(ttb.p2, 0.444444, rel_tol=0.0001)
-    assert isclose(ttb.sd1, 0.187044, rel_tol=0.0001)
-    assert isclose(ttb.sd2, 0.165635, rel_tol=0.0001)
-    assert isclose(ttb.tval, 0.063492, rel_tol=0.0001)
-    assert isclose(ttb.P, 0.949375, rel_tol=0.0001)
-
-def test_regression_ttest_continuos():
-    # Samples from treatment T1 and T2
-    T1 = [100, 108, 119, 127, 132, 135, 136] #, 164]
-    T2 = [122, 130, 138, 142, 152, 154, 176]
-    are_paired = True
-    ttc = TTestContinuous(T1, T2, are_paired)
-    assert isclose(ttc.tval, -7.325473, rel_tol=0.000001)
-    assert isclose(ttc.P, 0.000331, rel_tol=0.01)
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+from math import sqrt, fabs
+
+from test_statistics import isclose
+from dcstats.basic_stats import ttest_independent, ttest_paired
+from dcstats.basic_stats import TTestBinomial, TTestContinuous, TTestColumns
+    
+def test_ttest_P_paired():
+    X = [2, 4, 6]
+    Y = [1, 2, 3]
+    tval, P, df = ttest_paired(X, Y)
+    assert isclose(tval, 3.464101615137754, rel_tol=0.0000001)
+    assert isclose(P, 0.07417990022744862, rel_tol=0.0000001)
+
+def test_ttest_P_unpaired():
+    X = [1, 2, 3]
+    Y = [1, 4, 6]
+    tval, P, df = ttest_independent(X, Y)
+    assert isclose(tval, -1.06600358178, rel_tol=0.0000001)
+    assert isclose(P, 0.346490370194, rel_tol=0.0000001)
+    
+def test_regression_ttest_binomial():
+    
+    ir1, if1 = 3, 4
+    ir2, if2 = 4, 5
+    ttb = TTestBinomial(ir1, if1, ir2, if2)
+    
+    assert isclose(ttb.p1, 0.428571, rel_tol=0.0001)
+    assert isclose(ttb.p2, 0.444444, rel_tol=0.0001)
+    assert isclose(ttb.sd1, 0.187044, rel_tol=0.0001)
+    assert isclose(ttb.sd2, 0.165635, rel_tol=0.0001)
+    assert isclose(ttb.tval, 0.063492, rel_tol=0.0001)
+    assert isclose(ttb.P, 0.949375, rel_tol=0.0001)
+
+def test_regression_ttest_continuos():
+    # Samples from treatment T1 and T2
+    T1 = [100, 108, 119, 127, 132, 135, 136] #, 164]
+    T2 = [122, 130, 138, 142, 152, 154, 176]
+    are_paired = True
+    ttc = TTestContinuous(T1, T2, are_paired)
+    assert isclose(ttc.tval, -7.325473, rel_tol=0.000001)
+    assert isclose(ttc.P, 0.000331, rel_tol=0.01)
+
+def test_sample_summary():
+    from dcstats.basic_stats import SampleSummary, mean, sd, sdm
+    T1 = [100, 108, 119, 127, 132, 135, 136]
+    T2 = [122, 130, 138, 142, 152, 154, 176]
+    sx, sy = SampleSummary(T1), SampleSummary(T2)
+    assert (sx.n, sx.sum, sx.sumsq) == (7, 857, sum(x * x for x in T1))
+    assert isclose(sx.mean, mean(T1), rel_tol=1e-15)
+    assert isclose(sx.sd, sd(T1), rel_tol=1e-12)
+    assert isclose(sx.sdm, sdm(T1), rel_tol=1e-12)
+    # a RunningStats that keeps its observations in step
+    sx.extend(T2)
+    assert list(sx) == T1 + T2 and sx.sum == sum(T1 + T2)
+    assert isclose(sx.variance, sd(T1 + T2) ** 2, rel_tol=1e-12)
+    sx = SampleSummary(T1)
+    for are_paired in (True, False):
+        from_lists = TTestContinuous(T1, T2, are_paired)
+        from_summaries = TTestContinuous(sx, sy, are_paired)
+        assert from_summaries.tval == from_lists.tval
+        assert from_summaries.P == from_lists.P
+    # samples of different sizes can only be compared unpaired
+    ttc = TTestContinuous(T1, T2[:5], True)
+    assert not ttc.are_paired
+    assert isclose(ttc.dbar, fabs(mean(T1) - mean(T2[:5])))
+
+def test_ttest_columns():
+    columns = [[1, 2, 3, 4], [1, 4, 6, 9], [2, 4, 6]]
+    unpaired = TTestColumns(columns)
+    assert unpaired.pairs == [(0, 1), (0, 2), (1, 2)]
+    for k, (i, j) in enumerate(unpaired.pairs):
+        tval, P, df = ttest_independent(columns[i], columns[j])
+        assert isclose(unpaired.tval[k], tval, rel_tol=1e-12)
+        assert isclose(unpaired.P[k], P, rel_tol=1e-12)
+        assert unpaired.df[k] == df
+    
+    paired = TTestColumns(columns, pairs=[(0, 1), (1, 2)], are_paired=True)
+    tval, P, df = ttest_paired(columns[0], columns[1])
+    assert isclose(paired.tval[0], tval, rel_tol=1e-12)
+    assert isclose(paired.P[0], P, rel_tol=1e-12)
+    # only the rows where both columns have values are paired
+    tval, P, df = ttest_paired(columns[1][:3], columns[2])
+    assert isclose(paired.P[1], P, rel_tol=1e-12)
+    assert paired.rows()[1][2:4] == (3, 3)
+
+def test_ttest_columns_without_numpy(monkeypatch):
+    from dcstats import basic_stats
+    nan = float('nan')
+    columns = [[1, 2, nan, 4, 5], [1.5, 2.2, 3.1, 4.9, 5.3]]
+    with_numpy = TTestColumns(columns, are_paired=True)
+    monkeypatch.setattr(basic_stats, 'np', None)
+    without_numpy = TTestColumns(columns, are_paired=True)
+    assert without_numpy.n1 == [4]
+    assert isclose(without_numpy.P[0], with_numpy.P[0], rel_tol=1e-12)
+    assert isclose(without_numpy.P[0], 0.0546, rel_tol=0.01)